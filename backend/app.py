@@ -1,9 +1,33 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify, stream_with_context
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
-from datetime import datetime
+from sqlalchemy import Double, and_, case, column, delete, event, func, literal, literal_column, or_, select, table, text, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+import base64
+import csv
+import hashlib
+import io
+import json
 import os
+import re
+import threading
+import time
+import uuid
 from dotenv import load_dotenv
+from migrations import run_migrations
+import partitions
+from detection import load_detector
+from response_cache import ResponseCache
+from response_encoding import JSON_MIMETYPE, ResponseEncoder
+from task_events import TaskNotifier, CHANNEL as TASK_EVENTS_CHANNEL
+import fast_json
+import llm
+import minhash
 
 load_dotenv()
 
@@ -22,11 +46,206 @@ app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
     'pool_recycle': 300,
 }
 
+# Held requests (counts long-polls, event streams) tie up a sync gunicorn
+# worker, so clients only make them when /health says this server keeps them
+# cheaply. asgi.py turns it on, STREAMING_SERVER=1 for gthread/gevent workers
+app.config['STREAMING_SERVER'] = os.getenv('STREAMING_SERVER') == '1'
+
+# Max tasks accepted by one POST /api/tasks/bulk request
+BULK_MAX_TASKS = int(os.getenv('BULK_MAX_TASKS', 10000))
+
+# Rows fetched per round trip by the streaming export
+EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', 1000))
+
+# Rows updated this long before a sync watermark are sent again, so
+# transactions that commit late with an older updated_at aren't missed
+CHANGES_OVERLAP_SECONDS = int(os.getenv('CHANGES_OVERLAP_SECONDS', 5))
+
+# Background jobs: 'thread' runs them in a pool inside each web worker,
+# 'external' only enqueues them for worker.py
+JOB_MODE = os.getenv('JOB_MODE', 'thread')
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', 4))
+JOB_TIMEOUT_SECONDS = int(os.getenv('JOB_TIMEOUT_SECONDS', 300))
+JOB_RETENTION_DAYS = int(os.getenv('JOB_RETENTION_DAYS', 7))
+# In thread mode each web worker expires and purges jobs this often, and re-runs
+# jobs still queued after this long (e.g. lost with a restarted worker), 0 disables
+JOB_HOUSEKEEPING_SECONDS = int(os.getenv('JOB_HOUSEKEEPING_SECONDS', 60))
+
+# Tasks with these statuses move to tasks_archive once not updated for this
+# many days (archive_tasks), 0 keeps them; RETENTION_BATCH_SIZE rows per transaction
+RETENTION_DAYS = {
+    'sent': int(os.getenv('RETENTION_SENT_DAYS', 90)),
+    'declined': int(os.getenv('RETENTION_DECLINED_DAYS', 30)),
+    'detected': int(os.getenv('RETENTION_DETECTED_DAYS', 0)),
+}
+RETENTION_BATCH_SIZE = int(os.getenv('RETENTION_BATCH_SIZE', 1000))
+# Archiving, task partition upkeep and tombstone pruning run this often, by worker.py
+# or in JOB_MODE=thread by one of the web workers (see retention_housekeeping), 0 disables
+RETENTION_INTERVAL_SECONDS = int(os.getenv('RETENTION_INTERVAL_SECONDS', 3600))
+
+# Tombstones (deleted task ids for /api/tasks/changes) older than this many
+# days are pruned, 0 keeps them; clients that last synced before that start over
+TOMBSTONE_RETENTION_DAYS = int(os.getenv('TOMBSTONE_RETENTION_DAYS', 30))
+
+# Rows removed per transaction by delete jobs (DELETE /api/tasks with filters)
+DELETE_BATCH_SIZE = int(os.getenv('DELETE_BATCH_SIZE', 5000))
+
+# Partitioned tasks table (PostgreSQL, see partitions.py): monthly partitions
+# are created this many months ahead, and months older than
+# TASK_PARTITION_RETENTION_MONTHS are archived and dropped whole, 0 keeps them
+TASK_PARTITION_MONTHS_AHEAD = int(os.getenv('TASK_PARTITION_MONTHS_AHEAD', 3))
+TASK_PARTITION_RETENTION_MONTHS = int(os.getenv('TASK_PARTITION_RETENTION_MONTHS', 0))
+
+# Extraction results cached by normalized text hash, shared by all workers
+ANALYSIS_CACHE_TTL_SECONDS = int(os.getenv('ANALYSIS_CACHE_TTL_SECONDS', 86400))
+ANALYSIS_CACHE_MAX_ENTRIES = int(os.getenv('ANALYSIS_CACHE_MAX_ENTRIES', 10000))
+# A hit refreshes its entry's last_used_at (for LRU eviction) at most this often
+ANALYSIS_CACHE_TOUCH_SECONDS = int(os.getenv('ANALYSIS_CACHE_TOUCH_SECONDS', 60))
+
+# Messages packed into one Groq call by /api/analyze-tasks/bulk
+LLM_BATCH_SIZE = int(os.getenv('LLM_BATCH_SIZE', 5))
+LLM_BATCH_MAX_CHARS = int(os.getenv('LLM_BATCH_MAX_CHARS', 8000))
+
+# Long messages are analyzed in chunks, this many in parallel per message,
+# and chunks past LLM_MAX_CHUNKS (~70KB of text) are not sent
+LLM_CHUNK_CONCURRENCY = int(os.getenv('LLM_CHUNK_CONCURRENCY', 4))
+LLM_MAX_CHUNKS = int(os.getenv('LLM_MAX_CHUNKS', 40))
+
+# Responses kept per worker by the task read cache, 0 disables it
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', 1000))
+
+# GET /api/tasks/counts?wait=N holds the request at most this long,
+# re-checking the task version every COUNTS_POLL_INTERVAL_SECONDS
+COUNTS_MAX_WAIT_SECONDS = float(os.getenv('COUNTS_MAX_WAIT_SECONDS', 25))
+COUNTS_POLL_INTERVAL_SECONDS = float(os.getenv('COUNTS_POLL_INTERVAL_SECONDS', 1))
+
+# GET /api/tasks/events sends a keep-alive (and re-checks the task version)
+# this often while idle, and ends a stream after EVENTS_MAX_STREAM_SECONDS so
+# it does not hold a sync worker for good; EventSource then reconnects after
+# EVENTS_RETRY_MS with Last-Event-ID
+EVENTS_HEARTBEAT_SECONDS = float(os.getenv('EVENTS_HEARTBEAT_SECONDS', 15))
+EVENTS_MAX_STREAM_SECONDS = float(os.getenv('EVENTS_MAX_STREAM_SECONDS', 25))
+EVENTS_RETRY_MS = int(os.getenv('EVENTS_RETRY_MS', 1000))
+
+# New tasks similar to a stored one (see minhash.py): 'flag' lists the
+# similar tasks in metadata.similarTo, 'merge' folds the new task into the
+# most similar one instead of storing it, 'off' skips the lookup
+NEAR_DUPLICATE_MODE = os.getenv('NEAR_DUPLICATE_MODE', 'flag')
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv('NEAR_DUPLICATE_THRESHOLD', 0.5))
+
+# GET /api/tasks/search: markers around matched words in highlights, and
+# how many words of the description a highlight snippet shows
+SEARCH_HIGHLIGHT_START = '<mark>'
+SEARCH_HIGHLIGHT_STOP = '</mark>'
+SEARCH_SNIPPET_WORDS = int(os.getenv('SEARCH_SNIPPET_WORDS', 30))
+
+# Pagination limits for GET /api/tasks
+DEFAULT_PAGE_SIZE = int(os.getenv('DEFAULT_PAGE_SIZE', 100))
+MAX_PAGE_SIZE = int(os.getenv('MAX_PAGE_SIZE', 1000))
+
+# Task endpoint responses: MessagePack for Accept: application/msgpack, and
+# brotli/gzip for Accept-Encoding once the body has COMPRESS_MIN_BYTES
+COMPRESS_MIN_BYTES = int(os.getenv('COMPRESS_MIN_BYTES', 1024))
+GZIP_LEVEL = int(os.getenv('GZIP_LEVEL', 6))
+BROTLI_QUALITY = int(os.getenv('BROTLI_QUALITY', 4))
+
+# Unpaged GET /api/tasks responses are written in chunks of this many tasks
+# instead of being built in memory, 0 builds them whole. Streamed responses
+# skip the response cache.
+TASK_LIST_STREAM_ROWS = int(os.getenv('TASK_LIST_STREAM_ROWS', 0))
+
 db = SQLAlchemy(app)
 
+# Keyword patterns for detect_tasks_simple, see detection.py
+task_detector = load_detector(os.getenv('DETECTION_PATTERNS_FILE'))
+
+# Deleted task ids for GET /api/tasks/changes, task_id NULL means every task was cleared
+class TaskTombstone(db.Model):
+    __tablename__ = 'task_tombstones'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    task_id = db.Column(db.Integer, nullable=True)
+    deleted_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+# Background job (e.g. task analysis), stored so any worker can report its status
+class Job(db.Model):
+    __tablename__ = 'jobs'
+    
+    id = db.Column(db.String(32), primary_key=True, default=lambda: uuid.uuid4().hex)
+    kind = db.Column(db.String(20), nullable=False)
+    status = db.Column(db.String(20), default='queued')  # queued, running, done, failed
+    payload = db.Column(db.JSON, default={})
+    result = db.Column(db.JSON, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    
+    def to_dict(self):
+        return {
+            'jobId': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'result': self.result,
+            'error': self.error,
+            'createdAt': self.created_at.isoformat() if self.created_at else None,
+            'startedAt': self.started_at.isoformat() if self.started_at else None,
+            'finishedAt': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+# Named integer counters shared by all workers
+class Counter(db.Model):
+    __tablename__ = 'counters'
+    
+    name = db.Column(db.String(100), primary_key=True)
+    value = db.Column(db.BigInteger, nullable=False, default=0)
+
+# MinHash signature of a task's title and description, see minhash.py
+class TaskSignature(db.Model):
+    __tablename__ = 'task_signatures'
+    
+    task_id = db.Column(db.Integer, primary_key=True)
+    signature = db.Column(db.LargeBinary, nullable=False)
+
+# LSH bucket keys of a task's signature, one row per band
+class TaskBucket(db.Model):
+    __tablename__ = 'task_buckets'
+    
+    bucket = db.Column(db.BigInteger, primary_key=True)
+    task_id = db.Column(db.Integer, primary_key=True)
+
+# Cached task extraction result for a normalized (text, source)
+class AnalysisCacheEntry(db.Model):
+    __tablename__ = 'analysis_cache'
+    
+    key = db.Column(db.String(64), primary_key=True)
+    result = db.Column(db.JSON, nullable=False)
+    hits = db.Column(db.Integer, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    last_used_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+# API field name -> Task attribute, in response order
+TASK_FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'description': 'description',
+    'source': 'source',
+    'url': 'url',
+    'priority': 'priority',
+    'deadline': 'deadline',
+    'status': 'status',
+    'jiraKey': 'jira_key',
+    'jiraUrl': 'jira_url',
+    'createdAt': 'created_at',
+    'updatedAt': 'updated_at',
+    'metadata': 'task_metadata',
+}
+
 # Task Model
 class Task(db.Model):
     __tablename__ = 'tasks'
+    # Ids are never handed out twice on SQLite either, see migration 0013
+    __table_args__ = {'sqlite_autoincrement': True}
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(500), nullable=False)
@@ -41,82 +260,918 @@ class Task(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     task_metadata = db.Column(db.JSON, default={})
+    # Detected tasks only: hash of url + normalized title, unique (migration 0008)
+    fingerprint = db.Column(db.String(64), nullable=True)
     
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'title': self.title,
-            'description': self.description,
-            'source': self.source,
-            'url': self.url,
-            'priority': self.priority,
-            'deadline': self.deadline.isoformat() if self.deadline else None,
-            'status': self.status,
-            'jiraKey': self.jira_key,
-            'jiraUrl': self.jira_url,
-            'createdAt': self.created_at.isoformat() if self.created_at else datetime.utcnow().isoformat(),
-            'updatedAt': self.updated_at.isoformat() if self.updated_at else datetime.utcnow().isoformat(),
-            'metadata': self.task_metadata or {}
-        }
+    def to_dict(self, fields=None):
+        # Only touch the requested attributes so deferred columns stay unloaded
+        data = {}
+        for key in fields or TASK_FIELDS:
+            value = getattr(self, TASK_FIELDS[key])
+            if key == 'deadline':
+                value = value.isoformat() if value else None
+            elif key in ('createdAt', 'updatedAt'):
+                value = value.isoformat() if value else datetime.utcnow().isoformat()
+            elif key == 'metadata':
+                value = value or {}
+            data[key] = value
+        return data
+
+# Task moved out of the tasks table by archive_tasks, read-only
+class TaskArchive(db.Model):
+    __tablename__ = 'tasks_archive'
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    title = db.Column(db.String(500), nullable=False)
+    description = db.Column(db.Text)
+    source = db.Column(db.String(50))
+    url = db.Column(db.Text)
+    priority = db.Column(db.String(20))
+    deadline = db.Column(db.Date, nullable=True)
+    status = db.Column(db.String(20))
+    jira_key = db.Column(db.String(50), nullable=True)
+    jira_url = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime)
+    task_metadata = db.Column(db.JSON)
+    fingerprint = db.Column(db.String(64), nullable=True)
+    archived_at = db.Column(db.DateTime, nullable=False)
+    
+    def to_dict(self, fields=None):
+        data = Task.to_dict(self, fields)
+        data['archivedAt'] = self.archived_at.isoformat()
+        return data
+
+# Columns copied from tasks to tasks_archive
+ARCHIVE_COLUMNS = list(TASK_FIELDS.values()) + ['fingerprint']
+
+def task_columns(fields):
+    """Task columns behind the API fields (None: all fields), in the same order"""
+    return [getattr(Task, TASK_FIELDS[key]) for key in fields or TASK_FIELDS]
+
+def task_records(rows, fields):
+    """
+    Task.to_dict(fields) of raw rows starting with task_columns(fields), without
+    building Task objects. Dates stay date objects for fast_json to write.
+    """
+    keys = list(fields or TASK_FIELDS)
+    records = [dict(zip(keys, row)) for row in rows]
+    # The same fallbacks as to_dict
+    for key in ('createdAt', 'updatedAt', 'metadata'):
+        if key in keys and any(record[key] is None for record in records):
+            for record in records:
+                if record[key] is None:
+                    record[key] = {} if key == 'metadata' else datetime.utcnow()
+    return records
+
+def tasks_json(records):
+    """JSON bytes of task records, the same as a compact jsonify() of their to_dict()s"""
+    # Only metadata can hold floats that orjson writes differently
+    safe = all(fast_json.same_in_orjson(record.get('metadata')) for record in records)
+    return fast_json.encode(records, safe=safe)
+
+def tasks_response(rows, fields):
+    return Response(tasks_json(task_records(rows, fields)) + b'\n', mimetype=app.json.mimetype)
+
+def parse_fields(value):
+    """Parse a comma separated ?fields= projection, None means all fields"""
+    if not value:
+        return None
+    fields = [f.strip() for f in value.split(',') if f.strip()]
+    unknown = [f for f in fields if f not in TASK_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return fields
+
+def filter_by_status(query, status):
+    """Apply the ?status= filter shared by the task list endpoints"""
+    if status:
+        return query.filter_by(status=status)
+    # By default, exclude detected tasks (they're only for extension)
+    return query.filter(Task.status != 'detected')
+
+def encode_token(data):
+    """Opaque URL-safe token for JSON-serializable state"""
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip('=')
+
+def decode_token(token):
+    padded = token + '=' * (-len(token) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded))
+
+def encode_cursor(row):
+    """Opaque keyset cursor for the (created_at, id) position of a task_list_query() row"""
+    created_at, task_id = row[-2:]
+    return encode_token([created_at.isoformat(), task_id])
+
+def keyset_before(position):
+    """Conditions for tasks before a (created_at, id) position in list order"""
+    # The plain created_at bound lets PostgreSQL skip newer partitions, the row comparison doesn't
+    return Task.created_at <= position[0], tuple_(Task.created_at, Task.id) < position
+
+def decode_cursor(cursor):
+    try:
+        created_at, task_id = decode_token(cursor)
+        return datetime.fromisoformat(created_at), int(task_id)
+    except Exception:
+        raise ValueError('Invalid cursor')
+
+# ============================================================
+# Read cache for task GET endpoints, see response_cache.py
+# ============================================================
+
+TASKS_VERSION = 'tasks.version'
+TOMBSTONES_PRUNED = 'task_tombstones.pruned'
+# Unix time of the last retention_housekeeping run by any web worker
+RETENTION_LAST_RUN = 'retention.last_run'
+
+response_cache = ResponseCache(RESPONSE_CACHE_MAX_ENTRIES)
+
+response_encoder = ResponseEncoder(COMPRESS_MIN_BYTES, GZIP_LEVEL, BROTLI_QUALITY)
+
+task_notifier = TaskNotifier()
+
+def bump_tasks_version(session):
+    """Invalidate cached task responses and wake task streams in every worker once session commits"""
+    updated = session.execute(
+        update(Counter).where(Counter.name == TASKS_VERSION).values(value=Counter.value + 1)
+    ).rowcount
+    if not updated:
+        session.add(Counter(name=TASKS_VERSION, value=1))
+    if session.get_bind().dialect.name == 'postgresql' and not session.info.get('tasks_written'):
+        session.execute(text(f'NOTIFY {TASK_EVENTS_CHANNEL}'))
+    session.info['tasks_written'] = True
+
+# Every session (Flask's and the ASGI app's) bumps the version in the same
+# transaction as its task writes, whether by ORM objects or bulk statements
+@event.listens_for(Session, 'before_flush')
+def tasks_flushed(session, flush_context, instances):
+    changed = list(session.new) + list(session.dirty) + list(session.deleted)
+    if any(isinstance(obj, Task) for obj in changed):
+        bump_tasks_version(session)
+
+@event.listens_for(Session, 'do_orm_execute')
+def tasks_executed(state):
+    if not (state.is_insert or state.is_update or state.is_delete):
+        return
+    table = getattr(state.statement, 'table', None)
+    if table is not None and table.name == Task.__tablename__:
+        bump_tasks_version(state.session)
+
+@event.listens_for(Session, 'after_commit')
+def tasks_committed(session):
+    if session.info.pop('tasks_written', False):
+        task_notifier.notify()
+
+@event.listens_for(Session, 'after_rollback')
+def tasks_rolled_back(session):
+    session.info.pop('tasks_written', None)
+
+def tasks_version():
+    return db.session.execute(select(Counter.value).where(Counter.name == TASKS_VERSION)).scalar() or 0
+
+def response_cache_key(endpoint, arg_items, view_args):
+    return (endpoint, tuple(sorted(arg_items)), tuple(sorted(view_args.items())))
+
+def cached_response(view):
+    """Serve 200 responses of a task GET view from response_cache"""
+    @wraps(view)
+    def wrapper(**view_args):
+        if RESPONSE_CACHE_MAX_ENTRIES <= 0:
+            return view(**view_args)
+        
+        version = tasks_version()
+        key = response_cache_key(request.endpoint, request.args.items(multi=True), view_args)
+        # Where encode_task_response keeps the MessagePack/compressed variants
+        g.response_cache_entry = (key, version)
+        cached = response_cache.get(key, version)
+        if cached:
+            body, headers = cached
+            return Response(body, status=200, headers=headers + [('X-Cache', 'HIT')])
+        
+        response = app.make_response(view(**view_args))
+        if response.status_code == 200 and not response.is_streamed:
+            headers = [(k, v) for k, v in response.headers.items() if k != 'Content-Length']
+            response_cache.put(key, version, (response.get_data(), headers))
+        response.headers['X-Cache'] = 'MISS'
+        return response
+    return wrapper
+
+# ============================================================
+# Conditional GET for task endpoints
+# ============================================================
+
+def list_etag(endpoint, params, row):
+    """Strong ETag of a task list from its (count, max(updated_at), tasks.version) and parsed query params"""
+    count, latest, version = row
+    state = repr((endpoint, params, count, latest.isoformat() if latest else None, version))
+    return hashlib.sha1(state.encode()).hexdigest()
+
+def task_etag(row):
+    """Strong ETag of a single task, '<id>-<updatedAt>' so clients can build it from a copy"""
+    task_id, updated_at = row
+    return f'{task_id}-{updated_at.isoformat()}' if updated_at else None
+
+def list_version_query(status, position=None):
+    # A delete and a write in the same instant keep count and max(updated_at), the version doesn't
+    version = select(Counter.value).where(Counter.name == TASKS_VERSION).scalar_subquery()
+    query = filter_by_status(select(func.count(Task.id), func.max(Task.updated_at), version), status)
+    if position:
+        query = query.filter(*keyset_before(position))
+    return query
+
+# Validators: (args, **view_args) -> (version query, row -> ETag), raise ValueError on bad args
+
+def task_list_validator(args):
+    params = task_list_params(args)
+    status, _, position, _ = params
+    return list_version_query(status, position), lambda row: list_etag('tasks', params, row)
+
+def detected_tasks_validator(args):
+    return list_version_query('detected'), lambda row: list_etag('detected', None, row)
+
+def task_validator(args, task_id):
+    # Archived tasks never change, their ETag stays valid
+    query = select(Task.id, Task.updated_at).where(Task.id == task_id).union_all(
+        select(TaskArchive.id, TaskArchive.updated_at).where(TaskArchive.id == task_id)
+    )
+    return query, task_etag
+
+def conditional_get(validator):
+    """Answer a matching If-None-Match with 304 after only the validator's version query"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(**view_args):
+            try:
+                query, make_etag = validator(request.args, **view_args)
+                row = db.session.execute(query).first()
+                etag = make_etag(row) if row else None
+            except ValueError:
+                # The view reports bad arguments
+                etag = None
+            
+            if etag and request.if_none_match.contains_weak(etag):
+                response = Response(status=304)
+                response.set_etag(etag)
+                return response
+            
+            response = app.make_response(view(**view_args))
+            if etag and response.status_code == 200:
+                response.set_etag(etag)
+            return response
+        return wrapper
+    return decorator
+
+# ============================================================
+# MessagePack and compression for task endpoints, see response_encoding.py
+# ============================================================
+
+def encoded_variant(body, accept, accept_encoding, cache_entry=None):
+    """(body, mimetype, coding or None) of a JSON body for the request headers
+    
+    cache_entry: (key, version) of the response in response_cache, the
+    encoded variant is cached next to it.
+    """
+    mimetype, coding = response_encoder.negotiate(accept, accept_encoding)
+    if mimetype == JSON_MIMETYPE and coding is None:
+        return body, mimetype, None
+    if not cache_entry:
+        return response_encoder.encode(body, mimetype, coding)
+    
+    key, version = cache_entry
+    key += ((mimetype, coding),)
+    variant = response_cache.get(key, version)
+    if variant is None:
+        variant = response_encoder.encode(body, mimetype, coding)
+        response_cache.put(key, version, variant)
+    return variant
+
+@app.after_request
+def encode_task_response(response):
+    """Answer Accept: application/msgpack and Accept-Encoding on the task endpoints"""
+    if not request.path.startswith('/api/tasks') or response.status_code not in (200, 304):
+        return response
+    response.vary.update(('Accept', 'Accept-Encoding'))
+    if response.status_code != 200 or response.is_streamed or response.mimetype != JSON_MIMETYPE:
+        return response
+    
+    body, mimetype, coding = encoded_variant(
+        response.get_data(), request.headers.get('Accept'), request.headers.get('Accept-Encoding'),
+        g.get('response_cache_entry')
+    )
+    if mimetype == JSON_MIMETYPE and coding is None:
+        return response
+    response.set_data(body)
+    response.mimetype = mimetype
+    response.content_encoding = coding
+    # Same content in another representation: keep the ETag, but weak
+    etag, _ = response.get_etag()
+    if etag:
+        response.set_etag(etag, weak=True)
+    return response
 
 # Health check
 @app.route('/health', methods=['GET'])
 def health():
-    return jsonify({'status': 'healthy', 'timestamp': datetime.utcnow().isoformat()})
+    return jsonify({
+        'status': 'healthy',
+        'timestamp': datetime.utcnow().isoformat(),
+        'streaming': app.config['STREAMING_SERVER']
+    })
+
+def task_list_params(args):
+    """(status, fields, position, limit) from GET /api/tasks query args, raises ValueError"""
+    limit = None
+    if 'limit' in args:
+        try:
+            limit = int(args['limit'])
+        except ValueError:
+            limit = 0
+        if limit < 1:
+            raise ValueError('limit must be a positive whole number')
+    fields = parse_fields(args.get('fields'))
+    cursor = args.get('cursor')
+    position = decode_cursor(cursor) if cursor else None
+    return args.get('status'), fields, position, limit
+
+def task_list_query(status, fields, position):
+    """SELECT for GET /api/tasks, newest first, shared with the ASGI handler
+    
+    Rows are task_columns(fields) followed by created_at and id for the cursor.
+    """
+    query = filter_by_status(select(*task_columns(fields), Task.created_at, Task.id), status)
+    
+    if position:
+        query = query.filter(*keyset_before(position))
+    
+    return query.order_by(Task.created_at.desc(), Task.id.desc())
+
+def stream_tasks(query, fields):
+    """Response writing the tasks of a yield_per query one batch at a time"""
+    def chunks():
+        for batch in db.session.execute(query).partitions():
+            yield tasks_json(task_records(batch, fields))
+    return Response(stream_with_context(fast_json.dumps_chunks(chunks())), mimetype=app.json.mimetype)
+
+def page_size(limit):
+    return max(1, min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE))
 
 # Get all tasks
+# Optional: ?limit=N&cursor=<X-Next-Cursor> for keyset pagination and
+# ?fields=id,title,status to only load and return some columns
 @app.route('/api/tasks', methods=['GET'])
+@conditional_get(task_list_validator)
+@cached_response
 def get_tasks():
     try:
-        status = request.args.get('status')
-        query = Task.query
+        try:
+            status, fields, position, limit = task_list_params(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        query = task_list_query(status, fields, position)
+        
+        # Without limit or cursor keep returning the full list for old clients
+        if limit is None and position is None:
+            if TASK_LIST_STREAM_ROWS > 0:
+                return stream_tasks(query.execution_options(yield_per=TASK_LIST_STREAM_ROWS), fields)
+            return tasks_response(db.session.execute(query).all(), fields)
+        
+        limit = page_size(limit)
+        rows = db.session.execute(query.limit(limit + 1)).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        
+        response = tasks_response(rows, fields)
+        if has_more:
+            response.headers['X-Next-Cursor'] = encode_cursor(rows[-1])
+        return response
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# Stream tasks as NDJSON or CSV without building the list in memory
+# Optional: ?format=ndjson|csv&status=...&updated_since=<ISO datetime>
+@app.route('/api/tasks/export', methods=['GET'])
+def export_tasks():
+    try:
+        export_format = request.args.get('format', 'ndjson')
+        if export_format not in ('ndjson', 'csv'):
+            return jsonify({'error': 'format must be ndjson or csv'}), 400
+        
+        query = filter_by_status(Task.query, request.args.get('status'))
         
-        if status:
-            query = query.filter_by(status=status)
+        updated_since = request.args.get('updated_since')
+        if updated_since:
+            try:
+                since = datetime.fromisoformat(updated_since.replace('Z', '+00:00'))
+            except ValueError:
+                return jsonify({'error': 'updated_since must be an ISO datetime'}), 400
+            # Timestamps are stored as naive UTC
+            if since.tzinfo:
+                since = since.astimezone(timezone.utc).replace(tzinfo=None)
+            query = query.filter(Task.updated_at > since)
+        
+        # yield_per streams through a server-side cursor in fixed size batches
+        rows = db.session.scalars(
+            query.order_by(Task.id).statement.execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        
+        if export_format == 'csv':
+            body = export_csv(rows)
+            mimetype = 'text/csv'
         else:
-            # By default, exclude detected tasks (they're only for extension)
-            query = query.filter(Task.status != 'detected')
+            body = (json.dumps(task.to_dict()) + '\n' for task in rows)
+            mimetype = 'application/x-ndjson'
+        
+        return Response(
+            stream_with_context(body),
+            mimetype=mimetype,
+            headers={'Content-Disposition': f'attachment; filename=tasks.{export_format}'}
+        )
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def export_csv(tasks):
+    """Yield CSV lines one task at a time"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(TASK_FIELDS)
+    for task in tasks:
+        data = task.to_dict()
+        data['metadata'] = json.dumps(data['metadata'])
+        writer.writerow(data.values())
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+# Tasks created, updated or deleted since a watermark (for the Forge sync)
+# Optional: ?since=<next from the previous call>&limit=N&status=...
+# Without since, returns every task followed by a watermark
+def task_changes(since, status, limit):
+    """Tasks written and deleted after the since watermark, raises ValueError on a bad token
+
+    Without since, all tasks from the start and only deletes from now on.
+    """
+    try:
+        watermark = decode_token(since) if since else {'u': None, 'i': 0, 't': None, 'p': 0}
+        updated_at = datetime.fromisoformat(watermark['u']) if watermark['u'] else None
+        last_id = int(watermark['i'])
+        tombstone_id = int(watermark['t']) if watermark['t'] is not None else None
+    except Exception:
+        raise ValueError('Invalid since token')
+    
+    reset = False
+    if tombstone_id is None:
+        tombstone_id = db.session.execute(select(func.max(TaskTombstone.id))).scalar() or 0
+    else:
+        pruned_id = db.session.execute(
+            select(Counter.value).where(Counter.name == TOMBSTONES_PRUNED)
+        ).scalar() or 0
+        if tombstone_id < pruned_id:
+            # Deletes it hasn't seen are gone, the client starts over
+            reset = True
+            updated_at, last_id = None, 0
+            watermark['p'] = 0
+            tombstone_id = db.session.execute(select(func.max(TaskTombstone.id))).scalar() or 0
+    
+    # Deletes first, so a client never applies a delete after a newer re-create
+    tombstones = [] if reset else TaskTombstone.query.filter(TaskTombstone.id > tombstone_id) \
+        .order_by(TaskTombstone.id).limit(limit + 1).all()
+    if len(tombstones) > limit:
+        # A page of deletes only, tasks follow once they're all out
+        tombstones = tombstones[:limit]
+        return {
+            'tasks': [],
+            'deleted': [t.task_id for t in tombstones if t.task_id is not None],
+            'reset': any(t.task_id is None for t in tombstones),
+            'next': encode_token({**watermark, 't': tombstones[-1].id}) if tombstones else since,
+            'hasMore': True
+        }
+    reset = reset or any(t.task_id is None for t in tombstones)
+    deleted = [t.task_id for t in tombstones if t.task_id is not None]
+    if tombstones:
+        tombstone_id = tombstones[-1].id
+    
+    query = filter_by_status(Task.query, status)
+    if updated_at and watermark.get('p'):
+        # Continuing a paged response, strict keyset
+        query = query.filter(tuple_(Task.updated_at, Task.id) > (updated_at, last_id))
+    elif updated_at:
+        query = query.filter(Task.updated_at > updated_at - timedelta(seconds=CHANGES_OVERLAP_SECONDS))
+    
+    tasks = query.order_by(Task.updated_at, Task.id).limit(limit + 1).all()
+    has_more = len(tasks) > limit
+    tasks = tasks[:limit]
+    
+    if tasks:
+        updated_at, last_id = tasks[-1].updated_at, tasks[-1].id
+    
+    next_token = encode_token({
+        'u': updated_at.isoformat() if updated_at else None,
+        'i': last_id,
+        't': tombstone_id,
+        'p': 1 if has_more else 0
+    })
+    
+    return {
+        'tasks': [task.to_dict() for task in tasks],
+        'deleted': deleted,
+        'reset': reset,
+        'next': next_token,
+        'hasMore': has_more
+    }
+
+@app.route('/api/tasks/changes', methods=['GET'])
+def get_task_changes():
+    try:
+        limit = max(1, min(request.args.get('limit', DEFAULT_PAGE_SIZE, type=int), MAX_PAGE_SIZE))
+        try:
+            changes = task_changes(request.args.get('since'), request.args.get('status'), limit)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        return jsonify(changes)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# ============================================================
+# Full-text search, tsvector + GIN on PostgreSQL, FTS5 on SQLite
+# ============================================================
+
+# Generated column and FTS5 table from migration 0010, not mapped on Task
+SEARCH_VECTOR = literal_column('tasks.search_vector')
+tasks_fts = table('tasks_fts', column('rowid'))
+# The FTS5 table as a value, for MATCH and its ranking/highlight functions
+TASKS_FTS = literal_column('tasks_fts')
+
+def search_match(q):
+    """FTS5 query for the words of q, all of them must match"""
+    words = re.findall(r'\w+', q)
+    if not words:
+        raise ValueError('Search query has no words')
+    return ' '.join(f'"{word}"' for word in words)
+
+def search_ranked(q, status):
+    """SELECT of (id, rank) for matching tasks, higher rank first, raises ValueError"""
+    if db.engine.dialect.name == 'postgresql':
+        tsquery = func.websearch_to_tsquery('english', q)
+        # double precision so the rank survives the JSON cursor unchanged
+        rank = func.ts_rank_cd(SEARCH_VECTOR, tsquery).cast(Double)
+        query = select(Task.id, rank.label('rank')).where(SEARCH_VECTOR.op('@@')(tsquery))
+        return filter_by_status(query, status)
+    
+    # bm25 is lower for better matches, title words weigh like tsvector's A vs B
+    rank = -func.bm25(TASKS_FTS, 10.0, 1.0)
+    query = filter_by_status(select(Task.id, rank.label('rank')), status)
+    return query.join(tasks_fts, tasks_fts.c.rowid == Task.id) \
+        .where(TASKS_FTS.op('MATCH')(search_match(q)))
+
+def search_highlights(q, task_ids):
+    """Task id -> {title, description} with matched words between the highlight markers"""
+    if db.engine.dialect.name == 'postgresql':
+        tsquery = func.websearch_to_tsquery('english', q)
+        markers = f'StartSel={SEARCH_HIGHLIGHT_START}, StopSel={SEARCH_HIGHLIGHT_STOP}'
+        query = select(
+            Task.id,
+            func.ts_headline('english', Task.title, tsquery, f'{markers}, HighlightAll=true'),
+            func.ts_headline('english', func.coalesce(Task.description, ''), tsquery,
+                             f'{markers}, MaxWords={SEARCH_SNIPPET_WORDS}, MinWords={SEARCH_SNIPPET_WORDS // 2}'),
+        ).where(Task.id.in_(task_ids))
+    else:
+        query = select(
+            tasks_fts.c.rowid,
+            func.highlight(TASKS_FTS, 0, SEARCH_HIGHLIGHT_START, SEARCH_HIGHLIGHT_STOP),
+            func.snippet(TASKS_FTS, 1, SEARCH_HIGHLIGHT_START, SEARCH_HIGHLIGHT_STOP, '…', SEARCH_SNIPPET_WORDS),
+        ).where(
+            TASKS_FTS.op('MATCH')(search_match(q)), tasks_fts.c.rowid.in_(task_ids)
+        )
+    return {task_id: {'title': title, 'description': description}
+            for task_id, title, description in db.session.execute(query)}
+
+def search_params(args):
+    """(q, status, position, limit) from GET /api/tasks/search query args, raises ValueError"""
+    q = args.get('q', '').strip()
+    if not q:
+        raise ValueError('q is required')
+    # websearch_to_tsquery would match nothing, FTS5 fails
+    if not re.search(r'\w', q):
+        raise ValueError('Search query has no words')
+    cursor = args.get('cursor')
+    position = None
+    if cursor:
+        try:
+            rank, task_id = decode_token(cursor)
+            position = float(rank), int(task_id)
+        except Exception:
+            raise ValueError('Invalid cursor')
+    return q, args.get('status'), position, page_size(args.get('limit', type=int))
+
+# Search task titles and descriptions, best matches first
+# ?q=words (on PostgreSQL also "phrases", or, -word) &status=...&limit=N&cursor=<X-Next-Cursor>
+# Each task comes with its rank and highlights: {title, description}
+# No ETag: the list validator counts every task, which the index is there to avoid
+@app.route('/api/tasks/search', methods=['GET'])
+@cached_response
+def search_tasks():
+    try:
+        try:
+            q, status, position, limit = search_params(request.args)
+            ranked = search_ranked(q, status).subquery()
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        query = select(ranked.c.id, ranked.c.rank)
+        if position:
+            rank, task_id = position
+            query = query.where(or_(ranked.c.rank < rank, and_(ranked.c.rank == rank, ranked.c.id < task_id)))
+        page = db.session.execute(
+            query.order_by(ranked.c.rank.desc(), ranked.c.id.desc()).limit(limit + 1)
+        ).all()
+        has_more = len(page) > limit
+        page = page[:limit]
+        
+        # Highlighting re-reads the text, so only for the returned page
+        ids = [task_id for task_id, _ in page]
+        tasks = {task.id: task for task in db.session.scalars(select(Task).where(Task.id.in_(ids)))}
+        highlights = search_highlights(q, ids)
+        results = [
+            {**tasks[task_id].to_dict(), 'rank': rank, 'highlights': highlights.get(task_id)}
+            for task_id, rank in page
+        ]
         
-        tasks = query.order_by(Task.created_at.desc()).all()
-        return jsonify([task.to_dict() for task in tasks])
+        response = jsonify(results)
+        if has_more:
+            task_id, rank = page[-1]
+            response.headers['X-Next-Cursor'] = encode_token([rank, task_id])
+        return response
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# ============================================================
+# Task change stream (server-sent events), see task_events.py
+# ============================================================
+
+def changes_head():
+    """Watermark of the newest change, where a stream without Last-Event-ID starts"""
+    latest = db.session.execute(
+        select(Task.updated_at, Task.id).order_by(Task.updated_at.desc(), Task.id.desc()).limit(1)
+    ).first()
+    tombstone_id = db.session.execute(select(func.max(TaskTombstone.id))).scalar() or 0
+    return encode_token({
+        'u': latest.updated_at.isoformat() if latest and latest.updated_at else None,
+        'i': latest.id if latest else 0,
+        't': tombstone_id,
+        'p': 0
+    })
+
+def events_since(args, headers):
+    """Watermark a stream resumes from: Last-Event-ID, else ?since=, else now"""
+    since = headers.get('Last-Event-ID') or args.get('since')
+    if since:
+        # Fail on a bad token before the stream starts
+        task_changes(since, None, 0)
+        return since
+    return changes_head()
+
+def sse_event(event, data, event_id=None):
+    lines = [f'id: {event_id}'] if event_id else []
+    lines += [f'event: {event}', f'data: {json.dumps(data, separators=(",", ":"))}']
+    return '\n'.join(lines) + '\n\n'
+
+def pending_events(since, status, sent):
+    """'tasks' events for everything written after since, returns (events, new since)
+
+    sent maps task id -> updatedAt of the tasks this stream already pushed, so
+    the overlap window of the changes feed is not pushed again on every write.
+    """
+    events = []
+    while True:
+        changes = task_changes(since, status, DEFAULT_PAGE_SIZE)
+        since = changes['next']
+        if changes['reset']:
+            # The client drops everything, so everything is sent again
+            sent.clear()
+        tasks = [task for task in changes['tasks'] if sent.get(task['id']) != task['updatedAt']]
+        sent.update((task['id'], task['updatedAt']) for task in tasks)
+        if tasks or changes['deleted'] or changes['reset']:
+            data = {'tasks': tasks, 'deleted': changes['deleted'], 'reset': changes['reset']}
+            events.append(sse_event('tasks', data, since))
+        if not changes['hasMore']:
+            break
+    
+    # Older tasks can no longer come back through the overlap window
+    latest = decode_token(since)['u']
+    if latest:
+        cutoff = (datetime.fromisoformat(latest) - timedelta(seconds=CHANGES_OVERLAP_SECONDS)).isoformat()
+        for task_id in [task_id for task_id, updated_at in sent.items() if (updated_at or '') < cutoff]:
+            del sent[task_id]
+    return events, since
+
+def listen_for_task_writes():
+    """Start this process's LISTEN thread on PostgreSQL, no-op on SQLite"""
+    if db.engine.dialect.name != 'postgresql':
+        return
+    
+    def connect():
+        with app.app_context():
+            conn = db.engine.raw_connection()
+        # Dedicated connection, never returned to the pool
+        conn.detach()
+        return conn.driver_connection
+    task_notifier.listen(connect)
+
+# Push task changes as they are committed, as server-sent events:
+#   id: <watermark>   event: tasks   data: {"tasks": [...], "deleted": [...], "reset": false}
+# Same payloads and watermarks as GET /api/tasks/changes, so a reconnecting
+# EventSource resumes from Last-Event-ID without missing a change (a task may
+# be sent twice). Optional: ?status=..., ?since=<watermark> for the first connect.
+@app.route('/api/tasks/events', methods=['GET'])
+def task_events():
+    try:
+        since = events_since(request.args, request.headers)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    
+    status = request.args.get('status')
+    listen_for_task_writes()
+    
+    def stream():
+        nonlocal since
+        deadline = time.monotonic() + EVENTS_MAX_STREAM_SECONDS
+        yield f'retry: {EVENTS_RETRY_MS}\n\n'
+        
+        # The first check always reads changes: some may predate the connection
+        checked_version = None
+        sent = {}
+        generation = task_notifier.generation
+        while True:
+            version = tasks_version()
+            if version != checked_version:
+                checked_version = version
+                events, since = pending_events(since, status, sent)
+                yield ''.join(events)
+            else:
+                yield ': keep-alive\n\n'
+            # Don't hold a connection while waiting
+            db.session.close()
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            generation = task_notifier.wait(generation, min(EVENTS_HEARTBEAT_SECONDS, remaining))
+    
+    return Response(stream_with_context(stream()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        # Render/nginx must not buffer the stream
+        'X-Accel-Buffering': 'no'
+    })
+
+TASK_STATUSES = ('pending', 'sent', 'declined', 'detected')
+
+def task_counts_query():
+    # One GROUP BY, index-only on ix_tasks_status_updated_at
+    return select(Task.status, func.count(Task.id)).group_by(Task.status)
+
+def counts_payload(rows):
+    """Response body for (status, count) rows, version changes whenever a count does"""
+    counts = dict.fromkeys(TASK_STATUSES, 0)
+    counts.update({status: count for status, count in rows})
+    version = hashlib.sha1(json.dumps(counts, sort_keys=True).encode()).hexdigest()[:16]
+    return {'counts': counts, 'total': sum(counts.values()), 'version': version}
+
+def counts_wait(args):
+    """Seconds a counts request may wait for a change, 0 returns right away"""
+    try:
+        wait = float(args.get('wait', 0))
+    except ValueError:
+        wait = 0
+    return max(0, min(wait, COUNTS_MAX_WAIT_SECONDS)) if args.get('since') else 0
+
+# Number of tasks per status
+# Optional: ?since=<version>&wait=N long-polls until the counts differ from
+# that version (or N seconds pass, at most COUNTS_MAX_WAIT_SECONDS)
+@app.route('/api/tasks/counts', methods=['GET'])
+def get_task_counts():
+    try:
+        since = request.args.get('since')
+        deadline = time.monotonic() + counts_wait(request.args)
+        checked_version = None
+        listen_for_task_writes()
+        generation = task_notifier.generation
+        
+        while True:
+            # Only re-count when some task was written since the last check
+            version = tasks_version()
+            if version != checked_version:
+                checked_version = version
+                payload = counts_payload(db.session.execute(task_counts_query()))
+                if payload['version'] != since:
+                    break
+            if time.monotonic() >= deadline:
+                break
+            # Don't hold a connection while waiting, a write wakes us early
+            db.session.close()
+            generation = task_notifier.wait(generation, COUNTS_POLL_INTERVAL_SECONDS)
+        
+        return jsonify(payload)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 # Get single task
 @app.route('/api/tasks/<int:task_id>', methods=['GET'])
+@conditional_get(task_validator)
+@cached_response
 def get_task(task_id):
     try:
-        task = Task.query.get_or_404(task_id)
+        # Archived tasks are read through, with archivedAt
+        task = db.session.get(Task, task_id) or TaskArchive.query.get_or_404(task_id)
         return jsonify(task.to_dict())
     except Exception as e:
         return jsonify({'error': str(e)}), 404
 
+PRIORITIES = ('highest', 'high', 'medium', 'low')
+
+def parse_deadline(value):
+    """Parse an ISO date/datetime string into a date, raises ValueError"""
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).date()
+
+def task_values(data):
+    """Column values for a new pending task from an extension payload"""
+    # Parse deadline if provided
+    deadline = None
+    if data.get('deadline'):
+        try:
+            deadline = parse_deadline(data['deadline'])
+        except:
+            deadline = None
+    
+    return {
+        'title': data.get('title', data.get('text', 'Untitled Task')[:500]),
+        'description': data.get('description', data.get('text', '')),
+        'source': data.get('source', 'web'),
+        'url': data.get('url', ''),
+        'priority': data.get('priority', 'medium'),
+        'deadline': deadline,
+        'status': 'pending',
+        'task_metadata': data.get('metadata', {})
+    }
+
+# Optional text fields of a bulk task, strings when given
+BULK_TASK_STRING_FIELDS = ('text', 'description', 'source', 'url')
+
+def validate_bulk_task(data):
+    """Stricter version of task_values for bulk imports, raises ValueError"""
+    if not isinstance(data, dict):
+        raise ValueError('Task must be a JSON object')
+    title = data.get('title') or data.get('text')
+    if not isinstance(title, str) or not title.strip():
+        raise ValueError('title or text is required')
+    if data.get('priority', 'medium') not in PRIORITIES:
+        raise ValueError(f"priority must be one of {', '.join(PRIORITIES)}")
+    if data.get('deadline'):
+        try:
+            parse_deadline(data['deadline'])
+        except (TypeError, AttributeError, ValueError):
+            raise ValueError('deadline must be an ISO date')
+    for field in BULK_TASK_STRING_FIELDS:
+        if field in data and not isinstance(data[field], str):
+            raise ValueError(f'{field} must be a string')
+    if len(data.get('source', '')) > Task.source.type.length:
+        raise ValueError(f'source must be at most {Task.source.type.length} characters')
+    if not isinstance(data.get('metadata', {}), dict):
+        raise ValueError('metadata must be a JSON object')
+    
+    values = task_values(data)
+    values['title'] = values['title'][:500]
+    return values
+
+# Message fields of POST /api/analyze-tasks/bulk and their JSON types
+ANALYZE_MESSAGE_FIELDS = {'text': (str, 'a string'), 'source': (str, 'a string'),
+                          'url': (str, 'a string'), 'metadata': (dict, 'a JSON object')}
+
+def validate_analyze_message(message):
+    """Raises ValueError unless message is an object whose fields have the right types"""
+    if not isinstance(message, dict):
+        raise ValueError('Message must be a JSON object')
+    for field, (kind, name) in ANALYZE_MESSAGE_FIELDS.items():
+        if field in message and not isinstance(message[field], kind):
+            raise ValueError(f'{field} must be {name}')
+
 # Create task (from extension)
 @app.route('/api/tasks', methods=['POST'])
 def create_task():
     try:
         data = request.json
+        rows, merged = apply_near_duplicates([task_values(data)])
+        if merged:
+            db.session.commit()
+            return jsonify(merged[0].to_dict())
         
-        # Parse deadline if provided
-        deadline = None
-        if data.get('deadline'):
-            try:
-                deadline = datetime.fromisoformat(data['deadline'].replace('Z', '+00:00')).date()
-            except:
-                deadline = None
-        
-        task = Task(
-            title=data.get('title', data.get('text', 'Untitled Task')[:500]),
-            description=data.get('description', data.get('text', '')),
-            source=data.get('source', 'web'),
-            url=data.get('url', ''),
-            priority=data.get('priority', 'medium'),
-            deadline=deadline,
-            status='pending',
-            task_metadata=data.get('metadata', {})
-        )
-        
+        task = Task(**rows[0])
         db.session.add(task)
+        db.session.flush()
+        index_tasks([task])
         db.session.commit()
         
         return jsonify(task.to_dict()), 201
@@ -124,6 +1179,64 @@ def create_task():
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+# Create many tasks at once (imports)
+# Body is a JSON array, {"tasks": [...]}, or NDJSON (one task per line)
+@app.route('/api/tasks/bulk', methods=['POST'])
+def create_tasks_bulk():
+    try:
+        if request.mimetype in ('application/x-ndjson', 'application/ndjson'):
+            items = []
+            for line in request.get_data(as_text=True).splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    items.append(json.loads(line))
+                except ValueError:
+                    items.append(ValueError('Invalid JSON'))
+        else:
+            items = request.get_json(silent=True)
+            if isinstance(items, dict):
+                items = items.get('tasks')
+            if not isinstance(items, list):
+                return jsonify({'error': 'Expected a JSON array of tasks'}), 400
+        
+        if len(items) > BULK_MAX_TASKS:
+            return jsonify({'error': f'At most {BULK_MAX_TASKS} tasks per request'}), 413
+        
+        # Validate everything first, then insert the good rows in one statement
+        results = []
+        rows = []
+        for index, item in enumerate(items):
+            try:
+                if isinstance(item, Exception):
+                    raise item
+                rows.append(validate_bulk_task(item))
+                results.append({'index': index, 'status': 'created'})
+            except ValueError as e:
+                results.append({'index': index, 'status': 'error', 'error': str(e)})
+        
+        if rows:
+            ids = db.session.scalars(
+                db.insert(Task).returning(Task.id, sort_by_parameter_order=True),
+                rows
+            ).all()
+            index_tasks([(task_id, row['title'], row['description']) for task_id, row in zip(ids, rows)])
+            db.session.commit()
+            
+            created = iter(ids)
+            for result in results:
+                if result['status'] == 'created':
+                    result['id'] = next(created)
+        
+        return jsonify({
+            'created': len(rows),
+            'failed': len(results) - len(rows),
+            'results': results
+        }), 201 if rows else 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
 # Mark task as sent to Jira
 @app.route('/api/tasks/<int:task_id>/mark-sent', methods=['POST'])
 def mark_sent(task_id):
@@ -184,6 +1297,115 @@ def confirm_task(task_id):
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+# Batch status changes: action -> (statuses it may start from, new status)
+TRANSITIONS = {
+    'confirm': (('detected',), 'pending'),
+    'decline': (('detected', 'pending'), 'declined'),
+    'restore': (('declined',), 'pending'),
+    'mark-sent': (('detected', 'pending'), 'sent'),
+}
+
+def validate_transition(data):
+    """(task id, action, Jira columns) of one batch item, raises ValueError"""
+    if not isinstance(data, dict):
+        raise ValueError('Transition must be a JSON object')
+    task_id = data.get('id')
+    if not isinstance(task_id, int) or isinstance(task_id, bool):
+        raise ValueError('id must be an integer')
+    action = data.get('action')
+    if action not in TRANSITIONS:
+        raise ValueError(f"action must be one of {', '.join(TRANSITIONS)}")
+    
+    jira = {}
+    if action == 'mark-sent':
+        for field in ('jiraKey', 'jiraUrl'):
+            if not isinstance(data.get(field), (str, type(None))):
+                raise ValueError(f'{field} must be a string or null')
+        if len(data.get('jiraKey') or '') > Task.jira_key.type.length:
+            raise ValueError(f'jiraKey must be at most {Task.jira_key.type.length} characters')
+        jira = {'jira_key': data.get('jiraKey'), 'jira_url': data.get('jiraUrl')}
+    return task_id, action, jira
+
+# Apply many status changes in one transaction (dashboard triage)
+# Body: [{"id": 1, "action": "decline"}, {"id": 2, "action": "mark-sent", "jiraKey": "DNM-1", "jiraUrl": "..."}]
+# or {"transitions": [...]}; actions are confirm, decline, restore and mark-sent
+@app.route('/api/tasks/batch', methods=['POST'])
+def transition_tasks_batch():
+    try:
+        items = request.get_json(silent=True)
+        if isinstance(items, dict):
+            items = items.get('transitions')
+        if not isinstance(items, list):
+            return jsonify({'error': 'Expected a JSON array of transitions'}), 400
+        
+        if len(items) > BULK_MAX_TASKS:
+            return jsonify({'error': f'At most {BULK_MAX_TASKS} transitions per request'}), 413
+        
+        results = []
+        valid = []
+        seen = set()
+        for index, item in enumerate(items):
+            result = {'index': index}
+            results.append(result)
+            try:
+                task_id, action, jira = validate_transition(item)
+                result['id'] = task_id
+                if task_id in seen:
+                    raise ValueError('Task appears more than once')
+                seen.add(task_id)
+                valid.append((result, task_id, action, jira))
+            except ValueError as e:
+                result.update(status='error', error=str(e))
+        
+        # Check every transition against the current statuses in one query
+        statuses = dict(db.session.execute(select(Task.id, Task.status).where(Task.id.in_(seen))).all()) \
+            if seen else {}
+        groups = {}
+        for result, task_id, action, jira in valid:
+            allowed, _ = TRANSITIONS[action]
+            status = statuses.get(task_id)
+            if status is None:
+                result.update(status='error', error='Task not found')
+            elif status not in allowed:
+                result.update(status='error', error=f'Cannot {action} a {status} task')
+            else:
+                groups.setdefault(action, []).append((result, task_id, jira))
+        
+        # One UPDATE per action, its status condition skips rows another request changed meanwhile
+        now = datetime.utcnow()
+        for action, entries in groups.items():
+            allowed, new_status = TRANSITIONS[action]
+            values = {'status': new_status, 'updated_at': now}
+            if action == 'mark-sent':
+                for jira_column in ('jira_key', 'jira_url'):
+                    values[jira_column] = case({task_id: jira[jira_column] for _, task_id, jira in entries},
+                                               value=Task.id)
+            
+            updated = set(db.session.scalars(
+                update(Task)
+                .where(Task.id.in_([task_id for _, task_id, _ in entries]), Task.status.in_(allowed))
+                .values(**values)
+                .returning(Task.id),
+                execution_options={'synchronize_session': False}
+            ))
+            for result, task_id, _ in entries:
+                if task_id in updated:
+                    result['status'] = 'updated'
+                else:
+                    result.update(status='error', error='Task was changed by another request')
+        
+        db.session.commit()
+        
+        updated_count = sum(result['status'] == 'updated' for result in results)
+        return jsonify({
+            'updated': updated_count,
+            'failed': len(results) - updated_count,
+            'results': results
+        }), 200 if updated_count else 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
 # Update task
 @app.route('/api/tasks/<int:task_id>', methods=['PUT'])
 def update_task(task_id):
@@ -208,6 +1430,8 @@ def update_task(task_id):
                 task.deadline = None
         
         task.updated_at = datetime.utcnow()
+        if 'title' in data or 'description' in data:
+            index_tasks([task])
         
         db.session.commit()
         return jsonify(task.to_dict())
@@ -215,16 +1439,23 @@ def update_task(task_id):
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+def detected_tasks_query():
+    """SELECT of task_columns(None) for GET /api/tasks/detected, shared with the ASGI handler"""
+    return select(*task_columns(None)).where(Task.status == 'detected') \
+        .order_by(Task.created_at.desc(), Task.id.desc())
+
 # Get detected tasks (for extension popup)
 @app.route('/api/tasks/detected', methods=['GET'])
+@conditional_get(detected_tasks_validator)
+@cached_response
 def get_detected_tasks():
     try:
-        tasks = Task.query.filter_by(status='detected').order_by(Task.created_at.desc()).all()
-        return jsonify([task.to_dict() for task in tasks])
+        return tasks_response(db.session.execute(detected_tasks_query()).all(), None)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 # Analyze text for tasks using AI (for on-page detection)
+# Send "async": true to get a job id back right away and poll /api/analyze-jobs/<id>
 @app.route('/api/analyze-tasks', methods=['POST'])
 def analyze_tasks():
     try:
@@ -237,219 +1468,1063 @@ def analyze_tasks():
         if not text or len(text) < 50:
             return jsonify({'tasks': []})
         
-        # Use Groq AI to detect tasks
-        groq_api_key = os.getenv('GROQ_API_KEY')
+        if data.get('async'):
+            job = enqueue_job('analyze', {
+                'text': text,
+                'source': source,
+                'url': url,
+                'metadata': metadata
+            })
+            return jsonify({'jobId': job.id, 'status': job.status}), 202
         
-        if not groq_api_key:
-            # Fallback to simple keyword detection
-            tasks = detect_tasks_simple(text)
-        else:
-            # Use Groq AI
+        created_tasks = save_detected_tasks(cached_extract_tasks(text, source), source, url, metadata)
+        
+        return jsonify({
+            'tasks': [task.to_dict() for task in created_tasks],
+            'count': len(created_tasks)
+        })
+    
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error analyzing tasks: {e}")
+        return jsonify({'error': str(e), 'tasks': []}), 500
+
+def groq_client():
+    """Shared Groq client, or None when GROQ_API_KEY isn't set or groq can't be loaded"""
+    groq_api_key = os.getenv('GROQ_API_KEY')
+    if not groq_api_key:
+        return None
+    try:
+        return llm.shared_client(groq_api_key)
+    except Exception as e:
+        print(f"Groq initialization error: {e}")
+        return None
+
+def extract_tasks(text):
+    """Extract task dicts from text with Groq AI, or keywords without an API key"""
+    client = groq_client()
+    if not client:
+        # Fallback to simple keyword detection
+        return detect_tasks_simple(text)
+    
+    try:
+        return extract_tasks_chunked(client, text)[0]
+    except Exception as e:
+        print(f"Groq API error: {e}")
+        # Fallback to simple detection
+        return detect_tasks_simple(text)
+
+def extract_tasks_chunked(client, text):
+    """llm.extract_tasks_chunked() with the configured limits, returns (tasks, calls)"""
+    return llm.extract_tasks_chunked(
+        client, text,
+        concurrency=LLM_CHUNK_CONCURRENCY,
+        max_chunks=LLM_MAX_CHUNKS,
+        fallback=detect_tasks_simple
+    )
+
+def extract_tasks_batch(messages):
+    """
+    Extract tasks for several (id, text) messages, packing them into as few
+    Groq calls as possible. Returns ({id: tasks}, number of LLM calls).
+    """
+    client = groq_client()
+    if not client:
+        return {message_id: detect_tasks_simple(message_text) for message_id, message_text in messages}, 0
+    
+    results = {}
+    calls = 0
+    batch = []
+    batch_chars = 0
+    for message_id, message_text in messages + [(None, None)]:
+        # Long messages are chunked on their own instead of truncated in a batch
+        if message_text is not None and len(message_text) > llm.MAX_MESSAGE_CHARS:
             try:
-                from groq import Groq
-                client = Groq(api_key=groq_api_key)
+                results[message_id], chunk_calls = extract_tasks_chunked(client, message_text)
+                calls += chunk_calls
             except Exception as e:
-                print(f"Groq initialization error: {e}")
-                tasks = detect_tasks_simple(text)
-            
+                print(f"Groq API error: {e}")
+                results[message_id] = detect_tasks_simple(message_text)
+            continue
+        size = len(message_text) if message_text else 0
+        full = len(batch) >= LLM_BATCH_SIZE or batch_chars + size > LLM_BATCH_MAX_CHARS
+        if batch and (message_text is None or full):
             try:
-                prompt = f"""
-You are a task extraction assistant. Analyze the following email/message and extract actionable tasks.
-
-For each task found:
-1. Write a CLEAR, ACTIONABLE title (30-60 chars) - Start with a verb (e.g., "Review budget report", "Schedule meeting with team")
-2. Write a DETAILED description (2-3 sentences) that includes:
-   - What needs to be done
-   - Why it's important (if mentioned)
-   - Any relevant context or details
-3. Assign priority based on urgency indicators:
-   - "highest" = ASAP, urgent, critical, immediately
-   - "high" = important, soon, this week
-   - "medium" = normal priority, no urgency mentioned
-   - "low" = FYI, optional, when you have time
-4. Extract deadline if mentioned (format: YYYY-MM-DD)
-
-Text to analyze:
-{text[:2000]}
-
-Return ONLY a valid JSON array. If no tasks found, return [].
-Format:
-[
-  {{
-    "title": "Review Q4 budget report",
-    "description": "Review the Q4 budget report sent by finance team. Focus on marketing expenses and provide feedback by end of week. This is needed for the board meeting.",
-    "priority": "high",
-    "deadline": "2026-01-24"
-  }}
-]
-"""
-                
-                response = client.chat.completions.create(
-                    model="llama-3.3-70b-versatile",
-                    messages=[
-                        {"role": "system", "content": "You are an expert task extraction assistant. Extract clear, actionable tasks with detailed descriptions. Return only valid JSON."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.3,
-                    max_tokens=1000
-                )
-                
-                result = response.choices[0].message.content.strip()
-                
-                # Clean up response (remove markdown code blocks if present)
-                if result.startswith('```'):
-                    result = result.split('```')[1]
-                    if result.startswith('json'):
-                        result = result[4:]
-                result = result.strip()
-                
-                # Parse JSON
-                import json
-                tasks = json.loads(result)
-                if not isinstance(tasks, list):
-                    tasks = []
+                batch_results, batch_calls = llm.extract_tasks_batch(client, batch)
+                results.update(batch_results)
+                calls += batch_calls
             except Exception as e:
                 print(f"Groq API error: {e}")
-                # Fallback to simple detection
-                tasks = detect_tasks_simple(text)
+                for batch_id, batch_text in batch:
+                    results.setdefault(batch_id, detect_tasks_simple(batch_text))
+            batch = []
+            batch_chars = 0
+        if message_text is not None:
+            batch.append((message_id, message_text))
+            batch_chars += size
+    return results, calls
+
+# Analyze many messages at once, several messages share each LLM call
+# Body: {"messages": [{"id": "m1", "text": ..., "source": ..., "url": ..., "metadata": {...}}]}
+@app.route('/api/analyze-tasks/bulk', methods=['POST'])
+def analyze_tasks_bulk():
+    try:
+        data = request.get_json(silent=True)
+        messages = data.get('messages') if isinstance(data, dict) else None
+        if not isinstance(messages, list):
+            return jsonify({'error': 'Expected {"messages": [...]}'}), 400
+        if len(messages) > BULK_MAX_TASKS:
+            return jsonify({'error': f'At most {BULK_MAX_TASKS} messages per request'}), 413
         
-        # Create detected tasks in database
-        created_tasks = []
-        for task_data in tasks:
-            # Parse deadline
-            deadline = None
-            if task_data.get('deadline'):
-                try:
-                    from datetime import datetime as dt
-                    deadline = dt.fromisoformat(task_data['deadline']).date()
-                except:
-                    deadline = None
-            
-            task = Task(
-                title=task_data.get('title', 'Untitled Task')[:500],
-                description=task_data.get('description', ''),
-                source=source,
-                url=url,
-                priority=task_data.get('priority', 'medium'),
-                deadline=deadline,
-                status='detected',
-                task_metadata={
-                    'aiDetected': True,
-                    'detectedAt': datetime.utcnow().isoformat(),
-                    **metadata
-                }
+        for index, message in enumerate(messages):
+            try:
+                validate_analyze_message(message)
+            except ValueError as e:
+                return jsonify({'error': f'messages[{index}]: {e}'}), 400
+            message.setdefault('id', str(index))
+            message['id'] = str(message['id'])
+        if len({m['id'] for m in messages}) != len(messages):
+            return jsonify({'error': 'Message ids must be unique'}), 400
+        
+        # Answer from the analysis cache where possible, batch the rest
+        extracted = {}
+        pending = []
+        for message in messages:
+            message_text = message.get('text') or ''
+            if len(message_text) < 50:
+                extracted[message['id']] = []
+                continue
+            cached = cached_analysis(message_text, message.get('source', 'web'))
+            if cached is not None:
+                extracted[message['id']] = cached
+            else:
+                pending.append((message['id'], message_text))
+        
+        batch_results, calls = extract_tasks_batch(pending)
+        sources = {m['id']: m.get('source', 'web') for m in messages}
+        for message_id, message_text in pending:
+            store_analysis(message_text, sources[message_id], batch_results[message_id])
+        extracted.update(batch_results)
+        
+        results = []
+        for message in messages:
+            created_tasks = save_detected_tasks(
+                extracted[message['id']],
+                message.get('source', 'web'),
+                message.get('url', ''),
+                message.get('metadata', {})
             )
-            
-            db.session.add(task)
-            created_tasks.append(task)
+            results.append({
+                'id': message['id'],
+                'tasks': [task.to_dict() for task in created_tasks],
+                'count': len(created_tasks)
+            })
         
-        if created_tasks:
-            db.session.commit()
+        return jsonify({'results': results, 'llmCalls': calls})
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error analyzing tasks: {e}")
+        return jsonify({'error': str(e)}), 500
+
+# Get the status of a background analysis job
+@app.route('/api/analyze-jobs/<job_id>', methods=['GET'])
+def get_analyze_job(job_id):
+    try:
+        job = db.session.get(Job, job_id)
+        if not job or job.kind != 'analyze':
+            return jsonify({'error': 'Job not found'}), 404
         
+        data = job.to_dict()
+        result = data.pop('result') or {}
+        data['tasks'] = result.get('tasks', [])
+        data['count'] = result.get('count', 0)
+        return jsonify(data)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# Analysis cache hit/miss counters
+@app.route('/api/analyze-cache/stats', methods=['GET'])
+def get_analysis_cache_stats():
+    try:
+        # Other workers' counts arrive with their next housekeeping
+        flush_analysis_cache_stats()
+        counters = dict(db.session.query(Counter.name, Counter.value)
+                        .filter(Counter.name.like('analysis_cache.%')))
+        hits = counters.get('analysis_cache.hits', 0)
+        misses = counters.get('analysis_cache.misses', 0)
         return jsonify({
-            'tasks': [task.to_dict() for task in created_tasks],
-            'count': len(created_tasks)
+            'hits': hits,
+            'misses': misses,
+            'evictions': counters.get('analysis_cache.evictions', 0),
+            'hitRate': hits / (hits + misses) if hits + misses else 0,
+            'entries': db.session.query(func.count(AnalysisCacheEntry.key)).scalar()
         })
-    
     except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def increment_counter(name, amount=1):
+    """Add to a shared counter in the current transaction"""
+    updated = db.session.execute(
+        update(Counter).where(Counter.name == name).values(value=Counter.value + amount)
+    ).rowcount
+    if not updated:
+        db.session.add(Counter(name=name, value=amount))
+
+def analysis_cache_key(text, source):
+    """Hash of the text with case and whitespace differences removed"""
+    normalized = ' '.join(text.lower().split())
+    return hashlib.sha256(f'{source}\0{normalized}'.encode()).hexdigest()
+
+def cached_extract_tasks(text, source):
+    """extract_tasks() behind the shared analysis cache"""
+    tasks = cached_analysis(text, source)
+    if tasks is None:
+        tasks = extract_tasks(text)
+        store_analysis(text, source, tasks)
+    return tasks
+
+# Hits and misses of this process, added to the shared counters by
+# flush_analysis_cache_stats so lookups don't write to one hot row
+_analysis_cache_stats = {'analysis_cache.hits': 0, 'analysis_cache.misses': 0}
+_analysis_cache_stats_lock = threading.Lock()
+
+def count_analysis_cache(name):
+    with _analysis_cache_stats_lock:
+        _analysis_cache_stats[name] += 1
+
+def flush_analysis_cache_stats():
+    """Add this process's hit and miss counts to the shared counters, commits"""
+    with _analysis_cache_stats_lock:
+        pending = {name: count for name, count in _analysis_cache_stats.items() if count}
+        for name in pending:
+            _analysis_cache_stats[name] = 0
+    try:
+        for name, count in pending.items():
+            increment_counter(name, count)
+        db.session.commit()
+    except Exception:
         db.session.rollback()
-        print(f"Error analyzing tasks: {e}")
-        return jsonify({'error': str(e), 'tasks': []}), 500
+        # Kept for the next flush
+        with _analysis_cache_stats_lock:
+            for name, count in pending.items():
+                _analysis_cache_stats[name] += count
+        raise
 
-def detect_tasks_simple(text):
-    """Simple keyword-based task detection (fallback)"""
-    import re
-    tasks = []
-    
-    # Keywords that indicate tasks
-    patterns = [
-        (r'please\s+([^.!?\n]{10,100})', 'high'),
-        (r'can you\s+([^.!?\n]{10,100})', 'medium'),
-        (r'need to\s+([^.!?\n]{10,100})', 'high'),
-        (r'should\s+([^.!?\n]{10,100})', 'medium'),
-        (r'must\s+([^.!?\n]{10,100})', 'highest'),
-        (r'action item[s]?:?\s*([^.!?\n]{10,100})', 'high'),
-        (r'todo[s]?:?\s*([^.!?\n]{10,100})', 'medium'),
-        (r'task[s]?:?\s*([^.!?\n]{10,100})', 'medium'),
-        (r'reminder:?\s*([^.!?\n]{10,100})', 'medium'),
-        (r'don\'t forget to\s+([^.!?\n]{10,100})', 'high'),
-    ]
-    
-    seen_tasks = set()
-    
-    for pattern, priority in patterns:
-        matches = re.finditer(pattern, text, re.IGNORECASE)
-        for match in matches:
-            # Extract the action phrase
-            action = match.group(1).strip()
-            
-            # Skip if too short or already seen
-            if len(action) < 10 or action.lower() in seen_tasks:
-                continue
-            
-            seen_tasks.add(action.lower())
-            
-            # Extract more context around the match
-            start = max(0, match.start() - 100)
-            end = min(len(text), match.end() + 150)
-            context = text[start:end].strip()
-            
-            # Clean up title (capitalize first letter, remove extra spaces)
-            title = action[:60].strip()
-            if not title[0].isupper():
-                title = title[0].upper() + title[1:]
-            
-            # Create description from context
-            description = context[:300].strip()
-            if len(context) > 300:
-                description += '...'
-            
-            task = {
-                'title': title,
-                'description': description,
-                'priority': priority,
-                'deadline': None
+def cached_analysis(text, source):
+    """Cached extraction result, or None on a miss (counts hits and misses)"""
+    if ANALYSIS_CACHE_TTL_SECONDS <= 0:
+        return None
+    
+    now = datetime.utcnow()
+    entry = db.session.get(AnalysisCacheEntry, analysis_cache_key(text, source))
+    if entry and entry.created_at > now - timedelta(seconds=ANALYSIS_CACHE_TTL_SECONDS):
+        count_analysis_cache('analysis_cache.hits')
+        # Recent enough for LRU eviction, most hits write nothing
+        if entry.last_used_at < now - timedelta(seconds=ANALYSIS_CACHE_TOUCH_SECONDS):
+            entry.last_used_at = now
+            db.session.commit()
+        return entry.result
+    
+    count_analysis_cache('analysis_cache.misses')
+    return None
+
+def store_analysis(text, source, tasks):
+    """Cache an extraction result, replacing an expired entry (evict_analysis_cache trims the table)"""
+    if ANALYSIS_CACHE_TTL_SECONDS <= 0:
+        return
+    
+    key = analysis_cache_key(text, source)
+    try:
+        entry = db.session.get(AnalysisCacheEntry, key)
+        if entry:
+            entry.result = tasks
+            entry.hits = 0
+            entry.created_at = entry.last_used_at = datetime.utcnow()
+        else:
+            db.session.add(AnalysisCacheEntry(key=key, result=tasks))
+        db.session.commit()
+    except IntegrityError:
+        # Another worker cached the same text first
+        db.session.rollback()
+
+def evict_analysis_cache():
+    """Drop expired entries, then least recently used ones above the size limit
+    
+    Run by housekeeping (job_housekeeping, worker.py), not per insert, so
+    the table can run over ANALYSIS_CACHE_MAX_ENTRIES in between.
+    """
+    expired = AnalysisCacheEntry.query.filter(
+        AnalysisCacheEntry.created_at < datetime.utcnow() - timedelta(seconds=ANALYSIS_CACHE_TTL_SECONDS)
+    ).delete(synchronize_session=False)
+    
+    excess = db.session.query(func.count(AnalysisCacheEntry.key)).scalar() - ANALYSIS_CACHE_MAX_ENTRIES
+    lru = 0
+    if excess > 0:
+        oldest = db.session.query(AnalysisCacheEntry.key) \
+            .order_by(AnalysisCacheEntry.last_used_at).limit(excess)
+        lru = AnalysisCacheEntry.query.filter(AnalysisCacheEntry.key.in_(oldest.scalar_subquery())) \
+            .delete(synchronize_session=False)
+    
+    if expired or lru:
+        increment_counter('analysis_cache.evictions', expired + lru)
+    db.session.commit()
+
+def task_fingerprint(url, title):
+    """Identity of a detected task: the same title found again on the same page is a duplicate"""
+    title = llm.normalize_title(title)
+    if not title:
+        return None
+    return hashlib.sha256(f"{(url or '').strip()}\n{title}".encode()).hexdigest()
+
+def detected_task_rows(tasks, source, url, metadata):
+    """Column values of new detected tasks for extracted task dicts"""
+    rows = []
+    seen = set()
+    now = datetime.utcnow()
+    for task_data in tasks:
+        # Parse deadline
+        deadline = None
+        if task_data.get('deadline'):
+            try:
+                deadline = datetime.fromisoformat(task_data['deadline']).date()
+            except:
+                deadline = None
+        
+        title = task_data.get('title', 'Untitled Task')[:500]
+        fingerprint = task_fingerprint(url, title)
+        if fingerprint and fingerprint in seen:
+            continue
+        seen.add(fingerprint)
+        rows.append({
+            'title': title,
+            'description': task_data.get('description', ''),
+            'source': source,
+            'url': url,
+            'priority': task_data.get('priority', 'medium'),
+            'deadline': deadline,
+            'status': 'detected',
+            'fingerprint': fingerprint,
+            'created_at': now,
+            'updated_at': now,
+            'task_metadata': {
+                'aiDetected': True,
+                'detectedAt': now.isoformat(),
+                **metadata
             }
-            tasks.append(task)
-            
-            if len(tasks) >= 5:
+        })
+    return rows
+
+# INSERT ... ON CONFLICT per dialect
+UPSERT_INSERTS = {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}
+
+def detected_tasks_insert(rows, dialect):
+    """INSERT of detected task rows returning the new Tasks, rows whose fingerprint is stored already are skipped"""
+    # No conflict target: a partitioned tasks table has no unique fingerprint
+    # index to name, its trigger skips taken fingerprints itself
+    return UPSERT_INSERTS[dialect](Task).values(rows).on_conflict_do_nothing().returning(Task)
+
+def without_stored(rows):
+    """
+    Detected task rows minus those whose fingerprint is stored or archived,
+    before the near-duplicate lookup would match (or merge into) their own copy
+    """
+    fingerprints = [row['fingerprint'] for row in rows if row['fingerprint']]
+    if not fingerprints:
+        return rows
+    stored = set(db.session.scalars(
+        select(Task.fingerprint).where(Task.fingerprint.in_(fingerprints)).union(
+            select(TaskArchive.fingerprint).where(TaskArchive.fingerprint.in_(fingerprints))
+        )
+    ))
+    return [row for row in rows if row['fingerprint'] not in stored]
+
+def save_detected_tasks(tasks, source, url, metadata):
+    """Create detected tasks in database, returns the new Task rows (not the duplicates)"""
+    rows = without_stored(detected_task_rows(tasks, source, url, metadata))
+    rows, _ = apply_near_duplicates(rows)
+    created_tasks = []
+    if rows:
+        created_tasks = db.session.scalars(detected_tasks_insert(rows, db.engine.dialect.name)).all()
+        index_tasks(created_tasks)
+    db.session.commit()
+    return sorted(created_tasks, key=lambda task: task.id)
+
+# ============================================================
+# Near-duplicate tasks, see minhash.py
+# ============================================================
+
+def task_signature(title, description):
+    return minhash.signature(minhash.shingles(title, description))
+
+def similar_tasks(title, description, limit=5):
+    """(task id, estimated similarity) of stored tasks at least NEAR_DUPLICATE_THRESHOLD similar, best first"""
+    return similar_tasks_many([(title, description)], limit)[0]
+
+def similar_tasks_many(entries, limit=5):
+    """similar_tasks of several (title, description) entries, with one query for all of them"""
+    signatures = [task_signature(title, description) for title, description in entries]
+    keys = {key for signature in signatures if signature for key in minhash.band_keys(signature)}
+    if not keys:
+        return [[] for _ in entries]
+    
+    # Candidates share an LSH bucket, deleted tasks may still have stale rows
+    rows = db.session.execute(
+        select(TaskBucket.bucket, TaskSignature.task_id, TaskSignature.signature)
+        .join(TaskSignature, TaskSignature.task_id == TaskBucket.task_id)
+        .join(Task, Task.id == TaskSignature.task_id)
+        .where(TaskBucket.bucket.in_(keys))
+    )
+    buckets = {}
+    stored = {}
+    for bucket, task_id, packed in rows:
+        buckets.setdefault(bucket, set()).add(task_id)
+        if task_id not in stored:
+            stored[task_id] = minhash.unpack(packed)
+    
+    results = []
+    for signature in signatures:
+        if signature is None:
+            results.append([])
+            continue
+        candidates = set().union(*(buckets.get(key, ()) for key in minhash.band_keys(signature)))
+        matches = [(task_id, minhash.similarity(signature, stored[task_id])) for task_id in candidates]
+        matches = [match for match in matches if match[1] >= NEAR_DUPLICATE_THRESHOLD]
+        results.append(sorted(matches, key=lambda match: (-match[1], match[0]))[:limit])
+    return results
+
+def unindex_tasks(task_ids):
+    """Drop signatures and buckets of these task ids (None: of every task)"""
+    for model in (TaskBucket, TaskSignature):
+        statement = delete(model)
+        if task_ids is not None:
+            statement = statement.where(model.task_id.in_(task_ids))
+        db.session.execute(statement)
+
+def index_tasks(tasks):
+    """Store signatures and buckets of Tasks or (id, title, description) tuples, replacing older ones"""
+    entries = [(t.id, t.title, t.description) if isinstance(t, Task) else t for t in tasks]
+    unindex_tasks([task_id for task_id, _, _ in entries])
+    
+    signatures = []
+    buckets = []
+    for task_id, title, description in entries:
+        signature = task_signature(title, description)
+        if signature is None:
+            continue
+        signatures.append({'task_id': task_id, 'signature': minhash.pack(signature)})
+        buckets += [{'bucket': key, 'task_id': task_id} for key in set(minhash.band_keys(signature))]
+    if signatures:
+        db.session.execute(db.insert(TaskSignature), signatures)
+        db.session.execute(db.insert(TaskBucket), buckets)
+
+def merge_into_task(task, values):
+    """Fold a near-duplicate into a stored task: higher priority, known deadline, a merge count"""
+    if llm.PRIORITY_RANK.get(values.get('priority'), -1) > llm.PRIORITY_RANK.get(task.priority, -1):
+        task.priority = values['priority']
+    if not task.deadline and values.get('deadline'):
+        task.deadline = values['deadline']
+    metadata = dict(task.task_metadata or {})
+    metadata['mergedDuplicates'] = metadata.get('mergedDuplicates', 0) + 1
+    task.task_metadata = metadata
+    task.updated_at = datetime.utcnow()
+
+def apply_near_duplicates(rows):
+    """
+    NEAR_DUPLICATE_MODE for column values of new tasks, returns (rows to
+    insert, stored tasks that rows were merged into). One LSH lookup for all
+    rows. The caller commits.
+    """
+    if NEAR_DUPLICATE_MODE not in ('flag', 'merge'):
+        return rows, []
+    
+    kept = []
+    merged = []
+    similar = similar_tasks_many([(row['title'], row.get('description')) for row in rows])
+    for row, matches in zip(rows, similar):
+        if matches and NEAR_DUPLICATE_MODE == 'merge':
+            task = db.session.get(Task, matches[0][0])
+            merge_into_task(task, row)
+            merged.append(task)
+            continue
+        if matches:
+            row['task_metadata'] = {
+                **(row.get('task_metadata') or {}),
+                'similarTo': [{'id': task_id, 'score': round(score, 2)} for task_id, score in matches]
+            }
+        kept.append(row)
+    return kept, merged
+
+def index_all_tasks():
+    """Index tasks stored before signatures existed and drop rows of deleted tasks, returns (indexed, dropped)"""
+    indexed = 0
+    query = select(Task.id, Task.title, Task.description) \
+        .where(~Task.id.in_(select(TaskSignature.task_id))) \
+        .order_by(Task.id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+    for batch in db.session.execute(query).partitions():
+        index_tasks([tuple(row) for row in batch])
+        indexed += len(batch)
+    
+    stale = db.session.scalars(
+        select(TaskSignature.task_id).where(~TaskSignature.task_id.in_(select(Task.id)))
+    ).all()
+    unindex_tasks(stale)
+    db.session.commit()
+    return indexed, len(stale)
+
+# Kept first when compact_detected_tasks collapses duplicates
+STATUS_RANK = {'sent': 3, 'pending': 2, 'declined': 1, 'detected': 0}
+
+def compact_detected_tasks():
+    """
+    Collapse AI-detected tasks stored before fingerprints existed: of each
+    group with the same fingerprint keep the most advanced one (sent, then
+    pending, declined, detected; oldest first), delete the others with a
+    tombstone and fingerprint the survivor. Returns (fingerprinted, deleted).
+    """
+    groups = {}
+    query = select(Task.id, Task.url, Task.title, Task.status, Task.fingerprint, Task.task_metadata) \
+        .order_by(Task.id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+    for row in db.session.execute(query):
+        if row.fingerprint is None and not (row.task_metadata or {}).get('aiDetected'):
+            continue
+        fingerprint = row.fingerprint or task_fingerprint(row.url, row.title)
+        if fingerprint:
+            groups.setdefault(fingerprint, []).append(row)
+    
+    duplicates = []
+    fingerprints = []
+    for fingerprint, rows in groups.items():
+        keep = max(rows, key=lambda row: (STATUS_RANK.get(row.status, 0), -row.id))
+        duplicates += [row.id for row in rows if row is not keep]
+        if keep.fingerprint is None:
+            fingerprints.append({'id': keep.id, 'fingerprint': fingerprint})
+    
+    # Deletes first, a survivor may take over the fingerprint of a deleted row
+    for start in range(0, len(duplicates), EXPORT_BATCH_SIZE):
+        batch = duplicates[start:start + EXPORT_BATCH_SIZE]
+        db.session.execute(delete(Task).where(Task.id.in_(batch)), execution_options={'synchronize_session': False})
+        db.session.execute(db.insert(TaskTombstone), [{'task_id': task_id} for task_id in batch])
+        unindex_tasks(batch)
+    if fingerprints:
+        db.session.execute(update(Task), fingerprints)
+    db.session.commit()
+    return len(fingerprints), len(duplicates)
+
+# ============================================================
+# Retention: old sent/declined tasks move to tasks_archive
+# ============================================================
+
+def expired_tasks(status, cutoff):
+    return (Task.status == status, Task.updated_at < cutoff)
+
+def archive_batch_query(status, cutoff):
+    """Ids of the next RETENTION_BATCH_SIZE expired tasks, oldest first through ix_tasks_status_updated_at"""
+    return select(Task.id).where(*expired_tasks(status, cutoff)) \
+        .order_by(Task.updated_at).limit(RETENTION_BATCH_SIZE)
+
+def archive_batch(status, cutoff, now):
+    """Move up to RETENTION_BATCH_SIZE tasks of status not updated since cutoff, returns how many"""
+    batch = archive_batch_query(status, cutoff).scalar_subquery()
+    # DELETE ... RETURNING, so a task updated meanwhile is neither moved nor lost
+    rows = db.session.execute(
+        delete(Task).where(Task.id.in_(batch), *expired_tasks(status, cutoff))
+        .returning(*(getattr(Task, name) for name in ARCHIVE_COLUMNS)),
+        execution_options={'synchronize_session': False}
+    ).all()
+    if rows:
+        db.session.execute(db.insert(TaskArchive), [{**row._mapping, 'archived_at': now} for row in rows])
+        # Sync clients drop them like deleted tasks
+        db.session.execute(db.insert(TaskTombstone), [{'task_id': row.id} for row in rows])
+        unindex_tasks([row.id for row in rows])
+    db.session.commit()
+    return len(rows)
+
+def archive_tasks(now=None):
+    """Move tasks past their status's RETENTION_DAYS to tasks_archive in batches, returns {status: moved}"""
+    now = now or datetime.utcnow()
+    moved = {}
+    for status, days in RETENTION_DAYS.items():
+        if days <= 0:
+            continue
+        cutoff = now - timedelta(days=days)
+        moved[status] = 0
+        while True:
+            count = archive_batch(status, cutoff, now)
+            moved[status] += count
+            if count < RETENTION_BATCH_SIZE:
                 break
-        
-        if len(tasks) >= 5:
-            break
+    return moved
+
+def prune_tombstones(now=None):
+    """Delete tombstones older than TOMBSTONE_RETENTION_DAYS in batches, returns how many"""
+    if TOMBSTONE_RETENTION_DAYS <= 0:
+        return 0
+    now = now or datetime.utcnow()
+    newest_old = db.session.execute(
+        select(TaskTombstone.id).where(TaskTombstone.deleted_at < now - timedelta(days=TOMBSTONE_RETENTION_DAYS))
+        .order_by(TaskTombstone.deleted_at.desc()).limit(1)
+    ).scalar()
+    if newest_old is None:
+        return 0
+    # The newest old one stays, so SQLite never hands out a pruned id again
+    pruned_id = newest_old - 1
+    # Recorded before any goes, so a client behind it is reset rather than missing deletes
+    db.session.execute(
+        update(Counter).where(Counter.name == TOMBSTONES_PRUNED, Counter.value < pruned_id).values(value=pruned_id)
+    )
+    db.session.commit()
     
-    return tasks
+    pruned = 0
+    while True:
+        batch = select(TaskTombstone.id).where(TaskTombstone.id <= pruned_id) \
+            .order_by(TaskTombstone.id).limit(RETENTION_BATCH_SIZE).scalar_subquery()
+        count = db.session.execute(
+            delete(TaskTombstone).where(TaskTombstone.id.in_(batch)),
+            execution_options={'synchronize_session': False}
+        ).rowcount
+        db.session.commit()
+        pruned += count
+        if count < RETENTION_BATCH_SIZE:
+            return pruned
 
-# Delete task
+# ============================================================
+# Partitioned tasks table (PostgreSQL), see partitions.py
+# ============================================================
+
+def tasks_partitioned():
+    return db.engine.dialect.name == 'postgresql' and partitions.is_partitioned(db.session)
+
+def drop_task_partitions(names, now):
+    """Archive the rows of these partitions (like archive_tasks) and drop them, doesn't commit"""
+    for name in names:
+        partition = table(name, *(column(c) for c in ARCHIVE_COLUMNS))
+        partition_ids = select(partition.c.id)
+        db.session.execute(db.insert(TaskArchive).from_select(
+            ARCHIVE_COLUMNS + ['archived_at'], select(*partition.c, literal(now))
+        ))
+        db.session.execute(db.insert(TaskTombstone).from_select(['task_id'], partition_ids))
+        unindex_tasks(partition_ids)
+        # DROP fires no delete triggers
+        db.session.execute(text(
+            f'DELETE FROM task_fingerprints WHERE fingerprint IN (SELECT fingerprint FROM {name})'
+        ))
+        db.session.execute(text(f'ALTER TABLE tasks DETACH PARTITION {name}'))
+        db.session.execute(text(f'DROP TABLE {name}'))
+    if names:
+        bump_tasks_version(db.session)
+
+def maintain_task_partitions(now=None):
+    """Create upcoming monthly partitions and drop expired ones, returns (created, dropped) or None if not partitioned"""
+    if not tasks_partitioned():
+        return None
+    now = now or datetime.utcnow()
+    created = partitions.create_partitions(db.session, partitions.month_start(now, TASK_PARTITION_MONTHS_AHEAD))
+    dropped = []
+    if TASK_PARTITION_RETENTION_MONTHS > 0:
+        cutoff = partitions.month_start(now, -TASK_PARTITION_RETENTION_MONTHS)
+        dropped = partitions.expired_partitions(db.session, cutoff)
+        drop_task_partitions(dropped, now)
+    db.session.commit()
+    return created, dropped
+
+def detect_tasks_simple(text):
+    """Simple keyword-based task detection (fallback)"""
+    return task_detector.detect(text)
+
+# ============================================================
+# Background jobs
+# ============================================================
+
+# Job kind -> function(payload) returning a JSON-serializable result
+JOB_HANDLERS = {}
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+_last_housekeeping = None
+
+def job_handler(kind):
+    def register(fn):
+        JOB_HANDLERS[kind] = fn
+        return fn
+    return register
+
+def job_executor():
+    """Thread pool for this process, re-created after a gunicorn fork"""
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix='job')
+            _executor_pid = os.getpid()
+        return _executor
+
+def enqueue_job(kind, payload):
+    """Store a queued job and start it unless an external worker runs jobs"""
+    job = Job(kind=kind, payload=payload, status='queued')
+    db.session.add(job)
+    db.session.commit()
+    
+    if JOB_MODE == 'thread':
+        job_executor().submit(run_job, job.id)
+    return job
+
+def run_job(job_id):
+    """Claim a queued job and run its handler, safe to call from several workers"""
+    with app.app_context():
+        claimed = db.session.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == 'queued')
+            .values(status='running', started_at=datetime.utcnow())
+        ).rowcount
+        db.session.commit()
+        if not claimed:
+            return
+        
+        g.job_id = job_id
+        job = db.session.get(Job, job_id)
+        try:
+            job.result = JOB_HANDLERS[job.kind](job.payload)
+            job.status = 'done'
+        except Exception as e:
+            db.session.rollback()
+            print(f"Job {job_id} failed: {e}")
+            job = db.session.get(Job, job_id)
+            job.status = 'failed'
+            job.error = str(e)
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+
+def report_job_progress(result):
+    """Partial result of the running job, stored with the handler's next commit"""
+    db.session.execute(
+        update(Job).where(Job.id == g.job_id).values(result=result),
+        execution_options={'synchronize_session': False}
+    )
+
+def expire_jobs():
+    """Fail jobs stuck in running (their worker died) and purge old finished jobs"""
+    now = datetime.utcnow()
+    Job.query.filter(
+        Job.status == 'running',
+        Job.started_at < now - timedelta(seconds=JOB_TIMEOUT_SECONDS)
+    ).update({'status': 'failed', 'error': 'Timed out', 'finished_at': now})
+    purged = Job.query.filter(
+        Job.status.in_(['done', 'failed']),
+        Job.finished_at < now - timedelta(days=JOB_RETENTION_DAYS)
+    ).delete()
+    db.session.commit()
+    return purged
+
+def job_housekeeping():
+    """expire_jobs and analysis cache upkeep, then run the oldest jobs queued for over JOB_HOUSEKEEPING_SECONDS again"""
+    with app.app_context():
+        try:
+            expire_jobs()
+            flush_analysis_cache_stats()
+            evict_analysis_cache()
+            stale = db.session.execute(
+                select(Job.id).where(
+                    Job.status == 'queued',
+                    Job.created_at < datetime.utcnow() - timedelta(seconds=JOB_HOUSEKEEPING_SECONDS)
+                ).order_by(Job.created_at).limit(100)
+            ).scalars().all()
+        except Exception as e:
+            db.session.rollback()
+            print(f"Job housekeeping failed: {e}")
+            return
+    # run_job claims atomically, a job still waiting in another worker's pool runs once
+    for job_id in stale:
+        job_executor().submit(run_job, job_id)
+    # Thread mode has no worker.py to archive tasks, add partitions and prune tombstones either
+    retention_housekeeping()
+
+def claim_interval(name, seconds):
+    """True for one caller across all processes per this many seconds, the time is kept in counters (commits)"""
+    now = int(time.time())
+    claimed = db.session.execute(
+        update(Counter).where(Counter.name == name, Counter.value <= now - seconds).values(value=now)
+    ).rowcount
+    if not claimed and db.session.get(Counter, name) is None:
+        db.session.add(Counter(name=name, value=now))
+        claimed = 1
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Another process claimed it first
+        db.session.rollback()
+        return False
+    return bool(claimed)
+
+def retention_housekeeping():
+    """archive_tasks, maintain_task_partitions and prune_tombstones, once per RETENTION_INTERVAL_SECONDS across web workers"""
+    with app.app_context():
+        try:
+            if RETENTION_INTERVAL_SECONDS <= 0 or not claim_interval(RETENTION_LAST_RUN, RETENTION_INTERVAL_SECONDS):
+                return
+            archive_tasks()
+            maintain_task_partitions()
+            prune_tombstones()
+        except Exception as e:
+            db.session.rollback()
+            print(f"Retention housekeeping failed: {e}")
+
+@app.before_request
+def schedule_job_housekeeping():
+    """Thread mode has no worker.py, so web workers look after the jobs table"""
+    global _last_housekeeping
+    if JOB_MODE != 'thread' or JOB_HOUSEKEEPING_SECONDS <= 0:
+        return
+    with _executor_lock:
+        now = time.monotonic()
+        if _last_housekeeping is not None and now - _last_housekeeping < JOB_HOUSEKEEPING_SECONDS:
+            return
+        _last_housekeeping = now
+    job_executor().submit(job_housekeeping)
+
+@job_handler('analyze')
+def analyze_job(payload):
+    created_tasks = save_detected_tasks(
+        cached_extract_tasks(payload['text'], payload['source']),
+        payload['source'],
+        payload['url'],
+        payload['metadata']
+    )
+    return {
+        'tasks': [task.to_dict() for task in created_tasks],
+        'count': len(created_tasks)
+    }
+
+# ============================================================
+# Deleting tasks: everything at once, or matching tasks in batches
+# ============================================================
+
+DELETE_FILTERS = ('status', 'source', 'olderThanDays')
+
+def delete_filters(args):
+    """Filters given in DELETE /api/tasks query args, raises ValueError"""
+    # A misspelled filter must not clear every task
+    unknown = sorted(set(args) - set(DELETE_FILTERS))
+    if unknown:
+        raise ValueError(f"Unknown filters: {', '.join(unknown)}")
+    filters = {name: args[name] for name in DELETE_FILTERS if args.get(name)}
+    if 'status' in filters and filters['status'] not in TASK_STATUSES:
+        raise ValueError(f"Invalid status: {filters['status']}")
+    if 'olderThanDays' in filters:
+        try:
+            filters['olderThanDays'] = int(filters['olderThanDays'])
+        except ValueError:
+            raise ValueError('olderThanDays must be a whole number')
+        if filters['olderThanDays'] < 0:
+            raise ValueError('olderThanDays must be a whole number')
+    return filters
+
+def filtered_tasks(model, filters, now):
+    """WHERE clauses for rows of Task or TaskArchive matching delete filters"""
+    clauses = []
+    if 'status' in filters:
+        clauses.append(model.status == filters['status'])
+    if 'source' in filters:
+        clauses.append(model.source == filters['source'])
+    if 'olderThanDays' in filters:
+        clauses.append(model.created_at < now - timedelta(days=filters['olderThanDays']))
+    return clauses
+
+def delete_batch(model, clauses, after_id):
+    """Delete the next DELETE_BATCH_SIZE matching rows by id after after_id, returns their ids"""
+    # Walking the primary key skips the rows earlier batches left dead
+    batch = select(model.id).where(model.id > after_id, *clauses).order_by(model.id).limit(DELETE_BATCH_SIZE)
+    ids = db.session.scalars(
+        delete(model).where(model.id.in_(batch.scalar_subquery()), *clauses).returning(model.id),
+        execution_options={'synchronize_session': False}
+    ).all()
+    if ids and model is Task:
+        db.session.execute(db.insert(TaskTombstone), [{'task_id': task_id} for task_id in ids])
+        unindex_tasks(ids)
+    return ids
+
+def delete_tasks(filters, now=None, progress=None):
+    """
+    Delete tasks and archived tasks matching filters, a batch per transaction.
+    progress({matched, deleted}) is called before each commit, returns the final one.
+    """
+    now = now or datetime.utcnow()
+    models = (Task, TaskArchive)
+    result = {'matched': 0, 'deleted': 0}
+    for model in models:
+        result['matched'] += db.session.scalar(
+            select(func.count()).select_from(model).where(*filtered_tasks(model, filters, now))
+        )
+    for model in models:
+        clauses = filtered_tasks(model, filters, now)
+        after_id = 0
+        while True:
+            ids = delete_batch(model, clauses, after_id)
+            result['deleted'] += len(ids)
+            if progress:
+                progress(dict(result))
+            db.session.commit()
+            if len(ids) < DELETE_BATCH_SIZE:
+                break
+            after_id = max(ids)
+    return result
+
+def clear_all_tasks():
+    """Delete every task and archived task at once, doesn't commit"""
+    if db.engine.dialect.name == 'postgresql':
+        # Queued behind a long read, TRUNCATE's lock would hold up every
+        # other request, better to fail
+        db.session.execute(text("SET LOCAL lock_timeout = '5s'"))
+        tables = [model.__tablename__ for model in (Task, TaskArchive, TaskSignature, TaskBucket)]
+        # TRUNCATE fires no delete triggers
+        if tasks_partitioned():
+            tables.append('task_fingerprints')
+        db.session.execute(text(f"TRUNCATE {', '.join(tables)}"))
+        bump_tasks_version(db.session)
+    else:
+        Task.query.delete()
+        TaskArchive.query.delete()
+        unindex_tasks(None)
+    db.session.add(TaskTombstone(task_id=None))
+
+@job_handler('delete')
+def delete_job(payload):
+    return delete_tasks(payload['filters'], progress=report_job_progress)
+
+# Delete task (or archived task)
 @app.route('/api/tasks/<int:task_id>', methods=['DELETE'])
 def delete_task(task_id):
     try:
-        task = Task.query.get_or_404(task_id)
-        db.session.delete(task)
+        # DELETE ... RETURNING, no SELECT first
+        deleted = db.session.execute(
+            delete(Task).where(Task.id == task_id).returning(Task.id),
+            execution_options={'synchronize_session': False}
+        ).scalar()
+        if deleted is not None:
+            db.session.add(TaskTombstone(task_id=task_id))
+            unindex_tasks([task_id])
+        else:
+            deleted = db.session.execute(
+                delete(TaskArchive).where(TaskArchive.id == task_id).returning(TaskArchive.id),
+                execution_options={'synchronize_session': False}
+            ).scalar()
+            if deleted is None:
+                return jsonify({'error': 'Task not found'}), 404
         db.session.commit()
         return jsonify({'success': True})
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
-# Clear all tasks (admin)
+# Clear tasks (admin)
+# Without filters everything goes at once (TRUNCATE on PostgreSQL). With
+# ?status=, ?source= and/or ?olderThanDays= (by created_at) the matching
+# tasks are deleted by a background job, poll /api/delete-jobs/<id>
 @app.route('/api/tasks', methods=['DELETE'])
 def clear_tasks():
     try:
-        Task.query.delete()
+        try:
+            filters = delete_filters(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        if filters:
+            job = enqueue_job('delete', {'filters': filters})
+            return jsonify({'jobId': job.id, 'status': job.status}), 202
+        
+        clear_all_tasks()
         db.session.commit()
         return jsonify({'success': True})
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
-# Initialize database
-@app.before_request
-def create_tables():
-    if not hasattr(app, 'tables_created'):
-        db.create_all()
-        app.tables_created = True
+@app.route('/api/delete-jobs/<job_id>', methods=['GET'])
+def get_delete_job(job_id):
+    try:
+        job = db.session.get(Job, job_id)
+        if not job or job.kind != 'delete':
+            return jsonify({'error': 'Job not found'}), 404
+        
+        data = job.to_dict()
+        result = data.pop('result') or {}
+        data['filters'] = job.payload['filters']
+        data['matched'] = result.get('matched')
+        data['deleted'] = result.get('deleted', 0)
+        return jsonify(data)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.cli.command('migrate')
+def migrate_command():
+    """Apply pending database migrations"""
+    applied = run_migrations(db)
+    print(f"Applied {len(applied)} migration(s): {', '.join(applied) or 'none'}")
+
+@app.cli.command('compact-tasks')
+def compact_tasks_command():
+    """Fingerprint old detected tasks and delete their duplicates"""
+    fingerprinted, deleted = compact_detected_tasks()
+    print(f"Fingerprinted {fingerprinted} task(s), deleted {deleted} duplicate(s)")
+
+@app.cli.command('index-similar')
+def index_similar_command():
+    """Build the near-duplicate index for existing tasks"""
+    indexed, dropped = index_all_tasks()
+    print(f"Indexed {indexed} task(s), dropped {dropped} deleted task(s)")
+
+@app.cli.command('archive-tasks')
+def archive_tasks_command():
+    """Move sent/declined tasks older than their RETENTION_*_DAYS to tasks_archive"""
+    moved = archive_tasks()
+    print(f"Archived {sum(moved.values())} task(s): "
+          f"{', '.join(f'{status} {count}' for status, count in moved.items()) or 'retention off'}")
+
+@app.cli.command('prune-tombstones')
+def prune_tombstones_command():
+    """Delete tombstones older than TOMBSTONE_RETENTION_DAYS"""
+    print(f"Pruned {prune_tombstones()} tombstone(s)")
+
+@app.cli.command('partition-tasks')
+def partition_tasks_command():
+    """Convert the tasks table to monthly partitions (PostgreSQL)"""
+    if db.engine.dialect.name != 'postgresql':
+        print("Partitioning needs PostgreSQL")
+        return
+    if tasks_partitioned():
+        print("Tasks are partitioned already")
+        return
+    # Nothing open while prepare_conversion builds its index concurrently
+    db.session.commit()
+    now = datetime.utcnow()
+    # Rows created until then stay in tasks_legacy, leaving time to swap
+    boundary = partitions.month_start(now, 2)
+    partitions.prepare_conversion(db.engine, boundary)
+    created = partitions.convert_tasks_table(
+        db.session, boundary, partitions.month_start(now, TASK_PARTITION_MONTHS_AHEAD)
+    )
+    db.session.commit()
+    print(f"Partitioned tasks: {partitions.LEGACY_PARTITION} before {boundary:%Y-%m-%d}, "
+          f"{len(created)} monthly partition(s) after")
+
+@app.cli.command('maintain-partitions')
+def maintain_partitions_command():
+    """Create upcoming task partitions and drop the expired ones"""
+    result = maintain_task_partitions()
+    if result is None:
+        print("Tasks aren't partitioned")
+        return
+    created, dropped = result
+    print(f"Created {len(created)} partition(s), dropped {len(dropped)}: {', '.join(dropped) or 'none'}")
+
+@app.cli.command('expire-jobs')
+def expire_jobs_command():
+    """Fail stuck jobs and delete finished jobs older than JOB_RETENTION_DAYS"""
+    purged = expire_jobs()
+    print(f"Purged {purged} finished job(s)")
 
 if __name__ == '__main__':
+    # Local development; deployments run `flask --app app migrate` before starting
+    with app.app_context():
+        run_migrations(db)
     port = int(os.getenv('PORT', 5000))
     app.run(host='0.0.0.0', port=port, debug=os.getenv('FLASK_ENV') == 'development')
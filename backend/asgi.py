@@ -0,0 +1,369 @@
+"""
+ASGI entry point for the DoNotMiss backend
+
+The hot endpoints (task lists, count long-polls, the task event stream and
+synchronous task analysis) are async Starlette handlers on an async
+SQLAlchemy engine (asyncpg, or aiosqlite for a local SQLite file) and an
+AsyncGroq client, so one worker keeps hundreds of slow analyze calls and open
+streams in flight. Every other route is the Flask app from app.py, mounted
+as WSGI and run on a thread pool, so it behaves exactly as under gunicorn.
+
+Run with:
+  uvicorn asgi:app --host 0.0.0.0 --port $PORT
+(gunicorn app:app is still the sync mode)
+"""
+
+from contextlib import asynccontextmanager
+from functools import wraps
+import os
+import time
+
+import anyio
+from a2wsgi import WSGIMiddleware
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Mount, Route
+
+import llm
+from app import (
+    app as flask_app, Counter, DATABASE_URL, LLM_CHUNK_CONCURRENCY, LLM_MAX_CHUNKS,
+    RESPONSE_CACHE_MAX_ENTRIES, TASKS_VERSION, response_cache, response_cache_key,
+    task_list_validator, detected_tasks_validator,
+    COUNTS_POLL_INTERVAL_SECONDS, task_counts_query, counts_payload, counts_wait,
+    EVENTS_HEARTBEAT_SECONDS, EVENTS_RETRY_MS, task_notifier, events_since, pending_events,
+    listen_for_task_writes,
+    task_list_params, task_list_query, page_size, encode_cursor,
+    task_records, tasks_json, detected_tasks_query, encoded_variant,
+    cached_analysis, store_analysis, save_detected_tasks, detect_tasks_simple, enqueue_job
+)
+
+# Waiting requests cost no thread here, clients may long-poll and stream
+flask_app.config['STREAMING_SERVER'] = True
+
+# Connections of the async engine per worker process (PostgreSQL)
+ASYNC_DB_POOL_SIZE = int(os.getenv('ASYNC_DB_POOL_SIZE', 10))
+ASYNC_DB_MAX_OVERFLOW = int(os.getenv('ASYNC_DB_MAX_OVERFLOW', 20))
+
+# Threads serving the mounted Flask routes
+WSGI_THREADS = int(os.getenv('WSGI_THREADS', 20))
+
+# Open event streams cost no thread here, they are only ended now and then so
+# clients reconnect and spread over the workers
+ASYNC_EVENTS_MAX_STREAM_SECONDS = float(os.getenv('ASYNC_EVENTS_MAX_STREAM_SECONDS', 3600))
+
+def async_database_url(url):
+    """DATABASE_URL with the asyncpg or aiosqlite driver"""
+    url = make_url(url)
+    if url.get_backend_name() == 'postgresql':
+        query = dict(url.query)
+        # asyncpg takes ssl=... instead of libpq's sslmode=...
+        if 'sslmode' in query:
+            query['ssl'] = query.pop('sslmode')
+        return url.set(drivername='postgresql+asyncpg', query=query)
+    if url.get_backend_name() == 'sqlite':
+        return url.set(drivername='sqlite+aiosqlite')
+    return url
+
+def engine_options(url):
+    if url.get_backend_name() != 'postgresql':
+        return {}
+    return {
+        'pool_pre_ping': True,
+        'pool_recycle': 300,
+        'pool_size': ASYNC_DB_POOL_SIZE,
+        'max_overflow': ASYNC_DB_MAX_OVERFLOW,
+    }
+
+ASYNC_DATABASE_URL = async_database_url(DATABASE_URL)
+engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL))
+Session = async_sessionmaker(engine, expire_on_commit=False)
+
+def json_response(data, status=200, headers=None):
+    """Same body as Flask's jsonify()"""
+    body = flask_app.json.dumps(data, separators=(',', ':')) + '\n'
+    return Response(body, status_code=status, headers=headers, media_type='application/json')
+
+def tasks_response(rows, fields, headers=None):
+    """json_response() of the to_dict()s of raw task rows, see tasks_json in app.py"""
+    body = tasks_json(task_records(rows, fields)) + b'\n'
+    return Response(body, headers=headers, media_type='application/json')
+
+async def in_flask(fn, *args):
+    """Run a sync app.py helper on a worker thread inside a Flask app context"""
+    def call():
+        with flask_app.app_context():
+            return fn(*args)
+    return await anyio.to_thread.run_sync(call)
+
+async def tasks_version():
+    async with Session() as session:
+        return await session.scalar(select(Counter.value).where(Counter.name == TASKS_VERSION)) or 0
+
+async def extract_tasks(text):
+    """app.extract_tasks() on the AsyncGroq client"""
+    groq_api_key = os.getenv('GROQ_API_KEY')
+    if not groq_api_key:
+        return detect_tasks_simple(text)
+
+    try:
+        tasks, _ = await llm.extract_tasks_chunked_async(
+            llm.shared_async_client(groq_api_key), text,
+            concurrency=LLM_CHUNK_CONCURRENCY,
+            max_chunks=LLM_MAX_CHUNKS,
+            fallback=detect_tasks_simple
+        )
+        return tasks
+    except Exception as e:
+        print(f"Groq API error: {e}")
+        return detect_tasks_simple(text)
+
+def cached_response(handler):
+    """app.cached_response() for async handlers, sharing the same cache"""
+    @wraps(handler)
+    async def wrapper(request):
+        if RESPONSE_CACHE_MAX_ENTRIES <= 0:
+            return await handler(request)
+
+        version = await tasks_version()
+        key = response_cache_key(handler.__name__, request.query_params.multi_items(), {})
+        request.state.response_cache_entry = (key, version)
+        cached = response_cache.get(key, version)
+        if cached:
+            body, headers = cached
+            return Response(body, status_code=200, headers={**dict(headers), 'X-Cache': 'HIT'})
+
+        response = await handler(request)
+        if response.status_code == 200:
+            headers = [(k.title(), v) for k, v in response.headers.items() if k != 'content-length']
+            response_cache.put(key, version, (response.body, headers))
+        response.headers['X-Cache'] = 'MISS'
+        return response
+    return wrapper
+
+def conditional_get(validator):
+    """app.conditional_get() for async handlers"""
+    def decorator(handler):
+        @wraps(handler)
+        async def wrapper(request):
+            try:
+                query, make_etag = validator(request.query_params)
+                async with Session() as session:
+                    row = (await session.execute(query)).first()
+                etag = f'"{make_etag(row)}"' if row else None
+            except ValueError:
+                etag = None
+
+            if etag and etag_matches(request.headers.get('if-none-match'), etag):
+                return Response(status_code=304, headers={'ETag': etag})
+
+            response = await handler(request)
+            if etag and response.status_code == 200:
+                response.headers['ETag'] = etag
+            return response
+        return wrapper
+    return decorator
+
+def negotiated(handler):
+    """app.encode_task_response() for async handlers"""
+    @wraps(handler)
+    async def wrapper(request):
+        response = await handler(request)
+        if response.status_code not in (200, 304):
+            return response
+        response.headers['Vary'] = 'Accept, Accept-Encoding'
+        if response.status_code != 200 or not response.headers.get('content-type', '').startswith('application/json'):
+            return response
+
+        body, mimetype, coding = encoded_variant(
+            response.body, request.headers.get('accept'), request.headers.get('accept-encoding'),
+            getattr(request.state, 'response_cache_entry', None)
+        )
+        if body is response.body:
+            return response
+        headers = {k: v for k, v in response.headers.items() if k not in ('content-length', 'content-type')}
+        if coding:
+            headers['Content-Encoding'] = coding
+        if 'etag' in headers and not headers['etag'].startswith('W/'):
+            headers['etag'] = 'W/' + headers['etag']
+        return Response(body, headers=headers, media_type=mimetype)
+    return wrapper
+
+def etag_matches(if_none_match, etag):
+    """Weak comparison against an If-None-Match header"""
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+    return '*' in tags or etag in tags
+
+# ============================================================
+# Async routes, same behaviour as their Flask versions in app.py
+# ============================================================
+
+@negotiated
+@conditional_get(task_list_validator)
+@cached_response
+async def get_tasks(request):
+    try:
+        try:
+            status, fields, position, limit = task_list_params(request.query_params)
+        except ValueError as e:
+            return json_response({'error': str(e)}, 400)
+
+        query = task_list_query(status, fields, position)
+
+        async with Session() as session:
+            # Without limit or cursor keep returning the full list for old clients
+            if limit is None and position is None:
+                return tasks_response((await session.execute(query)).all(), fields)
+
+            limit = page_size(limit)
+            rows = (await session.execute(query.limit(limit + 1))).all()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        headers = {'X-Next-Cursor': encode_cursor(rows[-1])} if has_more else None
+        return tasks_response(rows, fields, headers=headers)
+    except Exception as e:
+        return json_response({'error': str(e)}, 500)
+
+@negotiated
+@conditional_get(detected_tasks_validator)
+@cached_response
+async def get_detected_tasks(request):
+    try:
+        async with Session() as session:
+            rows = (await session.execute(detected_tasks_query())).all()
+        return tasks_response(rows, None)
+    except Exception as e:
+        return json_response({'error': str(e)}, 500)
+
+@negotiated
+async def get_task_counts(request):
+    try:
+        since = request.query_params.get('since')
+        deadline = time.monotonic() + counts_wait(request.query_params)
+        checked_version = None
+        await in_flask(listen_for_task_writes)
+        generation = task_notifier.generation
+
+        while True:
+            version = await tasks_version()
+            if version != checked_version:
+                checked_version = version
+                async with Session() as session:
+                    payload = counts_payload(await session.execute(task_counts_query()))
+                if payload['version'] != since:
+                    break
+            if time.monotonic() >= deadline:
+                break
+            generation = await task_notifier.wait_async(generation, COUNTS_POLL_INTERVAL_SECONDS)
+
+        return json_response(payload)
+    except Exception as e:
+        return json_response({'error': str(e)}, 500)
+
+async def task_events(request):
+    try:
+        since = await in_flask(events_since, request.query_params, request.headers)
+    except ValueError as e:
+        return json_response({'error': str(e)}, 400)
+    except Exception as e:
+        return json_response({'error': str(e)}, 500)
+
+    status = request.query_params.get('status')
+    await in_flask(listen_for_task_writes)
+
+    async def stream():
+        nonlocal since
+        deadline = time.monotonic() + ASYNC_EVENTS_MAX_STREAM_SECONDS
+        yield f'retry: {EVENTS_RETRY_MS}\n\n'
+
+        checked_version = None
+        sent = {}
+        generation = task_notifier.generation
+        while True:
+            version = await tasks_version()
+            if version != checked_version:
+                checked_version = version
+                # Reading the changes is rare, reuse the sync query on a thread
+                events, since = await in_flask(pending_events, since, status, sent)
+                yield ''.join(events)
+            else:
+                yield ': keep-alive\n\n'
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            generation = await task_notifier.wait_async(generation, min(EVENTS_HEARTBEAT_SECONDS, remaining))
+
+    return StreamingResponse(stream(), media_type='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+async def analyze_tasks(request):
+    try:
+        data = await request.json()
+        text = data.get('text', '')
+        source = data.get('source', 'web')
+        url = data.get('url', '')
+        metadata = data.get('metadata', {})
+
+        if not text or len(text) < 50:
+            return json_response({'tasks': []})
+
+        if data.get('async'):
+            def enqueue():
+                job = enqueue_job('analyze', {
+                    'text': text,
+                    'source': source,
+                    'url': url,
+                    'metadata': metadata
+                })
+                return {'jobId': job.id, 'status': job.status}
+            return json_response(await in_flask(enqueue), 202)
+
+        # Cache lookups are short DB calls, the LLM call is the long wait
+        tasks = await in_flask(cached_analysis, text, source)
+        if tasks is None:
+            tasks = await extract_tasks(text)
+            await in_flask(store_analysis, text, source, tasks)
+
+        # Near-duplicate lookups and the insert are a few short queries
+        def save():
+            return [task.to_dict() for task in save_detected_tasks(tasks, source, url, metadata)]
+        created_tasks = await in_flask(save)
+
+        return json_response({
+            'tasks': created_tasks,
+            'count': len(created_tasks)
+        })
+    except Exception as e:
+        print(f"Error analyzing tasks: {e}")
+        return json_response({'error': str(e), 'tasks': []}, 500)
+
+@asynccontextmanager
+async def lifespan(app):
+    # Migrations run before the server starts (`flask --app app migrate`)
+    yield
+    await engine.dispose()
+
+# Flask-CORS only covers the mounted routes
+cors = [Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])]
+
+app = Starlette(
+    routes=[
+        Route('/api/tasks', get_tasks, methods=['GET', 'OPTIONS'], middleware=cors),
+        Route('/api/tasks/detected', get_detected_tasks, methods=['GET', 'OPTIONS'], middleware=cors),
+        Route('/api/tasks/counts', get_task_counts, methods=['GET', 'OPTIONS'], middleware=cors),
+        Route('/api/tasks/events', task_events, methods=['GET', 'OPTIONS'], middleware=cors),
+        Route('/api/analyze-tasks', analyze_tasks, methods=['POST', 'OPTIONS'], middleware=cors),
+        Mount('/', WSGIMiddleware(flask_app, workers=WSGI_THREADS)),
+    ],
+    lifespan=lifespan
+)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Load test for POST /api/analyze-tasks, sync vs async job mode
+The LLM call is replaced by a sleep of 2-10s. The server only has a few
+request slots (like gunicorn sync workers), so in sync mode requests queue
+up behind slow LLM calls while in async mode they only wait for an INSERT.
+
+Usage:
+  python benchmarks/bench_analyze_jobs.py --requests 40 --concurrency 20 --workers 4
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.serving import make_server
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if 'DATABASE_URL' not in os.environ:
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+os.environ.setdefault('JOB_WORKERS', '32')
+# Every request sends the same text, don't let the analysis cache answer it
+os.environ['ANALYSIS_CACHE_TTL_SECONDS'] = '0'
+sys.path.insert(0, BACKEND_DIR)
+
+import app as backend
+
+TEXT = "Hi team, please review the quarterly budget report before Friday's board meeting. Thanks!"
+
+def slow_extract(min_latency, max_latency):
+    def extract(text):
+        time.sleep(random.uniform(min_latency, max_latency))
+        return [{'title': 'Review the quarterly budget report', 'priority': 'high'}]
+    return extract
+
+def limit_concurrency(wsgi_app, workers):
+    """Only `workers` requests run at once, like gunicorn sync workers"""
+    slots = threading.Semaphore(workers)
+    def limited(environ, start_response):
+        with slots:
+            return list(wsgi_app(environ, start_response))
+    return limited
+
+def post(url, body):
+    start = time.perf_counter()
+    request = urllib.request.Request(url, json.dumps(body).encode(), {'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request, timeout=600) as response:
+        payload = json.loads(response.read())
+    return (time.perf_counter() - start) * 1000, payload
+
+def wait_for_jobs(base_url, job_ids):
+    start = time.perf_counter()
+    pending = set(job_ids)
+    while pending:
+        for job_id in list(pending):
+            with urllib.request.urlopen(f'{base_url}/api/analyze-jobs/{job_id}') as response:
+                if json.loads(response.read())['status'] in ('done', 'failed'):
+                    pending.discard(job_id)
+        time.sleep(0.2)
+    return time.perf_counter() - start
+
+def run(base_url, mode, args):
+    body = {'text': TEXT, 'source': 'email', 'url': 'https://mail.example.com'}
+    if mode == 'async':
+        body['async'] = True
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(lambda _: post(f'{base_url}/api/analyze-tasks', body), range(args.requests)))
+    elapsed = time.perf_counter() - start
+    latencies = sorted(latency for latency, _ in results)
+    if mode == 'async':
+        elapsed += wait_for_jobs(base_url, [payload['jobId'] for _, payload in results])
+    return {
+        'p50': statistics.median(latencies),
+        'p99': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+        'max': latencies[-1],
+        'total': elapsed,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=40)
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--workers', type=int, default=4, help='simulated sync worker slots')
+    parser.add_argument('--min-latency', type=float, default=2.0)
+    parser.add_argument('--max-latency', type=float, default=10.0)
+    args = parser.parse_args()
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    backend.extract_tasks = slow_extract(args.min_latency, args.max_latency)
+    with backend.app.app_context():
+        backend.run_migrations(backend.db)
+    server = make_server('127.0.0.1', 0, limit_concurrency(backend.app, args.workers), threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_port}'
+
+    print("=" * 72)
+    print(f"🚀 analyze-tasks load test: {args.requests} requests, {args.concurrency} concurrent, "
+          f"{args.workers} worker slots, LLM {args.min_latency:g}-{args.max_latency:g}s")
+    print("=" * 72)
+    print(f"{'mode':<8} {'p50 ms':>10} {'p99 ms':>10} {'max ms':>10} {'all tasks done s':>18}")
+    for mode in ('sync', 'async'):
+        result = run(base_url, mode, args)
+        print(f"{mode:<8} {result['p50']:>10.0f} {result['p99']:>10.0f} {result['max']:>10.0f} {result['total']:>18.1f}")
+    server.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark for POST /api/tasks/bulk
+Compares rows/second of looping POST /api/tasks against the bulk endpoint
+(JSON and NDJSON bodies). Runs in-process through the Flask test client, so
+it measures server cost without network round trips - real clients also save
+one HTTP round trip per task.
+
+Usage:
+  python benchmarks/bench_bulk_insert.py --rows 5000
+  DATABASE_URL=postgresql://localhost/donotmiss_bench python benchmarks/bench_bulk_insert.py
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if 'DATABASE_URL' not in os.environ:
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+sys.path.insert(0, BACKEND_DIR)
+
+from app import app, db, Task
+
+def make_tasks(rows):
+    return [{
+        'title': f'Imported task {i}',
+        'description': 'Imported from the mail archive. ' * 5,
+        'source': 'email',
+        'url': f'https://mail.example.com/{i}',
+        'priority': 'medium',
+        'deadline': '2026-12-31',
+        'metadata': {'capturedVia': 'import'},
+    } for i in range(rows)]
+
+def reset():
+    with app.app_context():
+        Task.query.delete()
+        db.session.commit()
+
+def bench_loop(client, tasks):
+    start = time.perf_counter()
+    for task in tasks:
+        assert client.post('/api/tasks', json=task).status_code == 201
+    return time.perf_counter() - start
+
+def bench_bulk_json(client, tasks, batch):
+    start = time.perf_counter()
+    for i in range(0, len(tasks), batch):
+        assert client.post('/api/tasks/bulk', json=tasks[i:i + batch]).status_code == 201
+    return time.perf_counter() - start
+
+def bench_bulk_ndjson(client, tasks, batch):
+    start = time.perf_counter()
+    for i in range(0, len(tasks), batch):
+        body = '\n'.join(json.dumps(t) for t in tasks[i:i + batch])
+        response = client.post('/api/tasks/bulk', data=body, content_type='application/x-ndjson')
+        assert response.status_code == 201
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--batch', type=int, default=1000, help='tasks per bulk request')
+    args = parser.parse_args()
+
+    client = app.test_client()
+    client.get('/health')
+    tasks = make_tasks(args.rows)
+
+    with app.app_context():
+        dialect = db.engine.dialect.name
+    print("=" * 60)
+    print(f"🚀 Bulk insert benchmark ({args.rows:,} tasks, {dialect})")
+    print("=" * 60)
+    for name, run in [
+        ('loop POST /api/tasks', lambda: bench_loop(client, tasks)),
+        ('bulk JSON', lambda: bench_bulk_json(client, tasks, args.batch)),
+        ('bulk NDJSON', lambda: bench_bulk_ndjson(client, tasks, args.batch)),
+    ]:
+        reset()
+        elapsed = run()
+        print(f"{name:<24} {elapsed:>8.2f}s {args.rows / elapsed:>12,.0f} rows/s")
+    reset()
+
+if __name__ == '__main__':
+    main()
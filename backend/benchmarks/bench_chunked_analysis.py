@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark for chunked analysis of long messages (llm.extract_tasks_chunked)
+Builds email threads of ~50KB with action items planted at known offsets and
+runs them through the stub Groq server (benchmarks/stub_groq.py), comparing
+the old single call on the first 2,000 characters with overlapping chunks
+analyzed in parallel: recall of the planted action items, LLM calls and
+wall-clock time.
+
+Usage:
+  python benchmarks/bench_chunked_analysis.py --threads 5 --size 50000 --latency 0.5
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from groq import Groq
+import llm
+from stub_groq import StubGroq
+
+FILLER = [
+    "Thanks for the update on the quarterly numbers.",
+    "The vendor meeting went well overall and the team was happy with the demo.",
+    "I have attached the latest version of the slides for reference.",
+    "Let me know what you think about the new layout when you get a chance.",
+    "We discussed the roadmap for next quarter and agreed on the main themes.",
+    "The office will be closed on Monday for the public holiday.",
+]
+
+def make_thread(size, items, seed):
+    """Email thread text of about size characters and the planted item codes"""
+    rng = random.Random(seed)
+    planted = [f'item{seed}x{i}' for i in range(items)]
+    paragraphs_per_item = max(1, size // items // 250)
+    parts = []
+    for i, code in enumerate(planted):
+        parts.append(f"On Tue, Person {i} <person{i}@example.com> wrote:")
+        for p in range(paragraphs_per_item):
+            if p == paragraphs_per_item // 2:
+                parts.append(f"Please send the signed contract for {code} to the legal team.")
+            parts.append(' '.join(rng.choice(FILLER) for _ in range(3)))
+    return '\n\n'.join(parts)[:size], planted
+
+def recall(tasks, planted):
+    titles = ' '.join(task.get('title', '') for task in tasks).lower()
+    return sum(code in titles for code in planted) / len(planted)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=5)
+    parser.add_argument('--size', type=int, default=50000, help='characters per thread')
+    parser.add_argument('--items', type=int, default=20, help='action items per thread')
+    parser.add_argument('--latency', type=float, default=0.5, help='stub seconds per call')
+    parser.add_argument('--concurrency', type=int, default=4)
+    args = parser.parse_args()
+
+    stub = StubGroq(args.latency).start()
+    client = Groq(api_key='stub', base_url=stub.url)
+    threads = [make_thread(args.size, args.items, seed) for seed in range(args.threads)]
+
+    print("=" * 64)
+    print(f"🚀 Chunked analysis: {args.threads} threads of {args.size} chars, "
+          f"{args.items} action items each, stub latency {args.latency}s")
+    print("=" * 64)
+    print(f"{'mode':<22} {'recall':>8} {'LLM calls':>10} {'s/thread':>10}")
+
+    modes = [
+        ('truncate to 2,000', lambda text: (llm.extract_tasks(client, text), 1)),
+        (f'chunked (x{args.concurrency})',
+         lambda text: llm.extract_tasks_chunked(client, text, concurrency=args.concurrency)),
+    ]
+    for name, analyze in modes:
+        total_recall = 0
+        total_calls = 0
+        start = time.perf_counter()
+        for text, planted in threads:
+            tasks, calls = analyze(text)
+            total_recall += recall(tasks, planted)
+            total_calls += calls
+        elapsed = time.perf_counter() - start
+        print(f"{name:<22} {total_recall / len(threads):>8.0%} {total_calls:>10} {elapsed / len(threads):>10.2f}")
+
+    stub.stop()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark for conditional GETs (ETag / If-None-Match) on the task endpoints
+Simulates a day of polling against an in-process app: the extension badge
+polling /api/tasks/detected every 30s and the dashboard polling /api/tasks
+every 60s, with a task changing a few times a day. Compares clients that
+ignore validators with clients that send If-None-Match, reporting response
+bytes and server CPU time (measured with the test client, so both modes
+include the same client overhead).
+
+Usage:
+  python benchmarks/bench_conditional_get.py --tasks 500 --changes 24
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+DAY_SECONDS = 24 * 60 * 60
+
+# (url, seconds between polls)
+POLLERS = [
+    ('/api/tasks/detected', 30),
+    ('/api/tasks', 60),
+]
+
+def seed(app, db, Task, rows, detected):
+    from migrations import run_migrations
+    now = datetime.utcnow()
+    with app.app_context():
+        run_migrations(db)
+        db.session.execute(db.insert(Task), [{
+            'title': f'Review report number {i}',
+            'description': 'Lorem ipsum dolor sit amet. ' * 10,
+            'status': 'detected' if i < detected else 'pending',
+            'created_at': now - timedelta(minutes=i),
+            'updated_at': now - timedelta(minutes=i),
+        } for i in range(rows)])
+        db.session.commit()
+
+def response_bytes(response):
+    headers = sum(len(k) + len(v) + 4 for k, v in response.headers.items())
+    return len(response.data) + headers
+
+def simulate_day(client, conditional, changes):
+    """Returns (requests, 304s, bytes, cpu seconds)"""
+    etags = {}
+    requests = not_modified = total_bytes = 0
+    change_every = DAY_SECONDS // changes if changes else None
+    cpu_start = time.process_time()
+    
+    for second in range(0, DAY_SECONDS, 30):
+        if change_every and second % change_every < 30:
+            client.put('/api/tasks/1', json={'title': f'Changed at {second}'})
+        for url, interval in POLLERS:
+            if second % interval:
+                continue
+            headers = {'If-None-Match': etags[url]} if conditional and url in etags else {}
+            response = client.get(url, headers=headers)
+            requests += 1
+            total_bytes += response_bytes(response)
+            if response.status_code == 304:
+                not_modified += 1
+            else:
+                etags[url] = response.headers['ETag']
+    
+    return requests, not_modified, total_bytes, time.process_time() - cpu_start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, default=500)
+    parser.add_argument('--detected', type=int, default=20)
+    parser.add_argument('--changes', type=int, default=24, help='task writes per day')
+    args = parser.parse_args()
+
+    os.environ.setdefault('DATABASE_URL', f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'etag.db')}")
+    from app import app, db, Task
+    seed(app, db, Task, args.tasks, args.detected)
+    client = app.test_client()
+
+    print("=" * 72)
+    print(f"🚀 One day of polling: {args.tasks} tasks ({args.detected} detected), "
+          f"{args.changes} changes/day")
+    print("=" * 72)
+    print(f"{'mode':<18} {'requests':>9} {'304s':>7} {'MB sent':>9} {'CPU s':>8}")
+
+    for name, conditional in [('no validators', False), ('If-None-Match', True)]:
+        requests, not_modified, total_bytes, cpu = simulate_day(client, conditional, args.changes)
+        print(f"{name:<18} {requests:>9} {not_modified:>7} {total_bytes / 1e6:>9.2f} {cpu:>8.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for keyword task detection
+Compares the original ten-pass re.finditer detection with detection.py over
+1KB-1MB inputs: sparse prose (few triggers) and a dense thread (many).
+
+Usage:
+  python benchmarks/bench_detection.py
+"""
+
+import os
+import random
+import sys
+import timeit
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from detection import load_detector
+from test_detection import detect_tasks_reference
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+FILLER = ("the quarterly numbers were discussed at length and everyone agreed "
+          "the results look fine for this period overall").split()
+
+def make_text(size, trigger_every, rng):
+    """Prose with a sentence containing a trigger every `trigger_every` sentences"""
+    sentences = []
+    length = 0
+    while length < size:
+        words = rng.choices(FILLER, k=12)
+        if trigger_every and len(sentences) % trigger_every == 0:
+            words.insert(3, rng.choice(['please', 'need to', 'reminder:', 'must']))
+        sentence = ' '.join(words).capitalize() + '. '
+        sentences.append(sentence)
+        length += len(sentence)
+    return ''.join(sentences)[:size]
+
+def main():
+    rng = random.Random(1)
+    detector = load_detector()
+
+    print("=" * 64)
+    print("🚀 detect_tasks_simple microbenchmark")
+    print("=" * 64)
+    print(f"{'input':<18} {'original ms':>14} {'detector ms':>14} {'speedup':>10}")
+    for label, trigger_every in [('sparse', 0), ('dense', 3)]:
+        for size in SIZES:
+            text = make_text(size, trigger_every, rng)
+            assert detector.detect(text) == detect_tasks_reference(text)
+            number = max(1, 200_000 // size)
+            old = timeit.timeit(lambda: detect_tasks_reference(text), number=number) / number * 1000
+            new = timeit.timeit(lambda: detector.detect(text), number=number) / number * 1000
+            print(f"{label + ' ' + format(size // 1000, ',') + 'KB':<18} {old:>14.3f} {new:>14.3f} {old / new:>9.1f}x")
+
+if __name__ == '__main__':
+    main()
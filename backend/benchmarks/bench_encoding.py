@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark for task list response encodings (response_encoding.py)
+Encodes the GET /api/tasks body of N tasks in every representation a client
+can negotiate and reports the bytes on the wire and the CPU time to encode
+it, with the client-side decode time for reference:
+
+  json, json + gzip (levels), json + brotli (qualities),
+  msgpack, msgpack + gzip, msgpack + brotli
+
+Each encoding is timed with time.process_time() over several runs, the best
+run counts. Every variant is decoded and checked against the JSON document.
+
+Usage:
+  python benchmarks/bench_encoding.py --rows 10000
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+import brotli
+import msgpack
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from bench_serialization import best
+
+WORDS = (
+    'review report invoice client meeting deadline budget draft contract send update team '
+    'schedule call approve design release notes feedback Friday Monday quarterly numbers '
+    'follow up slides customer ticket bug fix deploy staging sign off agenda'
+).split()
+
+def seed(db, Task, rows):
+    """Tasks with varied text, so compression ratios aren't those of one repeated row"""
+    rng = random.Random(0)
+    now = datetime.utcnow()
+    db.session.execute(db.insert(Task), [{
+        'title': ' '.join(rng.choices(WORDS, k=rng.randint(4, 9))).capitalize(),
+        'description': ' '.join(rng.choices(WORDS, k=rng.randint(10, 60))),
+        'source': rng.choice(('email', 'slack', 'manual')),
+        'url': f'https://mail.example.com/#inbox/{rng.getrandbits(64):016x}',
+        'priority': rng.choice(('low', 'medium', 'high')),
+        'deadline': (now + timedelta(days=rng.randint(0, 30))).date() if rng.random() < 0.3 else None,
+        'status': 'pending',
+        'created_at': now - timedelta(seconds=rng.randint(0, 10 ** 7)),
+        'updated_at': now,
+        'task_metadata': {'aiDetected': True, 'confidence': round(rng.random(), 2), 'messageId': rng.getrandbits(48)},
+    } for _ in range(rows)])
+    db.session.commit()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'encoding.db')}"
+    from app import app, db, Task
+    from migrations import run_migrations
+    from response_encoding import MSGPACK_MIMETYPE, ResponseEncoder
+
+    with app.app_context():
+        run_migrations(db)
+        seed(db, Task, args.rows)
+    body = app.test_client().get('/api/tasks').get_data()
+    document = json.loads(body)
+
+    print("=" * 72)
+    print(f"📦 Task list encodings: {args.rows:,} tasks (best of {args.runs})")
+    print("=" * 72)
+
+    variants = [('json', 'application/json', None, {})]
+    variants += [(f'json + gzip {level}', 'application/json', 'gzip', {'gzip_level': level}) for level in (1, 6, 9)]
+    variants += [(f'json + br {quality}', 'application/json', 'br', {'brotli_quality': quality}) for quality in (1, 4, 6, 11)]
+    variants += [
+        ('msgpack', MSGPACK_MIMETYPE, None, {}),
+        ('msgpack + gzip 6', MSGPACK_MIMETYPE, 'gzip', {'gzip_level': 6}),
+        ('msgpack + br 4', MSGPACK_MIMETYPE, 'br', {'brotli_quality': 4}),
+    ]
+
+    print(f"\n{'encoding':<20} {'KB':>8} {'ratio':>7} {'encode ms':>11} {'decode ms':>11}")
+    for label, mimetype, coding, options in variants:
+        encoder = ResponseEncoder(0, options.get('gzip_level', 6), options.get('brotli_quality', 4))
+        runs = 1 if options.get('brotli_quality') == 11 else args.runs
+        encode_time, (encoded, _, _) = best(lambda: encoder.encode(body, mimetype, coding), runs)
+
+        def decode():
+            data = encoded
+            if coding == 'br':
+                data = brotli.decompress(data)
+            elif coding == 'gzip':
+                data = gzip.decompress(data)
+            return msgpack.unpackb(data) if mimetype == MSGPACK_MIMETYPE else json.loads(data)
+        decode_time, decoded = best(decode, runs)
+        assert decoded == document, f"{label} decodes to another document"
+
+        print(f"{label:<20} {len(encoded) / 1024:>8.0f} {len(body) / len(encoded):>6.1f}x "
+              f"{encode_time * 1000:>11.1f} {decode_time * 1000:>11.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the shared Groq client (llm.shared_client)
+Compares building a new Groq client for every request (the old
+analyze_tasks behaviour) with the process-wide pooled client, against the
+local stub server (benchmarks/stub_groq.py): per-request latency and number
+of TCP connections opened. The stub speaks plain HTTP, so the real API's TLS
+handshake per new connection comes on top of the difference shown here.
+
+Usage:
+  python benchmarks/bench_groq_client.py --requests 200 --latency 0.01
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import llm
+from stub_groq import StubGroq
+
+TEXT = "Hi team, please review the quarterly budget report before the board meeting on Friday."
+
+def new_client():
+    from groq import Groq
+    return Groq(api_key='stub')
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.01, help='stub seconds per call')
+    args = parser.parse_args()
+
+    stub = StubGroq(args.latency).start()
+    os.environ['GROQ_BASE_URL'] = stub.url
+
+    print("=" * 64)
+    print(f"🚀 Groq client: {args.requests} requests, stub latency {args.latency * 1000:.0f}ms")
+    print("=" * 64)
+    print(f"{'mode':<22} {'p50 ms':>8} {'p95 ms':>8} {'mean ms':>8} {'connections':>12}")
+
+    modes = [
+        ('new client per call', new_client),
+        ('shared client', lambda: llm.shared_client('stub')),
+    ]
+    for name, get_client in modes:
+        stub.connections = 0
+        timings = []
+        for _ in range(args.requests):
+            start = time.perf_counter()
+            llm.extract_tasks(get_client(), TEXT)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        print(f"{name:<22} {statistics.median(timings):>8.2f} {p95:>8.2f} "
+              f"{statistics.mean(timings):>8.2f} {stub.connections:>12}")
+
+    stub.stop()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark for GET /api/tasks
+Compares the old full scan against keyset pagination with a field projection,
+and the streaming NDJSON export of the whole table.
+Each scenario runs in a fresh process so peak RSS is measured per scenario.
+
+Usage:
+  python benchmarks/bench_list_tasks.py                  # 10k, 100k, 1M rows
+  python benchmarks/bench_list_tasks.py --rows 10000     # custom sizes
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    'full scan': '/api/tasks',
+    'page (limit=100)': '/api/tasks?limit=100',
+    'page + fields': '/api/tasks?limit=100&fields=id,title,status,priority,createdAt',
+    'export ndjson': '/api/tasks/export?format=ndjson',
+}
+
+def seed(db_path, rows):
+    """Create a SQLite database with `rows` tasks"""
+    os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+    sys.path.insert(0, BACKEND_DIR)
+    from app import app, db, Task
+
+    statuses = ['pending', 'pending', 'sent', 'declined', 'detected']
+    now = datetime.utcnow()
+    with app.app_context():
+        db.create_all()
+        batch = []
+        for i in range(rows):
+            created = now - timedelta(seconds=i)
+            batch.append({
+                'title': f'Review report number {i}',
+                'description': 'Lorem ipsum dolor sit amet. ' * 20,
+                'source': 'email',
+                'url': f'https://mail.example.com/{i}',
+                'priority': 'medium',
+                'status': random.choice(statuses),
+                'created_at': created,
+                'updated_at': created,
+                'task_metadata': {'sender': 'someone@example.com', 'subject': f'Thread {i}'},
+            })
+            if len(batch) == 10000:
+                db.session.execute(db.insert(Task), batch)
+                batch = []
+        if batch:
+            db.session.execute(db.insert(Task), batch)
+        db.session.commit()
+
+def run_scenario(db_path, path, requests):
+    """Issue `requests` GETs in this process and report latency and peak RSS"""
+    os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+    sys.path.insert(0, BACKEND_DIR)
+    from app import app
+
+    client = app.test_client()
+    client.get('/health')
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        # Consume the body chunk by chunk so the client doesn't hold it all
+        response = client.get(path, buffered=False)
+        assert response.status_code == 200, response.get_data(as_text=True)
+        for _ in response.response:
+            pass
+        response.close()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+    print(json.dumps({
+        'p50': statistics.median(timings),
+        'p99': timings[min(len(timings) - 1, int(len(timings) * 0.99))],
+        'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--requests', type=int, default=20)
+    parser.add_argument('--seed', help=argparse.SUPPRESS)
+    parser.add_argument('--worker', nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.seed:
+        return seed(args.seed, args.rows[0])
+    if args.worker:
+        return run_scenario(args.worker[0], args.worker[1], args.requests)
+
+    print("=" * 72)
+    print("🚀 GET /api/tasks benchmark")
+    print("=" * 72)
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, 'bench.db')
+            print(f"\n📦 Seeding {rows:,} rows...")
+            subprocess.run([sys.executable, __file__, '--seed', db_path, '--rows', str(rows)], check=True)
+
+            print(f"{'scenario':<20} {'p50 ms':>10} {'p99 ms':>10} {'peak RSS MB':>12}")
+            for name, path in SCENARIOS.items():
+                # The full scan is slow at large sizes, a few samples are enough
+                requests = args.requests if 'page' in name else max(3, args.requests // 5)
+                out = subprocess.run(
+                    [sys.executable, __file__, '--worker', db_path, path, '--requests', str(requests)],
+                    check=True, capture_output=True, text=True
+                ).stdout
+                result = json.loads(out.strip().splitlines()[-1])
+                print(f"{name:<20} {result['p50']:>10.1f} {result['p99']:>10.1f} {result['rss_mb']:>12.1f}")
+
+if __name__ == '__main__':
+    main()
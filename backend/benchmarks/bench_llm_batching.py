@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark for batched LLM extraction (POST /api/analyze-tasks/bulk)
+Runs against the local stub Groq server (benchmarks/stub_groq.py) and
+compares one POST /api/analyze-tasks per message with the bulk endpoint:
+number of LLM calls and messages/second.
+
+Usage:
+  python benchmarks/bench_llm_batching.py --messages 50 --latency 0.4 --latency-per-message 0.1
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stub_groq import StubGroq
+
+def make_messages(count):
+    return [{
+        'id': f'm{i}',
+        'text': (f"Hi team, following up on thread {i}. Please review the vendor contract draft "
+                 f"before Thursday. We need to schedule the renewal call with procurement. "
+                 f"Don't forget to update the budget sheet for project {i}."),
+        'source': 'email',
+        'url': f'https://mail.example.com/{i}',
+    } for i in range(count)]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--messages', type=int, default=50)
+    parser.add_argument('--latency', type=float, default=0.4, help='stub seconds per call')
+    parser.add_argument('--latency-per-message', type=float, default=0.1, help='stub seconds per message in a call')
+    args = parser.parse_args()
+
+    stub = StubGroq(args.latency, latency_per_message=args.latency_per_message).start()
+    os.environ.update({
+        'GROQ_API_KEY': 'stub',
+        'GROQ_BASE_URL': stub.url,
+        'ANALYSIS_CACHE_TTL_SECONDS': '0',
+    })
+    os.environ.setdefault('DATABASE_URL', f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+
+    from app import app, LLM_BATCH_SIZE
+    client = app.test_client()
+    messages = make_messages(args.messages)
+
+    print("=" * 64)
+    print(f"🚀 LLM batching: {args.messages} messages, batch size {LLM_BATCH_SIZE}, "
+          f"stub latency {args.latency}s + {args.latency_per_message}s/message")
+    print("=" * 64)
+
+    stub.calls = 0
+    start = time.perf_counter()
+    for message in messages:
+        assert client.post('/api/analyze-tasks', json=message).status_code == 200
+    single_time, single_calls = time.perf_counter() - start, stub.calls
+
+    stub.calls = 0
+    start = time.perf_counter()
+    response = client.post('/api/analyze-tasks/bulk', json={'messages': messages})
+    assert response.status_code == 200, response.get_json()
+    bulk_time, bulk_calls = time.perf_counter() - start, stub.calls
+
+    print(f"{'mode':<22} {'LLM calls':>10} {'seconds':>10} {'messages/s':>12}")
+    print(f"{'one call per message':<22} {single_calls:>10} {single_time:>10.2f} {args.messages / single_time:>12.1f}")
+    print(f"{'bulk':<22} {bulk_calls:>10} {bulk_time:>10.2f} {args.messages / bulk_time:>12.1f}")
+    print(f"\n💰 Saved {single_calls - bulk_calls} of {single_calls} LLM calls")
+    stub.stop()
+
+if __name__ == '__main__':
+    main()
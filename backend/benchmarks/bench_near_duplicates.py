@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the near-duplicate task index (minhash.py, similar_tasks in app.py)
+Seeds a SQLite database with N tasks (titles drawn from a Zipf-like
+vocabulary, so common words are shared like in real task titles) and their
+MinHash signatures and LSH buckets, then times similar_tasks() for reworded
+copies of stored titles (one word dropped, one added) and for unrelated
+titles. Reports lookup latency, candidates compared per lookup and recall,
+next to a full scan over all signatures (timed on a sample, extrapolated).
+
+Usage:
+  python benchmarks/bench_near_duplicates.py --tasks 1000000
+"""
+
+import argparse
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+SEED_BATCH = 50000
+
+def make_vocabulary(size, rng):
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    words = set()
+    while len(words) < size:
+        words.add(''.join(rng.choice(letters) for _ in range(rng.randint(3, 9))))
+    return sorted(words)
+
+class TitleGenerator:
+    def __init__(self, vocabulary, rng):
+        self.vocabulary = vocabulary
+        self.cum_weights = list(itertools.accumulate(1 / (rank + 1) ** 0.8 for rank in range(len(vocabulary))))
+        self.rng = rng
+
+    def title(self):
+        return ' '.join(self.rng.choices(self.vocabulary, cum_weights=self.cum_weights, k=self.rng.randint(4, 8)))
+
+    def reword(self, title):
+        words = title.split()
+        words.pop(self.rng.randrange(len(words)))
+        words.insert(self.rng.randrange(len(words) + 1), self.rng.choice(self.vocabulary))
+        return 'the ' + ' '.join(words)
+
+def seed(db, minhash, generator, count):
+    """Insert tasks, signatures and buckets with raw executemany, returns the titles"""
+    titles = []
+    now = datetime.utcnow()
+    conn = db.session.connection()
+    for start in range(0, count, SEED_BATCH):
+        tasks, signatures, buckets = [], [], []
+        for task_id in range(start + 1, min(start + SEED_BATCH, count) + 1):
+            title = generator.title()
+            titles.append(title)
+            tasks.append((task_id, title, '', 'pending', now, now))
+            signature = minhash.signature(minhash.shingles(title))
+            signatures.append((task_id, minhash.pack(signature)))
+            buckets += [(key, task_id) for key in set(minhash.band_keys(signature))]
+        conn.exec_driver_sql(
+            'INSERT INTO tasks (id, title, description, status, created_at, updated_at) '
+            'VALUES (?, ?, ?, ?, ?, ?)', tasks)
+        conn.exec_driver_sql('INSERT INTO task_signatures (task_id, signature) VALUES (?, ?)', signatures)
+        conn.exec_driver_sql('INSERT OR IGNORE INTO task_buckets (bucket, task_id) VALUES (?, ?)', buckets)
+        db.session.commit()
+        conn = db.session.connection()
+        print(f"  seeded {min(start + SEED_BATCH, count):,} tasks", end='\r', flush=True)
+    print()
+    return titles
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, default=1000000)
+    parser.add_argument('--queries', type=int, default=1000)
+    parser.add_argument('--vocabulary', type=int, default=20000)
+    parser.add_argument('--scan-sample', type=int, default=20000, help='signatures timed for the full scan')
+    args = parser.parse_args()
+
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'near_duplicates.db')}"
+    import minhash
+    from app import app, db, similar_tasks, TaskBucket, TaskSignature, NEAR_DUPLICATE_THRESHOLD
+    from migrations import run_migrations
+
+    rng = random.Random(7)
+    generator = TitleGenerator(make_vocabulary(args.vocabulary, rng), rng)
+
+    print("=" * 72)
+    print(f"🔍 Near-duplicate lookup: {args.tasks:,} tasks, {args.queries} queries per kind")
+    print("=" * 72)
+
+    with app.app_context():
+        run_migrations(db)
+        start = time.perf_counter()
+        titles = seed(db, minhash, generator, args.tasks)
+        print(f"Seeded in {time.perf_counter() - start:.0f}s "
+              f"({(time.perf_counter() - start) / args.tasks * 1e6:.0f}µs per task incl. signature)")
+
+        # Candidates the bucket probes return, before the similarity check
+        def candidates(title):
+            keys = minhash.band_keys(minhash.signature(minhash.shingles(title)))
+            return db.session.execute(
+                db.select(db.func.count(db.distinct(TaskBucket.task_id))).where(TaskBucket.bucket.in_(keys))
+            ).scalar()
+
+        print(f"\n{'query':<12} {'p50 ms':>9} {'p99 ms':>9} {'candidates':>11} {'found':>8}")
+        for kind in ('reworded', 'unrelated'):
+            latencies, found, compared = [], 0, 0
+            for _ in range(args.queries):
+                task_id = rng.randrange(args.tasks)
+                title = generator.reword(titles[task_id]) if kind == 'reworded' else generator.title()
+                start = time.perf_counter()
+                matches = similar_tasks(title, '')
+                latencies.append(time.perf_counter() - start)
+                compared += candidates(title)
+                if kind == 'reworded':
+                    found += any(match_id == task_id + 1 for match_id, _ in matches)
+                else:
+                    found += bool(matches)
+            label = f"{found / args.queries:.0%}" + (' recall' if kind == 'reworded' else ' flagged')
+            print(f"{kind:<12} {percentile(latencies, 0.5):>9.2f} {percentile(latencies, 0.99):>9.2f} "
+                  f"{compared / args.queries:>11.1f} {label:>8}")
+
+        # Without the index: compare with every stored signature
+        probe = minhash.signature(minhash.shingles(generator.title()))
+        sample = db.session.execute(db.select(TaskSignature.signature).limit(args.scan_sample)).scalars().all()
+        start = time.perf_counter()
+        for stored in sample:
+            minhash.similarity(probe, minhash.unpack(stored)) >= NEAR_DUPLICATE_THRESHOLD
+        scan = (time.perf_counter() - start) / len(sample) * args.tasks
+        print(f"{'full scan':<12} {scan * 1000:>9.0f} {'':>9} {args.tasks:>11,} (extrapolated from {len(sample):,})")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the partitioned tasks table (partitions.py, PostgreSQL only)
+Seeds the same tasks, spread over the last 24 months, into a plain and a
+monthly partitioned tasks table and compares:
+
+  list:   GET /api/tasks first page, a page a year back (cursor), ?status=pending
+  delete: removing one old month, DELETE + VACUUM vs DETACH + DROP,
+          each with and without copying the rows to tasks_archive first
+
+Each mode runs in a fresh process on a freshly reset schema.
+WIPES THE DATABASE IT IS GIVEN, point it at a scratch one:
+
+Usage:
+  DATABASE_URL=postgresql://localhost/donotmiss_bench python benchmarks/bench_partitions.py --rows 1000000
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+MONTHS = 24
+SEED_BATCH = 100000
+
+def seed(db, rows, now):
+    from sqlalchemy import text
+    span = MONTHS * 30 * 86400
+    for start in range(0, rows, SEED_BATCH):
+        db.session.execute(text(
+            'INSERT INTO tasks (title, description, source, url, priority, status, created_at, updated_at, task_metadata) '
+            "SELECT 'Follow up on task ' || g, repeat('Lorem ipsum dolor sit amet. ', 8), 'email', "
+            "'https://mail.example.com/#inbox/' || g, 'medium', "
+            "(ARRAY['pending', 'sent', 'declined', 'detected'])[1 + g % 4], "
+            ':now - make_interval(secs => g::float / :rows * :span), :now - make_interval(secs => g::float / :rows * :span), '
+            "'{\"aiDetected\": true}' FROM generate_series(:start, :stop) g"
+        ), {'now': now, 'rows': rows, 'span': span, 'start': start, 'stop': min(start + SEED_BATCH, rows) - 1})
+        db.session.commit()
+    db.session.execute(text('ANALYZE'))
+    db.session.commit()
+
+def median_ms(fn, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+def run_mode(mode, rows, runs):
+    """Seed and measure one mode in this process, prints a JSON line"""
+    from sqlalchemy import delete, select, text
+    import partitions
+    from app import app, db, Task, TaskArchive, ARCHIVE_COLUMNS, drop_task_partitions, task_list_query
+    from migrations import run_migrations
+
+    now = datetime.utcnow()
+    oldest = partitions.month_start(now, -MONTHS)
+    result = {}
+    with app.app_context():
+        run_migrations(db)
+        if mode == 'partitioned':
+            partitions.prepare_conversion(db.engine, oldest)
+            partitions.convert_tasks_table(db.session, oldest, partitions.month_start(now, 3))
+            db.session.commit()
+        start = time.perf_counter()
+        seed(db, rows, now)
+        result['seed_s'] = time.perf_counter() - start
+
+        def page(status=None, position=None):
+            return lambda: db.session.execute(task_list_query(status, None, position).limit(101)).all()
+        year_ago = db.session.execute(
+            select(Task.created_at, Task.id).where(Task.created_at < now - timedelta(days=365))
+            .order_by(Task.created_at.desc(), Task.id.desc()).limit(1)
+        ).first()
+        result['first_page_ms'] = median_ms(page(), runs)
+        result['year_back_page_ms'] = median_ms(page(position=tuple(year_ago)), runs)
+        result['pending_page_ms'] = median_ms(page('pending'), runs)
+
+        # One whole month near the old end: the second partition after the (empty) legacy one
+        month_from, month_to = partitions.month_start(oldest, 1), partitions.month_start(oldest, 2)
+        month = (Task.created_at >= month_from) & (Task.created_at < month_to)
+        result['month_rows'] = db.session.scalar(select(db.func.count()).where(month))
+        db.session.commit()
+
+        def vacuum():
+            with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+                conn.execute(text('VACUUM tasks'))
+
+        if mode == 'plain':
+            def archive_and_delete():
+                db.session.execute(db.insert(TaskArchive).from_select(
+                    ARCHIVE_COLUMNS + ['archived_at'],
+                    select(*(getattr(Task, name) for name in ARCHIVE_COLUMNS), db.literal(now)).where(month)
+                ))
+                db.session.execute(delete(Task).where(month))
+                db.session.commit()
+            result['archive_delete_s'] = timed(archive_and_delete)
+            result['archive_delete_vacuum_s'] = timed(vacuum)
+            # Put the month back for the plain DELETE
+            columns = ', '.join(ARCHIVE_COLUMNS)
+            db.session.execute(text(f'INSERT INTO tasks ({columns}) SELECT {columns} FROM tasks_archive'))
+            db.session.commit()
+            vacuum()
+            result['delete_s'] = timed(lambda: (db.session.execute(delete(Task).where(month)), db.session.commit()))
+            result['delete_vacuum_s'] = timed(vacuum)
+        else:
+            def drop_only(name):
+                db.session.execute(text(f'ALTER TABLE tasks DETACH PARTITION {name}'))
+                db.session.execute(text(f'DROP TABLE {name}'))
+                db.session.commit()
+            result['drop_s'] = timed(lambda: drop_only(f'tasks_p{month_from:%Y%m}'))
+            # The following month, the way maintain_task_partitions does it (tombstones included)
+            following = f'tasks_p{month_to:%Y%m}'
+            result['archive_drop_s'] = timed(lambda: (drop_task_partitions([following], now), db.session.commit()))
+    print(json.dumps(result))
+
+def reset_schema():
+    from sqlalchemy import create_engine, text
+    url = os.environ['DATABASE_URL'].replace('postgres://', 'postgresql://', 1)
+    engine = create_engine(url, isolation_level='AUTOCOMMIT')
+    with engine.connect() as conn:
+        conn.execute(text('DROP SCHEMA public CASCADE'))
+        conn.execute(text('CREATE SCHEMA public'))
+    engine.dispose()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--mode', choices=['plain', 'partitioned'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if not os.environ.get('DATABASE_URL', '').startswith('postgres'):
+        sys.exit("DATABASE_URL must point at a scratch PostgreSQL database")
+    if args.mode:
+        run_mode(args.mode, args.rows, args.runs)
+        return
+
+    results = {}
+    for mode in ('plain', 'partitioned'):
+        reset_schema()
+        output = subprocess.run(
+            [sys.executable, __file__, '--mode', mode, '--rows', str(args.rows), '--runs', str(args.runs)],
+            check=True, capture_output=True, text=True
+        ).stdout
+        results[mode] = json.loads(output.strip().splitlines()[-1])
+    plain, partitioned = results['plain'], results['partitioned']
+
+    print("=" * 72)
+    print(f"🗂️  Partitioned tasks: {args.rows:,} tasks over {MONTHS} months, "
+          f"{plain['month_rows']:,} in the month dropped")
+    print("=" * 72)
+    print(f"\n{'list (median ms)':<34} {'plain':>10} {'partitioned':>12}")
+    for key, label in (('first_page_ms', 'first page'), ('year_back_page_ms', 'page a year back'),
+                       ('pending_page_ms', '?status=pending')):
+        print(f"{label:<34} {plain[key]:>10.2f} {partitioned[key]:>12.2f}")
+    print(f"\n{'drop one month (s)':<34} {'plain':>10} {'partitioned':>12}")
+    print(f"{'delete / drop':<34} {plain['delete_s'] + plain['delete_vacuum_s']:>10.2f} {partitioned['drop_s']:>12.2f}"
+          f"   (DELETE {plain['delete_s']:.2f} + VACUUM {plain['delete_vacuum_s']:.2f})")
+    print(f"{'archive, then delete / drop':<34} "
+          f"{plain['archive_delete_s'] + plain['archive_delete_vacuum_s']:>10.2f} {partitioned['archive_drop_s']:>12.2f}")
+
+if __name__ == '__main__':
+    main()
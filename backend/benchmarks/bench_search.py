@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark for GET /api/tasks/search
+Seeds a SQLite database with N tasks (titles and descriptions drawn from the
+same Zipf-like vocabulary as bench_near_duplicates.py, so some words match a
+handful of tasks and others a large share of them) and times searches
+through the Flask test client: rare and common words, two words, and a
+page deep into the results. Next to it, the LIKE scan that a search without
+the full-text index would need.
+
+SQLite uses the FTS5 fallback; with DATABASE_URL pointing at PostgreSQL the
+same script measures the tsvector/GIN path (the database must be empty).
+
+Usage:
+  python benchmarks/bench_search.py --tasks 1000000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from bench_near_duplicates import SEED_BATCH, TitleGenerator, make_vocabulary, percentile
+
+def seed(db, Task, generator, count):
+    """Insert tasks in batches, the database maintains the search index"""
+    now = datetime.utcnow()
+    for start in range(0, count, SEED_BATCH):
+        db.session.execute(db.insert(Task), [{
+            'title': generator.title(),
+            'description': ' '.join(generator.title() for _ in range(3)),
+            'status': 'pending',
+            'created_at': now,
+            'updated_at': now,
+        } for _ in range(start, min(start + SEED_BATCH, count))])
+        db.session.commit()
+        print(f"  seeded {min(start + SEED_BATCH, count):,} tasks", end='\r', flush=True)
+    print()
+
+def timed(fn, runs):
+    latencies = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        latencies.append(time.perf_counter() - start)
+    return latencies, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, default=1000000)
+    parser.add_argument('--runs', type=int, default=50)
+    parser.add_argument('--vocabulary', type=int, default=20000)
+    args = parser.parse_args()
+
+    os.environ.setdefault('DATABASE_URL', f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'search.db')}")
+    # Measure the queries, not the response cache
+    os.environ['RESPONSE_CACHE_MAX_ENTRIES'] = '0'
+    from app import app, db, search_ranked, Task
+    from migrations import run_migrations
+
+    rng = random.Random(11)
+    vocabulary = make_vocabulary(args.vocabulary, rng)
+    generator = TitleGenerator(vocabulary, rng)
+    client = app.test_client()
+
+    with app.app_context():
+        print("=" * 72)
+        print(f"🔍 Task search: {args.tasks:,} tasks, {db.engine.dialect.name}, {args.runs} runs per query")
+        print("=" * 72)
+
+        run_migrations(db)
+        start = time.perf_counter()
+        seed(db, Task, generator, args.tasks)
+        print(f"Seeded in {time.perf_counter() - start:.0f}s")
+
+        def like_scan(word):
+            pattern = f'%{word}%'
+            return db.session.execute(db.select(db.func.count(Task.id)).where(
+                Task.title.ilike(pattern) | Task.description.ilike(pattern)
+            )).scalar()
+
+        def search(**params):
+            response = client.get('/api/tasks/search', query_string={'limit': 20, **params})
+            assert response.status_code == 200, response.get_json()
+            return response
+
+        def match_count(q):
+            return db.session.execute(
+                db.select(db.func.count()).select_from(search_ranked(q, None).subquery())
+            ).scalar()
+
+        # The generator's weights follow vocabulary order, the first word is the most common
+        queries = {
+            'rare word': vocabulary[-1],
+            'mid word': vocabulary[len(vocabulary) // 50],
+            'common word': vocabulary[0],
+            'two words': f'{vocabulary[0]} {vocabulary[5]}',
+        }
+
+        print(f"\n{'query':<14} {'matches':>10} {'p50 ms':>9} {'p99 ms':>9}")
+        for label, q in queries.items():
+            latencies, _ = timed(lambda: search(q=q), args.runs)
+            print(f"{label:<14} {match_count(q):>10,} {percentile(latencies, 0.5):>9.2f} {percentile(latencies, 0.99):>9.2f}")
+
+        # Fifth page of a mid-frequency word, following cursors
+        q = queries['mid word']
+        cursor = None
+        for _ in range(4):
+            cursor = search(q=q, **({'cursor': cursor} if cursor else {})).headers.get('X-Next-Cursor')
+        if cursor:
+            latencies, _ = timed(lambda: search(q=q, cursor=cursor), args.runs)
+            print(f"{'page 5':<14} {'':>10} {percentile(latencies, 0.5):>9.2f} {percentile(latencies, 0.99):>9.2f}")
+
+        latencies, _ = timed(lambda: like_scan(queries['rare word']), 3)
+        print(f"{'LIKE scan':<14} {'':>10} {percentile(latencies, 0.5):>9.2f} {'':>9} (no index)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark for task list serialization (GET /api/tasks, /api/tasks/detected)
+Measures the CPU time per 10k tasks of turning a query into a response body,
+split into steps:
+
+  before: ORM objects (identity map) -> Task.to_dict() -> jsonify()
+  after:  raw column tuples -> task_records() -> tasks_json() (orjson)
+
+Both produce the same bytes, which the script checks. Each step is timed
+with time.process_time() over several runs, the best run counts.
+
+Usage:
+  python benchmarks/bench_serialization.py --rows 10000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+def seed(db, Task, rows):
+    now = datetime.utcnow()
+    db.session.execute(db.insert(Task), [{
+        'title': f'Review report número {i}',
+        'description': 'Lorem ipsum dolor sit amet, please reply by Friday. ' * 6,
+        'source': 'email',
+        'url': f'https://mail.example.com/#inbox/{i}',
+        'priority': ('low', 'medium', 'high')[i % 3],
+        'deadline': (now + timedelta(days=i % 30)).date() if i % 4 == 0 else None,
+        'status': 'pending',
+        'created_at': now - timedelta(seconds=i),
+        'updated_at': now - timedelta(seconds=i),
+        'task_metadata': {'aiDetected': True, 'subject': f'Thread {i}', 'confidence': 0.85},
+    } for i in range(rows)])
+    db.session.commit()
+
+def best(fn, runs):
+    """(lowest CPU seconds of fn() over runs, its last result)"""
+    times = []
+    for _ in range(runs):
+        start = time.process_time()
+        result = fn()
+        times.append(time.process_time() - start)
+    return min(times), result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'serialization.db')}"
+    from flask import jsonify
+    from app import app, db, Task, task_list_query, task_records, tasks_json
+    from migrations import run_migrations
+
+    with app.app_context(), app.test_request_context():
+        run_migrations(db)
+        seed(db, Task, args.rows)
+        per_10k = 10000 / args.rows
+
+        print("=" * 72)
+        print(f"📦 Task list serialization: {args.rows:,} tasks, CPU ms per 10k tasks (best of {args.runs})")
+        print("=" * 72)
+
+        old_query = Task.query.filter(Task.status != 'detected').order_by(Task.created_at.desc(), Task.id.desc())
+        new_query = task_list_query(None, None, None)
+
+        def load_objects():
+            db.session.expunge_all()
+            return old_query.all()
+        load_old, tasks = best(load_objects, args.runs)
+        dicts_old, dicts = best(lambda: [task.to_dict() for task in tasks], args.runs)
+        encode_old, old_body = best(lambda: jsonify(dicts).get_data(), args.runs)
+
+        load_new, rows = best(lambda: db.session.execute(new_query).all(), args.runs)
+        dicts_new, records = best(lambda: task_records(rows, None), args.runs)
+        encode_new, new_body = best(lambda: tasks_json(records) + b'\n', args.runs)
+
+        assert new_body == old_body, "Bodies differ"
+
+        print(f"\n{'step':<26} {'before':>10} {'after':>10}")
+        for label, old, new in (
+            ('query + rows/objects', load_old, load_new),
+            ('dicts', dicts_old, dicts_new),
+            ('JSON encoding', encode_old, encode_new),
+        ):
+            print(f"{label:<26} {old * per_10k * 1000:>10.1f} {new * per_10k * 1000:>10.1f}")
+        serialization_old = (dicts_old + encode_old) * per_10k * 1000
+        serialization_new = (dicts_new + encode_new) * per_10k * 1000
+        total_old = (load_old + dicts_old + encode_old) * per_10k * 1000
+        total_new = (load_new + dicts_new + encode_new) * per_10k * 1000
+        print(f"{'serialization':<26} {serialization_old:>10.1f} {serialization_new:>10.1f} "
+              f"({serialization_old / serialization_new:.1f}x)")
+        print(f"{'total':<26} {total_old:>10.1f} {total_new:>10.1f} ({total_old / total_new:.1f}x)")
+        print(f"\nBody: {len(new_body) / 1024:.0f} KB, identical")
+
+if __name__ == '__main__':
+    main()
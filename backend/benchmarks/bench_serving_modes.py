@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Load test comparing the sync (gunicorn app:app) and async (uvicorn asgi:app)
+serving modes, one worker process each.
+Runs many concurrent clients against GET /api/tasks?limit=50 and against
+POST /api/analyze-tasks backed by the stub Groq server
+(benchmarks/stub_groq.py), and reports requests/second and tail latency.
+Needs gunicorn, uvicorn and aiosqlite (the database is a seeded SQLite file).
+
+The load generator shares the CPU with the server, so the CPU-bound list
+scenario runs at a lower concurrency: at a few hundred connections the
+httpx client itself becomes the bottleneck on a small machine.
+
+Usage:
+  python benchmarks/bench_serving_modes.py --concurrency 200 --latency 0.5
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stub_groq import StubGroq
+
+# Server command lines for a port
+MODES = {
+    'sync (gunicorn)': lambda port: ['gunicorn', 'app:app', '--workers', '1', '--bind', f'127.0.0.1:{port}'],
+    'async (uvicorn)': lambda port: ['uvicorn', 'asgi:app', '--workers', '1', '--log-level', 'warning',
+                                     '--port', str(port)],
+}
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def seed(db_path, rows):
+    os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+    from app import app, db, Task
+    from migrations import run_migrations
+
+    now = datetime.utcnow()
+    with app.app_context():
+        run_migrations(db)
+        db.session.execute(db.insert(Task), [{
+            'title': f'Review report number {i}',
+            'description': 'Lorem ipsum dolor sit amet. ' * 10,
+            'status': 'pending',
+            'created_at': now - timedelta(seconds=i),
+            'updated_at': now - timedelta(seconds=i),
+        } for i in range(rows)])
+        db.session.commit()
+
+def start_server(mode, env, port):
+    process = subprocess.Popen(MODES[mode](port), cwd=BACKEND_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    for _ in range(100):
+        try:
+            httpx.get(f'http://127.0.0.1:{port}/health', timeout=1)
+            return process
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f'{mode} did not start')
+
+async def load(base_url, method, path, requests, concurrency, body=None):
+    """Fire `requests` requests with at most `concurrency` in flight, returns (rps, latencies, errors)"""
+    latencies = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=300) as client:
+        async def one(i):
+            nonlocal errors
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    response = await client.request(method, path, json=body(i) if body else None)
+                    if response.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*[one(i) for i in range(requests)])
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return requests / elapsed, latencies, errors
+
+def percentile(values, p):
+    return values[min(len(values) - 1, int(len(values) * p))] * 1000
+
+def analyze_body(i):
+    # Unique text per request so nothing is served from the analysis cache
+    return {'text': f"Hi team ({i}), please review the quarterly budget report before the board meeting on Friday."}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concurrency', type=int, default=200, help='clients for analyze')
+    parser.add_argument('--list-concurrency', type=int, default=20, help='clients for list')
+    parser.add_argument('--list-requests', type=int, default=2000)
+    parser.add_argument('--analyze-requests', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.5, help='stub LLM seconds per call')
+    parser.add_argument('--rows', type=int, default=5000)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), 'serving.db')
+    seed(db_path, args.rows)
+    stub = StubGroq(args.latency).start()
+    env = dict(
+        os.environ,
+        DATABASE_URL=f'sqlite:///{db_path}',
+        GROQ_API_KEY='stub',
+        GROQ_BASE_URL=stub.url,
+        GROQ_MAX_CONNECTIONS=str(args.concurrency),
+        ANALYSIS_CACHE_TTL_SECONDS='0',
+    )
+
+    print("=" * 78)
+    print(f"🚀 Serving modes: one worker, {args.list_concurrency} list / {args.concurrency} analyze "
+          f"clients, stub LLM latency {args.latency}s")
+    print("=" * 78)
+    print(f"{'mode':<18} {'scenario':<16} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9} {'errors':>7}")
+
+    for mode in MODES:
+        port = free_port()
+        process = start_server(mode, env, port)
+        try:
+            base_url = f'http://127.0.0.1:{port}'
+            scenarios = [
+                ('list', 'GET', '/api/tasks?limit=50', args.list_requests, args.list_concurrency, None),
+                ('analyze', 'POST', '/api/analyze-tasks', args.analyze_requests, args.concurrency, analyze_body),
+            ]
+            for name, method, path, requests, concurrency, body in scenarios:
+                rps, latencies, errors = asyncio.run(load(base_url, method, path, requests, concurrency, body))
+                print(f"{mode:<18} {name:<16} {rps:>9.1f} {percentile(latencies, 0.5):>9.1f} "
+                      f"{percentile(latencies, 0.99):>9.1f} {latencies[-1] * 1000:>9.1f} {errors:>7}")
+        finally:
+            process.send_signal(signal.SIGTERM)
+            process.wait()
+
+    stub.stop()
+
+if __name__ == '__main__':
+    main()
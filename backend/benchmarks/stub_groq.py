@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Groq chat completions API, for tests and benchmarks
+Answers POST /openai/v1/chat/completions like the real API. The "model" is
+detection.py's keyword detector, run on each message of the prompt, so
+answers are deterministic. Latency, malformed batch answers and 503
+errors can be simulated.
+
+  python benchmarks/stub_groq.py --port 8765 --latency 0.5
+  GROQ_API_KEY=stub GROQ_BASE_URL=http://127.0.0.1:8765 python app.py
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from detection import load_detector
+
+MESSAGE_RE = re.compile(r'<message id="([^"]*)">\n(.*?)\n</message>', re.DOTALL)
+TEXT_RE = re.compile(r'Text to analyze:\n(.*?)\n\nReturn ONLY', re.DOTALL)
+
+detector = load_detector()
+
+class StubGroq:
+    """Threaded stub server, use as a context manager or call start()/stop()"""
+
+    def __init__(self, latency=0.0, malformed_batches=False, port=0, latency_per_message=0.0, fail_first=0):
+        self.latency = latency
+        self.latency_per_message = latency_per_message
+        self.malformed_batches = malformed_batches
+        # Answer this many calls with 503 before succeeding
+        self.fail_first = fail_first
+        self.calls = 0
+        self.connections = 0
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), self.handler_class())
+        self.server.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self.server.server_port}'
+
+    def handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive, so connection reuse by the client is visible
+            protocol_version = 'HTTP/1.1'
+            # Headers and body in one send, otherwise delayed ACKs add ~40ms per call
+            wbufsize = -1
+
+            def setup(self):
+                super().setup()
+                with stub.lock:
+                    stub.connections += 1
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                with stub.lock:
+                    stub.calls += 1
+                    fail = stub.calls <= stub.fail_first
+                if fail:
+                    self.send_json(503, {'error': {'message': 'Service unavailable', 'type': 'internal_server_error'}})
+                    return
+                prompt = body['messages'][-1]['content']
+                # Longer answers take longer to generate
+                messages = max(1, len(MESSAGE_RE.findall(prompt)))
+                time.sleep(stub.latency + stub.latency_per_message * messages)
+
+                content = stub.answer(prompt)
+                self.send_json(200, {
+                    'id': f'stub-{stub.calls}',
+                    'object': 'chat.completion',
+                    'created': int(time.time()),
+                    'model': body.get('model'),
+                    'choices': [{
+                        'index': 0,
+                        'message': {'role': 'assistant', 'content': content},
+                        'finish_reason': 'stop',
+                        'logprobs': None
+                    }],
+                    'usage': {'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0},
+                    'system_fingerprint': 'stub'
+                })
+
+            def send_json(self, status, body):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
+
+    def answer(self, prompt):
+        messages = MESSAGE_RE.findall(prompt)
+        if messages:
+            if self.malformed_batches:
+                return 'Sure! Here are the tasks: {"m1": ['
+            return '```json\n' + json.dumps({mid: detector.detect(text) for mid, text in messages}) + '\n```'
+        match = TEXT_RE.search(prompt)
+        return json.dumps(detector.detect(match.group(1) if match else ''))
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds per completion')
+    parser.add_argument('--latency-per-message', type=float, default=0.0, help='extra seconds per batched message')
+    parser.add_argument('--malformed-batches', action='store_true')
+    parser.add_argument('--fail-first', type=int, default=0, help='answer the first N calls with 503')
+    args = parser.parse_args()
+
+    stub = StubGroq(args.latency, args.malformed_batches, args.port, args.latency_per_message, args.fail_first)
+    print(f"🤖 Stub Groq API on {stub.url}")
+    stub.server.serve_forever()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+"""
+Keyword based task detection, used when no LLM is configured
+
+Every pattern starts with a literal trigger phrase ("please", "need to", ...).
+The text is lowercased (lazily, in growing chunks, since detection usually
+stops early on busy threads) and each trigger is located with str.find, so
+the precompiled regexes only run anchored at positions where their trigger
+occurs, instead of each one scanning the whole text.
+
+Patterns can be replaced without a code change by pointing
+DETECTION_PATTERNS_FILE at a JSON file:
+
+  [{"trigger": "please", "pattern": "please\\s+([^.!?\\n]{10,100})", "priority": "high"}]
+
+"pattern" defaults to the trigger followed by whitespace and 10-100 characters
+of task text. A pattern must only match where its trigger occurs (ignoring
+case) and its first group is the task text.
+"""
+
+import json
+import re
+
+# Stop after this many tasks
+MAX_TASKS = 5
+
+# Keywords that indicate tasks: (trigger, pattern, priority), checked in order
+DEFAULT_PATTERNS = [
+    ('please', r'please\s+([^.!?\n]{10,100})', 'high'),
+    ('can you', r'can you\s+([^.!?\n]{10,100})', 'medium'),
+    ('need to', r'need to\s+([^.!?\n]{10,100})', 'high'),
+    ('should', r'should\s+([^.!?\n]{10,100})', 'medium'),
+    ('must', r'must\s+([^.!?\n]{10,100})', 'highest'),
+    ('action item', r'action item[s]?:?\s*([^.!?\n]{10,100})', 'high'),
+    ('todo', r'todo[s]?:?\s*([^.!?\n]{10,100})', 'medium'),
+    ('task', r'task[s]?:?\s*([^.!?\n]{10,100})', 'medium'),
+    ('reminder', r'reminder:?\s*([^.!?\n]{10,100})', 'medium'),
+    ("don't forget to", r'don\'t forget to\s+([^.!?\n]{10,100})', 'high'),
+]
+
+# re.IGNORECASE matches these to ASCII letters but str.lower() does not
+# (or changes the text length), texts containing them use regex trigger search
+CASE_FOLD_EXCEPTIONS = ('İ', 'ı', 'ſ')
+
+# First chunk of text to lowercase, grows 4x each time a search runs past it
+LOWER_CHUNK = 16384
+
+class LoweredText:
+    """text.lower(), computed only as far as searches need it"""
+
+    def __init__(self, text):
+        self.text = text
+        self.value = ''
+
+    def find(self, trigger, start=0):
+        while True:
+            pos = self.value.find(trigger, start)
+            if pos != -1 or len(self.value) == len(self.text):
+                return pos
+            done = len(self.value)
+            self.value += self.text[done:max(LOWER_CHUNK, done * 4)].lower()
+            # Only a match straddling the old end can be new
+            start = max(start, done - len(trigger) + 1)
+
+class TaskDetector:
+    """Precompiled keyword patterns, detect() returns task dicts"""
+
+    def __init__(self, patterns):
+        self.patterns = [
+            (trigger.lower(), re.compile(pattern, re.IGNORECASE), priority)
+            for trigger, pattern, priority in patterns
+        ]
+        # Lookahead so overlapping trigger occurrences are all found
+        self.trigger_res = [
+            re.compile(f'(?={re.escape(trigger)})', re.IGNORECASE)
+            for trigger, _, _ in patterns
+        ]
+        self.ascii_triggers = all(trigger.isascii() for trigger, _, _ in patterns)
+
+    def lowered(self, text):
+        """Lowercased text with the same offsets, or None if that isn't exact"""
+        if not self.ascii_triggers:
+            return None
+        if not text.isascii() and any(c in text for c in CASE_FOLD_EXCEPTIONS):
+            return None
+        return LoweredText(text)
+
+    def trigger_positions(self, index, text, lowered):
+        if lowered is None:
+            for match in self.trigger_res[index].finditer(text):
+                yield match.start()
+            return
+
+        trigger = self.patterns[index][0]
+        pos = lowered.find(trigger)
+        while pos != -1:
+            yield pos
+            pos = lowered.find(trigger, pos + 1)
+
+    def matches(self, index, text, lowered):
+        """Same matches as re.finditer(pattern, text), only tried at triggers"""
+        pattern = self.patterns[index][1]
+        last_end = 0
+        for pos in self.trigger_positions(index, text, lowered):
+            if pos < last_end:
+                continue
+            match = pattern.match(text, pos)
+            if match:
+                yield match
+                last_end = match.end()
+
+    def detect(self, text):
+        tasks = []
+        seen_tasks = set()
+        lowered = self.lowered(text)
+
+        for index, (_, _, priority) in enumerate(self.patterns):
+            for match in self.matches(index, text, lowered):
+                # Extract the action phrase
+                action = match.group(1).strip()
+
+                # Skip if too short or already seen
+                if len(action) < 10 or action.lower() in seen_tasks:
+                    continue
+
+                seen_tasks.add(action.lower())
+
+                # Extract more context around the match
+                start = max(0, match.start() - 100)
+                end = min(len(text), match.end() + 150)
+                context = text[start:end].strip()
+
+                # Clean up title (capitalize first letter, remove extra spaces)
+                title = action[:60].strip()
+                if not title[0].isupper():
+                    title = title[0].upper() + title[1:]
+
+                # Create description from context
+                description = context[:300].strip()
+                if len(context) > 300:
+                    description += '...'
+
+                tasks.append({
+                    'title': title,
+                    'description': description,
+                    'priority': priority,
+                    'deadline': None
+                })
+
+                if len(tasks) >= MAX_TASKS:
+                    return tasks
+
+        return tasks
+
+def load_patterns(path):
+    """Read (trigger, pattern, priority) tuples from a JSON file"""
+    with open(path, encoding='utf-8') as f:
+        entries = json.load(f)
+
+    patterns = []
+    for entry in entries:
+        trigger = entry['trigger']
+        pattern = entry.get('pattern') or re.escape(trigger) + r'\s+([^.!?\n]{10,100})'
+        patterns.append((trigger, pattern, entry.get('priority', 'medium')))
+    return patterns
+
+def load_detector(path=None):
+    """Detector for DETECTION_PATTERNS_FILE, or the default patterns"""
+    return TaskDetector(load_patterns(path) if path else DEFAULT_PATTERNS)
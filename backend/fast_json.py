@@ -0,0 +1,113 @@
+"""
+jsonify()-compatible JSON encoding through orjson
+
+Outside debug mode, Flask's jsonify() writes sorted keys, no whitespace,
+only ASCII (everything else as \\uXXXX escapes, like json.dumps) and a
+trailing newline. This module always writes that compact form: it doesn't
+follow the JSON provider's settings, so it won't match a jsonify() that
+pretty-prints (app.debug, or app.json.compact = False). orjson is
+several times faster on task lists but writes UTF-8, and a few values
+differently, so encode() escapes its non-ASCII output afterwards and falls
+back to the json module for what it can't reproduce:
+
+- floats json writes with an exponent (1e-05, 1e+16), inf and nan
+- integers outside 64 bits, strings with lone surrogates (orjson refuses them)
+
+Escaping runs as an error handler of the ASCII codec, so only the non-ASCII
+characters reach Python code, and their escapes are cached: task text
+repeats the same few accented letters and emoji.
+
+Datetimes and dates are written as isoformat(), same as Task.to_dict().
+"""
+
+import codecs
+import json
+import math
+
+import orjson
+
+# json.dumps switches to exponent notation outside this range, orjson differs there
+EXPONENT_FREE_MIN = 1e-4
+EXPONENT_FREE_MAX = 1e16
+
+# Distinct runs of non-ASCII characters whose escapes are kept
+ESCAPE_CACHE_MAX_ENTRIES = 10000
+
+_escapes = {}
+
+_fallback = json.JSONEncoder(
+    ensure_ascii=True, sort_keys=True, separators=(',', ':'),
+    default=lambda value: value.isoformat()
+)
+
+def escape(run):
+    """json.dumps escapes of non-ASCII characters, surrogate pairs above U+FFFF"""
+    escaped = []
+    for char in run:
+        code = ord(char)
+        if code > 0xFFFF:
+            code -= 0x10000
+            escaped.append('\\u%04x\\u%04x' % (0xD800 | (code >> 10), 0xDC00 | (code & 0x3FF)))
+        else:
+            escaped.append('\\u%04x' % code)
+    return ''.join(escaped)
+
+def _escape_error(error):
+    run = error.object[error.start:error.end]
+    escaped = _escapes.get(run)
+    if escaped is None:
+        if len(_escapes) >= ESCAPE_CACHE_MAX_ENTRIES:
+            _escapes.clear()
+        escaped = _escapes[run] = escape(run)
+    return escaped, error.end
+
+codecs.register_error('fast_json.escape', _escape_error)
+
+# Values orjson and json write the same way, checked by type first
+_PLAIN_TYPES = frozenset((str, int, bool, type(None)))
+
+def same_in_orjson(value):
+    """False if value holds a float orjson writes differently from json.dumps"""
+    if isinstance(value, float):
+        return value == 0 or (math.isfinite(value) and EXPONENT_FREE_MIN <= abs(value) < EXPONENT_FREE_MAX)
+    if isinstance(value, dict):
+        value = value.values()
+    elif not isinstance(value, (list, tuple)):
+        return True
+    for item in value:
+        if type(item) not in _PLAIN_TYPES and not same_in_orjson(item):
+            return False
+    return True
+
+def encode(data, safe=None):
+    """
+    JSON bytes of data, byte for byte what a compact jsonify() writes minus the newline.
+    safe: whether data passes same_in_orjson(), None checks it.
+    """
+    if safe is None:
+        safe = same_in_orjson(data)
+    if safe:
+        try:
+            body = orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            body = None
+        if body is not None:
+            if not body.isascii():
+                body = body.decode().encode('ascii', 'fast_json.escape')
+            # json escapes DEL too, orjson leaves it (only ever inside strings)
+            if b'\x7f' in body:
+                body = body.replace(b'\x7f', b'\\u007f')
+            return body
+    return _fallback.encode(data).encode()
+
+def dumps(data, safe=None):
+    """Response body for data, same bytes as jsonify(data).get_data() when compact"""
+    return encode(data, safe) + b'\n'
+
+def dumps_chunks(chunks):
+    """Yield the body of a JSON array, one piece per chunk (bytes of encode() of a non-empty list)"""
+    first = True
+    for chunk in chunks:
+        yield (b'[' if first else b',') + chunk[1:-1]
+        first = False
+    yield b'[]\n' if first else b']\n'
@@ -0,0 +1,406 @@
+"""
+Groq LLM task extraction
+
+Prompts and response parsing for the /api/analyze-tasks endpoints. A
+single message is sent as one chat completion. extract_tasks_batch() packs
+several messages into one prompt, tagged with ids, and maps the combined
+JSON answer back to each message, retrying messages one by one if the
+answer can't be matched up. Messages longer than MAX_MESSAGE_CHARS are split
+into overlapping chunks (extract_tasks_chunked) and the tasks merged.
+
+shared_client() keeps one Groq client per process on a keep-alive
+connection pool, and complete() retries transient errors with jittered
+exponential backoff. Both are configured with GROQ_* environment variables.
+The *_async variants do the same with AsyncGroq for the ASGI app (asgi.py).
+"""
+
+import asyncio
+import json
+import os
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+MODEL = "llama-3.3-70b-versatile"
+
+SYSTEM_PROMPT = "You are an expert task extraction assistant. Extract clear, actionable tasks with detailed descriptions. Return only valid JSON."
+
+# Characters of each message sent to the LLM
+MAX_MESSAGE_CHARS = 2000
+
+# Characters repeated at the start of the next chunk, so a task cut by a
+# chunk boundary is still seen whole once
+CHUNK_OVERLAP = 300
+
+# Where to split long messages, best first: before a quoted/forwarded
+# message, blank line, line break, end of sentence, any whitespace
+BOUNDARY_RES = [
+    re.compile(r'\n(?=On .{0,200} wrote:|-{2,} ?(?:Original|Forwarded) [Mm]essage|From: )'),
+    re.compile(r'\n[ \t]*\n'),
+    re.compile(r'\n'),
+    re.compile(r'(?<=[.!?])\s+'),
+    re.compile(r'\s+'),
+]
+
+PRIORITY_RANK = {'low': 0, 'medium': 1, 'high': 2, 'highest': 3}
+
+# HTTP settings of the shared client
+GROQ_TIMEOUT_SECONDS = float(os.getenv('GROQ_TIMEOUT_SECONDS', 60))
+GROQ_CONNECT_TIMEOUT_SECONDS = float(os.getenv('GROQ_CONNECT_TIMEOUT_SECONDS', 5))
+GROQ_MAX_CONNECTIONS = int(os.getenv('GROQ_MAX_CONNECTIONS', 20))
+
+# Retries of timeouts, connection errors, 408/409/429 and 5xx answers
+GROQ_MAX_RETRIES = int(os.getenv('GROQ_MAX_RETRIES', 2))
+GROQ_RETRY_BACKOFF_SECONDS = float(os.getenv('GROQ_RETRY_BACKOFF_SECONDS', 0.5))
+GROQ_RETRY_MAX_BACKOFF_SECONDS = float(os.getenv('GROQ_RETRY_MAX_BACKOFF_SECONDS', 8))
+RETRY_STATUSES = {408, 409, 429}
+
+# ============================================================
+# Shared client
+# ============================================================
+
+_client = None
+_client_key = None
+_client_pid = None
+_client_lock = threading.Lock()
+
+def _reset_client():
+    """Forget the parent's client (and a lock it may have held) in a forked child"""
+    global _client, _client_key, _client_pid, _client_lock
+    _client = _client_key = _client_pid = None
+    _client_lock = threading.Lock()
+    _async_clients.clear()
+
+os.register_at_fork(after_in_child=_reset_client)
+
+def shared_client(api_key):
+    """Groq client for this process, built once and re-created after a gunicorn fork"""
+    global _client, _client_key, _client_pid
+    with _client_lock:
+        if _client is not None and _client_pid == os.getpid() and _client_key == api_key:
+            return _client
+        
+        import httpx
+        from groq import Groq
+        if _client is not None and _client_pid == os.getpid():
+            _client.close()
+        # complete() does the retries, so the backoff is configurable
+        _client = Groq(api_key=api_key, http_client=httpx.Client(**http_settings()), max_retries=0)
+        _client_key = api_key
+        _client_pid = os.getpid()
+        return _client
+
+def http_settings():
+    import httpx
+    return {
+        'timeout': httpx.Timeout(GROQ_TIMEOUT_SECONDS, connect=GROQ_CONNECT_TIMEOUT_SECONDS),
+        'limits': httpx.Limits(
+            max_connections=GROQ_MAX_CONNECTIONS,
+            max_keepalive_connections=GROQ_MAX_CONNECTIONS
+        ),
+        'follow_redirects': True,
+    }
+
+# One AsyncGroq client per event loop, its connections belong to that loop
+_async_clients = {}
+
+def shared_async_client(api_key):
+    """AsyncGroq client for the running event loop"""
+    loop = asyncio.get_running_loop()
+    key = (os.getpid(), id(loop), api_key)
+    if key not in _async_clients:
+        import httpx
+        from groq import AsyncGroq
+        _async_clients.clear()
+        _async_clients[key] = AsyncGroq(
+            api_key=api_key,
+            http_client=httpx.AsyncClient(**http_settings()),
+            max_retries=0
+        )
+    return _async_clients[key]
+
+def should_retry(error):
+    from groq import APIConnectionError, APIStatusError
+    if isinstance(error, APIConnectionError):  # includes timeouts
+        return True
+    if isinstance(error, APIStatusError):
+        return error.status_code in RETRY_STATUSES or error.status_code >= 500
+    return False
+
+def retry_delay(attempt, error):
+    """Seconds before retry number attempt (0-based): Retry-After, or full jitter backoff"""
+    response = getattr(error, 'response', None)
+    retry_after = response.headers.get('retry-after') if response is not None else None
+    try:
+        if retry_after and 0 < float(retry_after) <= GROQ_RETRY_MAX_BACKOFF_SECONDS:
+            return float(retry_after)
+    except ValueError:
+        pass
+    return random.uniform(0, min(GROQ_RETRY_MAX_BACKOFF_SECONDS, GROQ_RETRY_BACKOFF_SECONDS * 2 ** attempt))
+
+# ============================================================
+# Prompts
+# ============================================================
+
+def task_prompt(text):
+    return f"""
+You are a task extraction assistant. Analyze the following email/message and extract actionable tasks.
+
+For each task found:
+1. Write a CLEAR, ACTIONABLE title (30-60 chars) - Start with a verb (e.g., "Review budget report", "Schedule meeting with team")
+2. Write a DETAILED description (2-3 sentences) that includes:
+   - What needs to be done
+   - Why it's important (if mentioned)
+   - Any relevant context or details
+3. Assign priority based on urgency indicators:
+   - "highest" = ASAP, urgent, critical, immediately
+   - "high" = important, soon, this week
+   - "medium" = normal priority, no urgency mentioned
+   - "low" = FYI, optional, when you have time
+4. Extract deadline if mentioned (format: YYYY-MM-DD)
+
+Text to analyze:
+{text[:MAX_MESSAGE_CHARS]}
+
+Return ONLY a valid JSON array. If no tasks found, return [].
+Format:
+[
+  {{
+    "title": "Review Q4 budget report",
+    "description": "Review the Q4 budget report sent by finance team. Focus on marketing expenses and provide feedback by end of week. This is needed for the board meeting.",
+    "priority": "high",
+    "deadline": "2026-01-24"
+  }}
+]
+"""
+
+def batch_prompt(messages):
+    """One prompt for several (id, text) messages, answered as {id: [tasks]}"""
+    blocks = '\n\n'.join(
+        f'<message id="{message_id}">\n{text[:MAX_MESSAGE_CHARS]}\n</message>'
+        for message_id, text in messages
+    )
+    return f"""
+You are a task extraction assistant. Analyze each of the following emails/messages independently and extract actionable tasks.
+
+For each task found:
+1. Write a CLEAR, ACTIONABLE title (30-60 chars) - Start with a verb (e.g., "Review budget report", "Schedule meeting with team")
+2. Write a DETAILED description (2-3 sentences) that includes:
+   - What needs to be done
+   - Why it's important (if mentioned)
+   - Any relevant context or details
+3. Assign priority based on urgency indicators:
+   - "highest" = ASAP, urgent, critical, immediately
+   - "high" = important, soon, this week
+   - "medium" = normal priority, no urgency mentioned
+   - "low" = FYI, optional, when you have time
+4. Extract deadline if mentioned (format: YYYY-MM-DD)
+
+Messages to analyze:
+{blocks}
+
+Return ONLY a valid JSON object with one key per message id, whose value is the array of tasks found in that message.
+Include every message id. If a message has no tasks, use [].
+Format:
+{{
+  "m1": [
+    {{
+      "title": "Review Q4 budget report",
+      "description": "Review the Q4 budget report sent by finance team. Focus on marketing expenses and provide feedback by end of week. This is needed for the board meeting.",
+      "priority": "high",
+      "deadline": "2026-01-24"
+    }}
+  ],
+  "m2": []
+}}
+"""
+
+def completion_args(prompt, max_tokens):
+    return {
+        'model': MODEL,
+        'messages': [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ],
+        'temperature': 0.3,
+        'max_tokens': max_tokens
+    }
+
+def answer_json(response):
+    """The JSON part of a completion"""
+    result = response.choices[0].message.content.strip()
+    
+    # Clean up response (remove markdown code blocks if present)
+    if result.startswith('```'):
+        result = result.split('```')[1]
+        if result.startswith('json'):
+            result = result[4:]
+    return result.strip()
+
+def complete(client, prompt, max_tokens=1000):
+    """Run one chat completion, with retries, and return the JSON part of the answer"""
+    for attempt in range(GROQ_MAX_RETRIES + 1):
+        try:
+            return answer_json(client.chat.completions.create(**completion_args(prompt, max_tokens)))
+        except Exception as e:
+            if attempt == GROQ_MAX_RETRIES or not should_retry(e):
+                raise
+            delay = retry_delay(attempt, e)
+            print(f"Groq call failed ({e}), retrying in {delay:.2f}s")
+            time.sleep(delay)
+
+async def complete_async(client, prompt, max_tokens=1000):
+    """complete() for an AsyncGroq client"""
+    for attempt in range(GROQ_MAX_RETRIES + 1):
+        try:
+            return answer_json(await client.chat.completions.create(**completion_args(prompt, max_tokens)))
+        except Exception as e:
+            if attempt == GROQ_MAX_RETRIES or not should_retry(e):
+                raise
+            delay = retry_delay(attempt, e)
+            print(f"Groq call failed ({e}), retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+def parse_tasks(answer):
+    tasks = json.loads(answer)
+    if not isinstance(tasks, list):
+        tasks = []
+    return tasks
+
+def extract_tasks(client, text):
+    """Tasks for one message, raises on API or JSON errors"""
+    return parse_tasks(complete(client, task_prompt(text)))
+
+async def extract_tasks_async(client, text):
+    return parse_tasks(await complete_async(client, task_prompt(text)))
+
+def extract_tasks_batch(client, messages):
+    """
+    Tasks for several (id, text) messages using one completion.
+    Returns ({id: tasks}, number of LLM calls made). Messages missing from
+    the combined answer are retried one by one, and raise if that fails too.
+    """
+    results = {}
+    calls = 1
+    try:
+        answer = json.loads(complete(client, batch_prompt(messages), max_tokens=1000 * len(messages)))
+        if isinstance(answer, dict):
+            for message_id, _ in messages:
+                tasks = answer.get(str(message_id))
+                if isinstance(tasks, list):
+                    results[message_id] = tasks
+    except Exception as e:
+        print(f"Groq batch error, retrying messages one by one: {e}")
+    
+    for message_id, text in messages:
+        if message_id not in results:
+            results[message_id] = extract_tasks(client, text)
+            calls += 1
+    return results, calls
+
+# ============================================================
+# Long messages
+# ============================================================
+
+def split_point(text, start, end):
+    """Offset of the best boundary in the second half of text[start:end], else end"""
+    for boundary in BOUNDARY_RES:
+        last = None
+        for last in boundary.finditer(text, start + (end - start) // 2, end):
+            pass
+        if last:
+            return last.end()
+    return end
+
+def overlap_start(text, end, overlap):
+    """Start of the next chunk: a line/sentence/word start at most overlap before end"""
+    pos = end - overlap
+    for boundary in BOUNDARY_RES[2:]:
+        match = boundary.search(text, pos, end)
+        if match and match.end() < end:
+            return match.end()
+    return pos
+
+def chunk_text(text, size=MAX_MESSAGE_CHARS, overlap=CHUNK_OVERLAP):
+    """Yield overlapping chunks of at most size characters, split on message/paragraph boundaries"""
+    overlap = min(overlap, size // 4)
+    start = 0
+    while len(text) - start > size:
+        end = split_point(text, start, start + size)
+        yield text[start:end]
+        start = overlap_start(text, end, overlap)
+    yield text[start:]
+
+def normalize_title(title):
+    return ' '.join(re.findall(r'\w+', str(title).lower()))
+
+def merge_tasks(task_lists):
+    """
+    Concatenate per-chunk task lists, dropping tasks whose normalized title
+    was already seen. A duplicate can still raise the priority or fill in a
+    missing deadline of the task that is kept.
+    """
+    merged = {}
+    for tasks in task_lists:
+        for task in tasks:
+            if not isinstance(task, dict):
+                continue
+            key = normalize_title(task.get('title', ''))
+            if not key:
+                continue
+            kept = merged.get(key)
+            if kept is None:
+                merged[key] = dict(task)
+                continue
+            if PRIORITY_RANK.get(task.get('priority'), -1) > PRIORITY_RANK.get(kept.get('priority'), -1):
+                kept['priority'] = task['priority']
+            if not kept.get('deadline') and task.get('deadline'):
+                kept['deadline'] = task['deadline']
+    return list(merged.values())
+
+def extract_tasks_chunked(client, text, concurrency=4, max_chunks=40, fallback=None):
+    """
+    Tasks for a message of any length. Short messages are one call, longer
+    ones are chunked and up to `concurrency` chunks analyzed at a time; at
+    most max_chunks chunks are sent. A chunk whose call fails is passed to
+    fallback(chunk) if given, otherwise the error is raised.
+    Returns (tasks, number of LLM calls made).
+    """
+    if len(text) <= MAX_MESSAGE_CHARS:
+        return extract_tasks(client, text), 1
+    
+    def analyze(chunk):
+        try:
+            return extract_tasks(client, chunk)
+        except Exception as e:
+            if fallback is None:
+                raise
+            print(f"Groq chunk error: {e}")
+            return fallback(chunk)
+    
+    chunks = list(islice(chunk_text(text), max_chunks))
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(chunks)))) as pool:
+        return merge_tasks(pool.map(analyze, chunks)), len(chunks)
+
+async def extract_tasks_chunked_async(client, text, concurrency=4, max_chunks=40, fallback=None):
+    """extract_tasks_chunked() for an AsyncGroq client"""
+    if len(text) <= MAX_MESSAGE_CHARS:
+        return await extract_tasks_async(client, text), 1
+    
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    
+    async def analyze(chunk):
+        async with semaphore:
+            try:
+                return await extract_tasks_async(client, chunk)
+            except Exception as e:
+                if fallback is None:
+                    raise
+                print(f"Groq chunk error: {e}")
+                return fallback(chunk)
+    
+    chunks = list(islice(chunk_text(text), max_chunks))
+    return merge_tasks(await asyncio.gather(*[analyze(chunk) for chunk in chunks])), len(chunks)
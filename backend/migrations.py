@@ -0,0 +1,307 @@
+"""
+Schema migrations for the DoNotMiss backend
+
+Migrations are plain functions registered in order with @migration. Each one
+runs in its own transaction and is recorded in the schema_migrations table,
+so it is applied exactly once per database. On PostgreSQL an advisory lock
+keeps several processes from migrating at the same time, and migrations
+registered with transaction=False run outside a transaction so they can
+build indexes with CREATE INDEX CONCURRENTLY (writes go on meanwhile).
+
+Run them before the app starts (Procfile, render.yaml), never in a request:
+  flask --app app migrate
+"""
+
+import time
+from datetime import datetime
+from contextlib import contextmanager
+from sqlalchemy import JSON, Column, Date, DateTime, Integer, MetaData, String, Table, Text, inspect, text
+
+# Arbitrary key for pg_try_advisory_lock
+MIGRATION_LOCK_ID = 4242001
+MIGRATION_LOCK_POLL_SECONDS = 1
+
+MIGRATIONS = []
+
+def migration(version, transaction=True):
+    """Register a migration function under a sortable version string
+    
+    transaction=False runs it on an autocommit connection on PostgreSQL,
+    so every statement in it must be safe to run again after a failure.
+    """
+    def register(fn):
+        MIGRATIONS.append((version, fn, transaction))
+        return fn
+    return register
+
+def add_column_if_missing(conn, table, column, ddl):
+    """ALTER TABLE ... ADD COLUMN unless create_all already made it"""
+    columns = {c['name'] for c in inspect(conn).get_columns(table)}
+    if column not in columns:
+        conn.execute(text(f'ALTER TABLE {table} ADD COLUMN {column} {ddl}'))
+
+def create_tables(conn, db, *names):
+    """Create model tables by name unless they already exist"""
+    db.metadata.create_all(bind=conn, tables=[db.metadata.tables[n] for n in names])
+
+def create_index(conn, name, definition, unique=False):
+    """CREATE INDEX IF NOT EXISTS name ON definition, CONCURRENTLY on PostgreSQL (transaction=False only)"""
+    kind = 'UNIQUE INDEX' if unique else 'INDEX'
+    if conn.dialect.name != 'postgresql':
+        conn.execute(text(f'CREATE {kind} IF NOT EXISTS {name} ON {definition}'))
+        return
+    # An interrupted concurrent build leaves an invalid index that IF NOT EXISTS would keep
+    invalid = conn.execute(text(
+        'SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid '
+        'WHERE c.relname = :name AND c.relnamespace = current_schema()::regnamespace AND NOT i.indisvalid'
+    ), {'name': name}).first()
+    if invalid:
+        conn.execute(text(f'DROP INDEX CONCURRENTLY {name}'))
+    conn.execute(text(f'CREATE {kind} CONCURRENTLY IF NOT EXISTS {name} ON {definition}'))
+
+# ============================================================
+# Migrations - append only, never change the schema one has shipped
+# (building its indexes CONCURRENTLY doesn't)
+# ============================================================
+
+@migration('0001_initial')
+def initial(conn, db):
+    # The tasks table as it was before migrations existed, not the current
+    # model: later columns and tables come from their own migrations.
+    # An existing table is left alone.
+    baseline = MetaData()
+    Table(
+        'tasks', baseline,
+        Column('id', Integer, primary_key=True),
+        Column('title', String(500), nullable=False),
+        Column('description', Text),
+        Column('source', String(50)),
+        Column('url', Text),
+        Column('priority', String(20)),
+        Column('deadline', Date, nullable=True),
+        Column('status', String(20)),
+        Column('jira_key', String(50), nullable=True),
+        Column('jira_url', Text, nullable=True),
+        Column('created_at', DateTime),
+        Column('updated_at', DateTime),
+        Column('task_metadata', JSON),
+    )
+    baseline.create_all(bind=conn)
+
+@migration('0002_task_indexes', transaction=False)
+def task_indexes(conn, db):
+    # ?status=... lists, newest first
+    create_index(conn, 'ix_tasks_status_created_at', 'tasks (status, created_at DESC, id DESC)')
+    # Default list (status != 'detected') and keyset pagination
+    create_index(conn, 'ix_tasks_created_at', 'tasks (created_at DESC, id DESC)')
+    # Extension popup and badge only ever read detected tasks
+    create_index(conn, 'ix_tasks_detected_created_at',
+                 "tasks (created_at DESC, id DESC) WHERE status = 'detected'")
+
+@migration('0003_task_changes', transaction=False)
+def task_changes(conn, db):
+    create_tables(conn, db, 'task_tombstones')
+    # GET /api/tasks/changes walks tasks in (updated_at, id) order
+    create_index(conn, 'ix_tasks_updated_at', 'tasks (updated_at, id)')
+
+@migration('0004_jobs')
+def jobs(conn, db):
+    create_tables(conn, db, 'jobs')
+    # worker.py polls for the oldest queued jobs
+    conn.execute(text(
+        'CREATE INDEX IF NOT EXISTS ix_jobs_status_created_at ON jobs (status, created_at)'
+    ))
+
+@migration('0005_analysis_cache')
+def analysis_cache(conn, db):
+    create_tables(conn, db, 'counters', 'analysis_cache')
+    # Seed the counters so workers only ever UPDATE them
+    for name in ('analysis_cache.hits', 'analysis_cache.misses', 'analysis_cache.evictions'):
+        conn.execute(text('INSERT INTO counters (name, value) VALUES (:name, 0)'), {'name': name})
+    # TTL expiry and LRU eviction
+    conn.execute(text(
+        'CREATE INDEX IF NOT EXISTS ix_analysis_cache_created_at ON analysis_cache (created_at)'
+    ))
+    conn.execute(text(
+        'CREATE INDEX IF NOT EXISTS ix_analysis_cache_last_used_at ON analysis_cache (last_used_at)'
+    ))
+
+@migration('0006_tasks_version')
+def tasks_version(conn, db):
+    # Bumped by every task write, validates the per-worker response caches
+    conn.execute(text("INSERT INTO counters (name, value) VALUES ('tasks.version', 0)"))
+
+@migration('0007_task_versions', transaction=False)
+def task_versions(conn, db):
+    # count(*) and max(updated_at) per status for list ETags, index-only
+    create_index(conn, 'ix_tasks_status_updated_at', 'tasks (status, updated_at)')
+
+@migration('0008_task_fingerprints', transaction=False)
+def task_fingerprints(conn, db):
+    # Nullable without a default, no table rewrite
+    add_column_if_missing(conn, 'tasks', 'fingerprint', 'VARCHAR(64)')
+    # Re-detecting a stored task is an ON CONFLICT no-op. Tasks detected
+    # before this keep a NULL fingerprint until `flask --app app compact-tasks`
+    create_index(conn, 'ux_tasks_fingerprint', 'tasks (fingerprint) WHERE fingerprint IS NOT NULL', unique=True)
+
+@migration('0009_task_similarity')
+def task_similarity(conn, db):
+    # Primary key (bucket, task_id) serves the lookups
+    create_tables(conn, db, 'task_signatures', 'task_buckets')
+    # Re-indexing and deleting a task
+    conn.execute(text(
+        'CREATE INDEX IF NOT EXISTS ix_task_buckets_task_id ON task_buckets (task_id)'
+    ))
+
+@migration('0010_task_search', transaction=False)
+def task_search(conn, db):
+    # GET /api/tasks/search, the search text is kept in sync by the database
+    if conn.dialect.name == 'postgresql':
+        # Rewrites the table once (locked meanwhile), title words rank above description words
+        conn.execute(text(
+            'ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ('
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B')) STORED"
+        ))
+        create_index(conn, 'ix_tasks_search', 'tasks USING GIN (search_vector)')
+        return
+    
+    # SQLite (local testing): an FTS5 index over the tasks table, kept by triggers
+    conn.execute(text(
+        'CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5('
+        "title, description, content='tasks', content_rowid='id', tokenize='porter unicode61')"
+    ))
+    conn.execute(text(
+        'CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN '
+        'INSERT INTO tasks_fts (rowid, title, description) VALUES (new.id, new.title, new.description); END'
+    ))
+    conn.execute(text(
+        'CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN '
+        "INSERT INTO tasks_fts (tasks_fts, rowid, title, description) "
+        "VALUES ('delete', old.id, old.title, old.description); END"
+    ))
+    conn.execute(text(
+        'CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF title, description ON tasks BEGIN '
+        "INSERT INTO tasks_fts (tasks_fts, rowid, title, description) "
+        "VALUES ('delete', old.id, old.title, old.description); "
+        'INSERT INTO tasks_fts (rowid, title, description) VALUES (new.id, new.title, new.description); END'
+    ))
+    conn.execute(text("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')"))
+
+@migration('0011_tasks_archive')
+def tasks_archive(conn, db):
+    # Primary key serves read-through by id
+    create_tables(conn, db, 'tasks_archive')
+    # Re-detecting an archived task is skipped by fingerprint
+    conn.execute(text(
+        'CREATE INDEX IF NOT EXISTS ix_tasks_archive_fingerprint '
+        'ON tasks_archive (fingerprint) WHERE fingerprint IS NOT NULL'
+    ))
+
+@migration('0012_tombstone_pruning', transaction=False)
+def tombstone_pruning(conn, db):
+    # prune_tombstones finds the old ones by age
+    create_index(conn, 'ix_task_tombstones_deleted_at', 'task_tombstones (deleted_at)')
+    # Highest tombstone id pruned, sync clients behind it start over. Not in a
+    # transaction here, so a retried run mustn't insert it twice
+    conn.execute(text(
+        "INSERT INTO counters (name, value) SELECT 'task_tombstones.pruned', 0 "
+        "WHERE NOT EXISTS (SELECT 1 FROM counters WHERE name = 'task_tombstones.pruned')"
+    ))
+
+@migration('0013_tasks_autoincrement')
+def tasks_autoincrement(conn, db):
+    # SQLite hands out the highest id again once its row is deleted or
+    # archived, AUTOINCREMENT never does. PostgreSQL sequences never reuse ids
+    if conn.dialect.name != 'sqlite':
+        return
+    # SQLite can't alter a primary key: rebuild the table (as of 0008) with
+    # the same rows, then put its indexes and FTS triggers back as they were
+    recreate = conn.execute(text(
+        "SELECT sql FROM sqlite_master WHERE tbl_name = 'tasks' AND type IN ('index', 'trigger') AND sql IS NOT NULL"
+    )).scalars().all()
+    conn.execute(text(
+        'CREATE TABLE tasks_new ('
+        'id INTEGER PRIMARY KEY AUTOINCREMENT, title VARCHAR(500) NOT NULL, description TEXT, '
+        'source VARCHAR(50), url TEXT, priority VARCHAR(20), deadline DATE, status VARCHAR(20), '
+        'jira_key VARCHAR(50), jira_url TEXT, created_at DATETIME, updated_at DATETIME, '
+        'task_metadata JSON, fingerprint VARCHAR(64))'
+    ))
+    columns = ('id, title, description, source, url, priority, deadline, status, '
+               'jira_key, jira_url, created_at, updated_at, task_metadata, fingerprint')
+    # Same rowids, so the tasks_fts index stays valid
+    conn.execute(text(f'INSERT INTO tasks_new ({columns}) SELECT {columns} FROM tasks'))
+    conn.execute(text('DROP TABLE tasks'))
+    conn.execute(text('ALTER TABLE tasks_new RENAME TO tasks'))
+    for sql in recreate:
+        conn.execute(text(sql))
+    # Ids already handed out to archived and deleted tasks aren't reused either
+    conn.execute(text("DELETE FROM sqlite_sequence WHERE name = 'tasks'"))
+    conn.execute(text(
+        "INSERT INTO sqlite_sequence (name, seq) SELECT 'tasks', max("
+        '(SELECT coalesce(max(id), 0) FROM tasks), '
+        '(SELECT coalesce(max(id), 0) FROM tasks_archive), '
+        '(SELECT coalesce(max(task_id), 0) FROM task_tombstones))'
+    ))
+
+# ============================================================
+# Runner
+# ============================================================
+
+def applied_versions(conn):
+    rows = conn.execute(text('SELECT version FROM schema_migrations'))
+    return {row[0] for row in rows}
+
+def record_version(conn, version):
+    conn.execute(
+        text('INSERT INTO schema_migrations (version, applied_at) VALUES (:version, :now)'),
+        {'version': version, 'now': datetime.utcnow()}
+    )
+
+@contextmanager
+def migration_lock(engine):
+    """Advisory lock for a whole run on PostgreSQL, held by its own connection
+    
+    Polled rather than waited for: a session blocked in pg_advisory_lock
+    holds a snapshot, which the lock holder's CREATE INDEX CONCURRENTLY would
+    wait for in turn.
+    """
+    if engine.dialect.name != 'postgresql':
+        yield
+        return
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        while not conn.execute(text('SELECT pg_try_advisory_lock(:id)'), {'id': MIGRATION_LOCK_ID}).scalar():
+            time.sleep(MIGRATION_LOCK_POLL_SECONDS)
+        try:
+            yield
+        finally:
+            conn.execute(text('SELECT pg_advisory_unlock(:id)'), {'id': MIGRATION_LOCK_ID})
+
+def run_migrations(db):
+    """Apply all pending migrations, returns the versions that were applied"""
+    engine = db.engine
+    is_postgres = engine.dialect.name == 'postgresql'
+
+    applied = []
+    with migration_lock(engine):
+        # Under the lock, another process may have just created it or applied some
+        with engine.begin() as conn:
+            conn.execute(text(
+                'CREATE TABLE IF NOT EXISTS schema_migrations ('
+                'version VARCHAR(100) PRIMARY KEY, applied_at TIMESTAMP NOT NULL)'
+            ))
+            done = applied_versions(conn)
+        for version, fn, transaction in sorted(MIGRATIONS, key=lambda m: m[0]):
+            if version in done:
+                continue
+            if transaction or not is_postgres:
+                with engine.begin() as conn:
+                    fn(conn, db)
+                    record_version(conn, version)
+            else:
+                with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+                    fn(conn, db)
+                    record_version(conn, version)
+            applied.append(version)
+
+    return applied
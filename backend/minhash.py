@@ -0,0 +1,91 @@
+"""
+MinHash signatures and LSH banding for near-duplicate task lookup
+
+A task is reduced to the set of content words of its title, plus the start
+of its description when the title is too short to say much on its own
+("Follow up"); whole descriptions would drown the title, since the LLM writes
+a different one on every scan. Its signature keeps, for each of NUM_PERM hash functions,
+the minimum hash over that set; the fraction of equal positions in two
+signatures estimates the Jaccard similarity of the two sets ("Review Q4
+budget" vs "Review the Q4 budget report": 0.75).
+
+The signature is cut into BANDS bands of ROWS values and each band hashed to
+one bucket key. Tasks sharing a bucket are candidates: two tasks with
+similarity s share at least one bucket with probability 1 - (1 - s^ROWS)^BANDS,
+about 0.5 at s = 0.5 and 0.99 at s = 0.8, while unrelated tasks almost never
+do. app.py stores the bucket keys in an indexed side table, so a lookup is
+BANDS index probes plus a comparison with the few candidates, independent of
+the number of tasks.
+"""
+
+from functools import lru_cache
+import hashlib
+import random
+import re
+import struct
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+
+# Titles with fewer content words than this also use the first
+# DESCRIPTION_WORDS words of the description
+MIN_TITLE_WORDS = 3
+DESCRIPTION_WORDS = 20
+
+STOPWORDS = frozenset((
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'into',
+    'is', 'it', 'its', 'of', 'on', 'or', 'our', 'please', 'so', 'that', 'the',
+    'their', 'this', 'to', 'up', 'we', 'with', 'you', 'your'
+))
+
+MERSENNE_PRIME = (1 << 61) - 1
+MASK_32 = (1 << 32) - 1
+
+# Fixed seed: stored signatures must stay comparable across processes and releases
+_random = random.Random(20240601)
+PERMUTATIONS = [
+    (_random.randrange(1, MERSENNE_PRIME), _random.randrange(0, MERSENNE_PRIME))
+    for _ in range(NUM_PERM)
+]
+
+def content_words(text):
+    return {word for word in re.findall(r'\w+', str(text or '').lower()) if word not in STOPWORDS}
+
+def shingles(title, description=''):
+    """Content words of the title, and of the start of the description for short titles"""
+    words = content_words(title)
+    if len(words) < MIN_TITLE_WORDS:
+        words |= content_words(' '.join(str(description or '').split()[:DESCRIPTION_WORDS]))
+    return words
+
+# Task vocabulary is small and repetitive, each word is hashed NUM_PERM times once
+@lru_cache(maxsize=200000)
+def word_hashes(word):
+    """The word's value under each of the NUM_PERM hash functions"""
+    h = int.from_bytes(hashlib.blake2b(word.encode(), digest_size=8).digest(), 'little')
+    return tuple(((a * h + b) % MERSENNE_PRIME) & MASK_32 for a, b in PERMUTATIONS)
+
+def signature(words):
+    """MinHash signature (NUM_PERM 32-bit ints) of a set of words, None if it is empty"""
+    if not words:
+        return None
+    return tuple(map(min, zip(*[word_hashes(word) for word in words])))
+
+def band_keys(sig):
+    """One signed 64-bit bucket key per band"""
+    keys = []
+    for band in range(BANDS):
+        values = struct.pack(f'<H{ROWS}I', band, *sig[band * ROWS:(band + 1) * ROWS])
+        keys.append(int.from_bytes(hashlib.blake2b(values, digest_size=8).digest(), 'little', signed=True))
+    return keys
+
+def similarity(a, b):
+    """Estimated Jaccard similarity of the word sets behind two signatures"""
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+def pack(sig):
+    return struct.pack(f'<{NUM_PERM}I', *sig)
+
+def unpack(data):
+    return struct.unpack(f'<{NUM_PERM}I', data)
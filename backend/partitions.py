@@ -0,0 +1,213 @@
+"""
+Monthly range partitioning of the tasks table on PostgreSQL (optional)
+
+A partitioned tasks table has one partition per month of created_at
+(tasks_pYYYYMM), created ahead of time, plus a default partition that only
+catches rows past the last month. Lists ordered by created_at then read the
+newest partitions first and stop early, and old months are dropped whole
+instead of deleted row by row (no dead tuples to vacuum).
+
+convert_tasks_table() turns the existing table into the first partition,
+tasks_legacy, covering everything before the following months. The rows
+stay where they are: the checks and indexes ATTACH PARTITION needs are
+built without blocking writes first, so the swap itself is quick.
+
+PostgreSQL can't enforce a unique index on a partitioned table unless it
+includes created_at, so the fingerprint of detected tasks (ux_tasks_fingerprint)
+is claimed in task_fingerprints by a trigger instead. An INSERT whose
+fingerprint is taken is skipped, like ON CONFLICT DO NOTHING.
+
+SQLite (local testing) is never partitioned.
+"""
+
+import re
+from datetime import datetime
+
+from sqlalchemy import text
+
+LEGACY_PARTITION = 'tasks_legacy'
+DEFAULT_PARTITION = 'tasks_default'
+
+# Upper bound of a range partition from pg_get_expr(relpartbound)
+UPPER_BOUND = re.compile(r"TO \('([^']+)'\)")
+
+FINGERPRINT_TRIGGERS = [
+    'CREATE TABLE IF NOT EXISTS task_fingerprints (fingerprint VARCHAR(64) PRIMARY KEY)',
+    """
+    CREATE OR REPLACE FUNCTION tasks_claim_fingerprint() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE' AND NEW.fingerprint IS NOT DISTINCT FROM OLD.fingerprint THEN
+            RETURN NEW;
+        END IF;
+        IF NEW.fingerprint IS NOT NULL THEN
+            INSERT INTO task_fingerprints (fingerprint) VALUES (NEW.fingerprint) ON CONFLICT DO NOTHING;
+            IF NOT FOUND THEN
+                IF TG_OP = 'INSERT' THEN
+                    RETURN NULL;
+                END IF;
+                RAISE unique_violation USING MESSAGE = 'duplicate task fingerprint ' || NEW.fingerprint;
+            END IF;
+        END IF;
+        IF TG_OP = 'UPDATE' AND OLD.fingerprint IS NOT NULL THEN
+            DELETE FROM task_fingerprints WHERE fingerprint = OLD.fingerprint;
+        END IF;
+        RETURN NEW;
+    END $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION tasks_release_fingerprint() RETURNS trigger AS $$
+    BEGIN
+        IF OLD.fingerprint IS NOT NULL THEN
+            DELETE FROM task_fingerprints WHERE fingerprint = OLD.fingerprint;
+        END IF;
+        RETURN OLD;
+    END $$ LANGUAGE plpgsql
+    """,
+    'CREATE TRIGGER tasks_claim_fingerprint BEFORE INSERT OR UPDATE OF fingerprint ON tasks '
+    'FOR EACH ROW EXECUTE FUNCTION tasks_claim_fingerprint()',
+    'CREATE TRIGGER tasks_release_fingerprint AFTER DELETE ON tasks '
+    'FOR EACH ROW EXECUTE FUNCTION tasks_release_fingerprint()',
+]
+
+def month_start(value, months=0):
+    """First instant of the month of value, shifted by months"""
+    month = value.year * 12 + value.month - 1 + months
+    return datetime(month // 12, month % 12 + 1, 1)
+
+def is_partitioned(conn):
+    return conn.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('tasks'))"
+    )).scalar()
+
+def list_partitions(conn):
+    """[(name, upper bound or None for the default partition)] of the tasks table, oldest first"""
+    rows = conn.execute(text(
+        'SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) FROM pg_inherits i '
+        "JOIN pg_class c ON c.oid = i.inhrelid WHERE i.inhparent = 'tasks'::regclass"
+    ))
+    partitions = []
+    for name, bound in rows:
+        match = UPPER_BOUND.search(bound)
+        partitions.append((name, datetime.fromisoformat(match.group(1)) if match else None))
+    return sorted(partitions, key=lambda p: (p[1] is None, p[1] or datetime.max))
+
+def create_partitions(conn, until):
+    """
+    Create the monthly partitions missing up to the month of until, returns their names.
+    
+    Rows of those months already in the default partition (maintenance didn't
+    run in time) keep PostgreSQL from creating them: the default partition is
+    detached meanwhile and its rows moved into the new months.
+    """
+    bounds = [upper for _, upper in list_partitions(conn) if upper]
+    start = max(bounds)
+    if start > until:
+        return []
+    months = {'start': start, 'end': month_start(until, 1)}
+    stray = conn.execute(text(
+        f'SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE created_at >= :start AND created_at < :end)'
+    ), months).scalar()
+    if stray:
+        conn.execute(text(f'ALTER TABLE tasks DETACH PARTITION {DEFAULT_PARTITION}'))
+
+    created = []
+    while start <= until:
+        end = month_start(start, 1)
+        name = f'tasks_p{start:%Y%m}'
+        conn.execute(text(
+            f"CREATE TABLE {name} PARTITION OF tasks FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        ))
+        created.append(name)
+        start = end
+
+    if stray:
+        move_default_rows(conn, months)
+        conn.execute(text(f'ALTER TABLE tasks ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT'))
+    return created
+
+def move_default_rows(conn, months):
+    """Move the rows created in [months start, end) from the detached default partition back into tasks"""
+    columns = ', '.join(conn.execute(text(
+        "SELECT column_name FROM information_schema.columns WHERE table_schema = current_schema() "
+        "AND table_name = 'tasks' AND is_generated = 'NEVER' ORDER BY ordinal_position"
+    )).scalars())
+    # Released first, or the claim trigger would skip the rows as duplicates of themselves
+    conn.execute(text(
+        'DELETE FROM task_fingerprints WHERE fingerprint IN '
+        f'(SELECT fingerprint FROM {DEFAULT_PARTITION} WHERE created_at >= :start AND created_at < :end)'
+    ), months)
+    conn.execute(text(
+        f'WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE created_at >= :start AND created_at < :end '
+        f'RETURNING {columns}) INSERT INTO tasks ({columns}) SELECT {columns} FROM moved'
+    ), months)
+
+def expired_partitions(conn, cutoff):
+    """Names of the range partitions holding only rows created before cutoff"""
+    return [name for name, upper in list_partitions(conn) if upper and upper <= cutoff]
+
+def prepare_conversion(engine, boundary):
+    """
+    Non-blocking groundwork on the unpartitioned table, in autocommit:
+    created_at filled in and checked against boundary, and the (id, created_at)
+    unique index the partitioned primary key attaches to.
+    """
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        conn.execute(text('UPDATE tasks SET created_at = coalesce(updated_at, now()) WHERE created_at IS NULL'))
+        conn.execute(text('ALTER TABLE tasks DROP CONSTRAINT IF EXISTS tasks_legacy_bound'))
+        # NOT VALID then VALIDATE only holds a lock that lets writes through,
+        # and lets ATTACH PARTITION skip its own scan
+        conn.execute(text(
+            'ALTER TABLE tasks ADD CONSTRAINT tasks_legacy_bound '
+            f"CHECK (created_at IS NOT NULL AND created_at < '{boundary.isoformat()}') NOT VALID"
+        ))
+        conn.execute(text('ALTER TABLE tasks VALIDATE CONSTRAINT tasks_legacy_bound'))
+        conn.execute(text(
+            'CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS tasks_legacy_id_created_at ON tasks (id, created_at)'
+        ))
+
+def convert_tasks_table(conn, boundary, until):
+    """
+    Swap the prepared tasks table for a partitioned one, in conn's transaction:
+    the old table becomes tasks_legacy (rows created before boundary), monthly
+    partitions follow up to until. Index definitions are copied from the old table.
+    """
+    index_defs = conn.execute(text(
+        "SELECT indexname, indexdef FROM pg_indexes WHERE schemaname = current_schema() AND tablename = 'tasks'"
+    )).all()
+    conn.execute(text('LOCK TABLE tasks IN ACCESS EXCLUSIVE MODE'))
+    conn.execute(text(f'ALTER TABLE tasks RENAME TO {LEGACY_PARTITION}'))
+    for name, _ in index_defs:
+        if name != 'tasks_legacy_id_created_at':
+            conn.execute(text(f'ALTER INDEX {name} RENAME TO {name}_legacy'))
+
+    conn.execute(text(
+        f'CREATE TABLE tasks (LIKE {LEGACY_PARTITION} INCLUDING DEFAULTS INCLUDING GENERATED) '
+        'PARTITION BY RANGE (created_at)'
+    ))
+    conn.execute(text('ALTER SEQUENCE tasks_id_seq OWNED BY tasks.id'))
+    conn.execute(text('ALTER TABLE tasks ADD PRIMARY KEY (id, created_at)'))
+    # Unique indexes can't be partitioned without created_at, the fingerprint one is a trigger
+    for _, definition in index_defs:
+        if not definition.startswith('CREATE UNIQUE'):
+            conn.execute(text(definition))
+    for statement in FINGERPRINT_TRIGGERS:
+        conn.execute(text(statement))
+    conn.execute(text(
+        'INSERT INTO task_fingerprints (fingerprint) '
+        f'SELECT fingerprint FROM {LEGACY_PARTITION} WHERE fingerprint IS NOT NULL ON CONFLICT DO NOTHING'
+    ))
+
+    # Proven by tasks_legacy_bound, no scan
+    conn.execute(text(f'ALTER TABLE {LEGACY_PARTITION} ALTER COLUMN created_at SET NOT NULL'))
+    # The prepared index becomes the primary key ATTACH matches, instead of building one under the lock
+    conn.execute(text(f'ALTER TABLE {LEGACY_PARTITION} DROP CONSTRAINT tasks_pkey_legacy'))
+    conn.execute(text(
+        f'ALTER TABLE {LEGACY_PARTITION} ADD CONSTRAINT tasks_legacy_pkey PRIMARY KEY USING INDEX tasks_legacy_id_created_at'
+    ))
+    conn.execute(text(
+        f'ALTER TABLE tasks ATTACH PARTITION {LEGACY_PARTITION} '
+        f"FOR VALUES FROM (MINVALUE) TO ('{boundary.isoformat()}')"
+    ))
+    conn.execute(text(f'ALTER TABLE {LEGACY_PARTITION} DROP CONSTRAINT tasks_legacy_bound'))
+    conn.execute(text(f'CREATE TABLE {DEFAULT_PARTITION} PARTITION OF tasks DEFAULT'))
+    return create_partitions(conn, until)
@@ -0,0 +1,54 @@
+"""
+In-process LRU for GET responses of the task endpoints
+
+Entries are stored under the data version they were computed at. The version
+is a counter in the database (counters.'tasks.version') that every task
+write bumps in its own transaction, so each gunicorn worker keeps its own
+LRU and still never serves a response older than the last committed write:
+a request reads the current version first and only a matching entry is used.
+"""
+
+from collections import OrderedDict
+import threading
+
+class ResponseCache:
+    """Thread-safe LRU of key -> value, valid for one data version at a time"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def advance(self, version):
+        """Drop everything older than version, returns False if version is already stale"""
+        if self.version is None or version > self.version:
+            self.entries.clear()
+            self.version = version
+        return version == self.version
+
+    def get(self, key, version):
+        with self.lock:
+            if self.advance(version) and key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, version, value):
+        with self.lock:
+            # A request that read an older version may finish after a newer one
+            if self.max_entries <= 0 or not self.advance(version):
+                return
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.version = None
@@ -32,6 +32,10 @@ if not exist ".env" (
     echo Please edit .env with your database URL
 )
 
+REM Apply pending migrations
+echo Migrating database...
+flask --app app migrate
+
 REM Run the application
 echo.
 echo Starting Flask server on http://localhost:5000
@@ -44,6 +44,10 @@ if [ ! -f ".env" ]; then
     echo "✏️  Please edit .env with your database URL"
 fi
 
+# Apply pending migrations
+echo "🗄️  Migrating database..."
+flask --app app migrate
+
 # Run the application
 echo ""
 echo "✅ Starting Flask server on http://localhost:5000"
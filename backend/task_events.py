@@ -0,0 +1,102 @@
+"""
+Wake-ups for streams waiting on task changes (GET /api/tasks/events and the
+/api/tasks/counts long-poll)
+
+app.py calls TaskNotifier.notify() after every commit that wrote tasks, which
+wakes the waiting streams of that process right away. On PostgreSQL the
+writer also sends NOTIFY task_changes inside its transaction (delivered only
+if it commits), and one listener thread per process LISTENs on a dedicated
+connection and calls notify() in turn, so a write in any gunicorn worker
+reaches the streams of every worker. SQLite has no such channel: streams in
+other processes pick a write up at their next heartbeat instead.
+"""
+
+import asyncio
+import os
+import select
+import threading
+import time
+
+# Postgres NOTIFY channel for task writes
+CHANNEL = 'task_changes'
+
+# Seconds between reconnect attempts of the LISTEN connection
+LISTEN_RETRY_SECONDS = 5
+
+class TaskNotifier:
+    """Generation counter that threads and asyncio tasks can wait on"""
+
+    def __init__(self):
+        self.generation = 0
+        self.condition = threading.Condition()
+        self.async_waiters = set()
+        self.listener_pid = None
+
+    def notify(self):
+        with self.condition:
+            self.generation += 1
+            self.condition.notify_all()
+            waiters = list(self.async_waiters)
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # Loop already closed
+                pass
+
+    def wait(self, generation, timeout):
+        """Block until notify() moves past generation or timeout, returns the current generation"""
+        with self.condition:
+            self.condition.wait_for(lambda: self.generation != generation, timeout)
+            return self.generation
+
+    async def wait_async(self, generation, timeout):
+        """wait() for asyncio code"""
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self.condition:
+            if self.generation != generation:
+                return self.generation
+            self.async_waiters.add(waiter)
+        try:
+            await asyncio.wait_for(waiter[1].wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self.condition:
+                self.async_waiters.discard(waiter)
+        return self.generation
+
+    def listen(self, connect):
+        """Start the LISTEN thread of this process, connect() returns a new psycopg2 connection"""
+        with self.condition:
+            # A forked worker does not inherit the parent's thread
+            if self.listener_pid == os.getpid():
+                return
+            self.listener_pid = os.getpid()
+        threading.Thread(target=self.listen_forever, args=(connect,), daemon=True).start()
+
+    def listen_forever(self, connect):
+        while True:
+            conn = None
+            try:
+                conn = connect()
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    cursor.execute(f'LISTEN {CHANNEL}')
+                # Writes made while no connection was listening
+                self.notify()
+                while True:
+                    readable, _, _ = select.select([conn], [], [], 60)
+                    if readable:
+                        conn.poll()
+                        if conn.notifies:
+                            conn.notifies.clear()
+                            self.notify()
+            except Exception as e:
+                print(f"Task change listener error: {e}")
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+                time.sleep(LISTEN_RETRY_SECONDS)
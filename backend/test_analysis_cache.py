@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared analysis cache (cached_analysis, store_analysis)
+Checks lookups don't write the shared counters, their counts still reach
+GET /api/analyze-cache/stats, and entries are evicted by housekeeping
+rather than on every insert.
+
+Run with: python test_analysis_cache.py  (or pytest test_analysis_cache.py)
+"""
+
+from sqlalchemy import event
+
+import test_setup
+
+import app as backend
+from app import (app, db, AnalysisCacheEntry, cached_analysis, evict_analysis_cache,
+                 flush_analysis_cache_stats, store_analysis)
+
+test_setup.migrate()
+
+client = app.test_client()
+
+TASKS = [{'title': 'Renew the cache certificate', 'priority': 'high'}]
+
+def stats():
+    return client.get('/api/analyze-cache/stats').get_json()
+
+def test_lookups_write_nothing():
+    print("\n🔍 Testing cache lookups...")
+    with app.app_context():
+        store_analysis('Please renew the cache certificate', 'web', TASKS)
+        flush_analysis_cache_stats()
+        before = stats()
+
+        writes = []
+        def count_writes(conn, cursor, statement, *args):
+            if not statement.lstrip().upper().startswith('SELECT'):
+                writes.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', count_writes)
+        try:
+            for _ in range(5):
+                assert cached_analysis('please   RENEW the cache certificate', 'web') == TASKS
+            assert cached_analysis('Something never analyzed', 'web') is None
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', count_writes)
+        assert writes == [], writes
+
+    after = stats()
+    assert after['hits'] - before['hits'] == 5
+    assert after['misses'] - before['misses'] == 1
+    print("✅ Hits and misses counted per process, flushed with the stats")
+
+def test_housekeeping_evicts():
+    print("\n🔍 Testing eviction...")
+    backend.ANALYSIS_CACHE_MAX_ENTRIES = 2
+    try:
+        with app.app_context():
+            for i in range(4):
+                store_analysis(f'Cached message number {i}', 'web', TASKS)
+            # Inserts don't evict
+            assert db.session.query(AnalysisCacheEntry).count() >= 4
+            evict_analysis_cache()
+            assert db.session.query(AnalysisCacheEntry).count() == 2
+    finally:
+        backend.ANALYSIS_CACHE_MAX_ENTRIES = 10000
+    print("✅ Trimmed to the size limit by housekeeping")
+
+if __name__ == '__main__':
+    test_lookups_write_nothing()
+    test_housekeeping_evicts()
+    print("\n✅ All analysis cache tests passed!")
@@ -6,6 +6,7 @@ Run this after deploying to verify all endpoints work correctly
 
 import requests
 import json
+import time
 from datetime import datetime, timedelta
 
 # Update this with your Render backend URL
@@ -66,6 +67,186 @@ def test_get_tasks():
     print("✅ Get tasks passed")
     return tasks
 
+def test_pagination():
+    """Test keyset pagination and field projection"""
+    print("\n🔍 Testing task pagination...")
+    
+    task_ids = [test_create_task() for _ in range(3)]
+    
+    response = requests.get(f"{BACKEND_URL}/api/tasks?limit=2&fields=id,title")
+    print(f"Status: {response.status_code}")
+    assert response.status_code == 200
+    first_page = response.json()
+    assert len(first_page) == 2
+    assert set(first_page[0].keys()) == {'id', 'title'}
+    
+    cursor = response.headers.get('X-Next-Cursor')
+    print(f"Next cursor: {cursor}")
+    assert cursor
+    
+    response = requests.get(f"{BACKEND_URL}/api/tasks", params={'limit': 2, 'cursor': cursor})
+    assert response.status_code == 200
+    second_page = response.json()
+    assert not {t['id'] for t in first_page} & {t['id'] for t in second_page}
+    
+    response = requests.get(f"{BACKEND_URL}/api/tasks?fields=unknown")
+    assert response.status_code == 400
+    
+    for limit in ('abc', '0', '-5'):
+        response = requests.get(f"{BACKEND_URL}/api/tasks", params={'limit': limit})
+        assert response.status_code == 400
+    
+    for task_id in task_ids:
+        test_delete_task(task_id)
+    
+    print("✅ Pagination passed")
+
+def test_bulk_create():
+    """Test bulk task creation with per-item results"""
+    print("\n🔍 Testing bulk task creation...")
+    
+    tasks = [
+        {"title": "Bulk task 1", "priority": "high"},
+        {"title": "Bulk task 2", "deadline": "2026-01-31"},
+        {"title": "Bad priority", "priority": "urgent"},
+        {"title": "Bad description", "description": {"text": "object"}},
+        {"title": "Bad source", "source": ["web"]},
+        {"title": "Bad URL", "url": 42},
+        {"title": "Long source", "source": "s" * 51},
+    ]
+    response = requests.post(f"{BACKEND_URL}/api/tasks/bulk", json=tasks)
+    print(f"Status: {response.status_code}")
+    print(f"Response: {json.dumps(response.json(), indent=2)}")
+    assert response.status_code == 201
+    
+    result = response.json()
+    assert result['created'] == 2
+    assert result['failed'] == 5
+    assert all(item['status'] == 'error' for item in result['results'][2:])
+    
+    ndjson = '\n'.join(json.dumps({"title": f"NDJSON task {i}"}) for i in range(2))
+    response = requests.post(
+        f"{BACKEND_URL}/api/tasks/bulk",
+        data=ndjson,
+        headers={"Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 201
+    assert response.json()['created'] == 2
+    
+    for item in result['results'] + response.json()['results']:
+        if item['status'] == 'created':
+            test_delete_task(item['id'])
+    
+    print("✅ Bulk creation passed")
+
+def test_export_tasks():
+    """Test streaming NDJSON and CSV export"""
+    print("\n🔍 Testing task export...")
+    task_id = test_create_task()
+    
+    response = requests.get(f"{BACKEND_URL}/api/tasks/export?format=ndjson", stream=True)
+    print(f"Status: {response.status_code}")
+    assert response.status_code == 200
+    ids = [json.loads(line)['id'] for line in response.iter_lines() if line]
+    assert task_id in ids
+    
+    response = requests.get(f"{BACKEND_URL}/api/tasks/export?format=csv&status=pending")
+    assert response.status_code == 200
+    assert response.text.startswith('id,title,description')
+    
+    response = requests.get(f"{BACKEND_URL}/api/tasks/export?updated_since=2999-01-01T00:00:00Z")
+    assert response.status_code == 200
+    assert response.text == ''
+    
+    test_delete_task(task_id)
+    print("✅ Export passed")
+
+def test_task_changes():
+    """Test delta sync with watermarks and tombstones"""
+    print("\n🔍 Testing task changes feed...")
+    
+    # Drain the feed to get a current watermark
+    since = None
+    while True:
+        params = {'since': since} if since else {}
+        response = requests.get(f"{BACKEND_URL}/api/tasks/changes", params=params)
+        assert response.status_code == 200
+        changes = response.json()
+        since = changes['next']
+        if not changes['hasMore']:
+            break
+    
+    task_id = test_create_task()
+    deleted_id = test_create_task()
+    test_delete_task(deleted_id)
+    
+    response = requests.get(f"{BACKEND_URL}/api/tasks/changes", params={'since': since})
+    print(f"Status: {response.status_code}")
+    changes = response.json()
+    print(f"Changed: {[t['id'] for t in changes['tasks']]}, deleted: {changes['deleted']}")
+    assert task_id in [t['id'] for t in changes['tasks']]
+    assert deleted_id in changes['deleted']
+    
+    response = requests.get(f"{BACKEND_URL}/api/tasks/changes?since=not-a-token")
+    assert response.status_code == 400
+    
+    test_delete_task(task_id)
+    print("✅ Task changes passed")
+
+def test_analyze_job():
+    """Test async task analysis through the job queue"""
+    print("\n🔍 Testing async task analysis...")
+    
+    text = ("Hi team, please review the quarterly budget report before Friday. "
+            "We also need to schedule the offsite planning meeting next week.")
+    response = requests.post(f"{BACKEND_URL}/api/analyze-tasks", json={"text": text, "async": True})
+    print(f"Status: {response.status_code}")
+    assert response.status_code == 202
+    job_id = response.json()['jobId']
+    
+    for _ in range(60):
+        response = requests.get(f"{BACKEND_URL}/api/analyze-jobs/{job_id}")
+        assert response.status_code == 200
+        job = response.json()
+        if job['status'] in ('done', 'failed'):
+            break
+        time.sleep(1)
+    
+    print(f"Job status: {job['status']}, tasks: {job['count']}")
+    assert job['status'] == 'done'
+    
+    for task in job['tasks']:
+        test_delete_task(task['id'])
+    print("✅ Async analysis passed")
+
+def test_analyze_bulk():
+    """Test analyzing several messages in one request"""
+    print("\n🔍 Testing bulk task analysis...")
+    
+    messages = [{
+        "id": f"msg-{i}",
+        "text": f"Hi team, please send the signed vendor contract {i} to legal before Friday. "
+                f"We also need to update the onboarding checklist for the new hires."
+    } for i in range(3)]
+    response = requests.post(f"{BACKEND_URL}/api/analyze-tasks/bulk", json={"messages": messages})
+    print(f"Status: {response.status_code}")
+    assert response.status_code == 200
+    data = response.json()
+    print(f"LLM calls: {data['llmCalls']}")
+    assert [r['id'] for r in data['results']] == ["msg-0", "msg-1", "msg-2"]
+    
+    for result in data['results']:
+        for task in result['tasks']:
+            test_delete_task(task['id'])
+    
+    # Wrongly typed fields are rejected, not a 500
+    for message in ({"text": 42}, {"text": "x" * 60, "metadata": "urgent"}, "just text"):
+        response = requests.post(f"{BACKEND_URL}/api/analyze-tasks/bulk", json={"messages": [message]})
+        assert response.status_code == 400, response.text
+    response = requests.post(f"{BACKEND_URL}/api/analyze-tasks/bulk", json=messages)
+    assert response.status_code == 400, response.text
+    print("✅ Bulk analysis passed")
+
 def test_get_single_task(task_id):
     """Test getting a single task"""
     print(f"\n🔍 Testing get single task (ID: {task_id})...")
@@ -178,6 +359,12 @@ def run_all_tests():
         
         # Filtering
         test_filter_tasks()
+        test_pagination()
+        test_bulk_create()
+        test_export_tasks()
+        test_task_changes()
+        test_analyze_job()
+        test_analyze_bulk()
         
         # Cleanup
         test_delete_task(task_id)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Tests for the ASGI entry point (asgi.py)
+Checks the async task list, detected list and analyze handlers answer like
+their Flask versions, and that every other route still works through the
+mounted Flask app.
+
+Run with: python test_asgi.py  (or pytest test_asgi.py)
+"""
+
+import os
+
+import test_setup
+
+# Keyword detection, so the test doesn't need Groq
+os.environ.pop('GROQ_API_KEY', None)
+
+from starlette.testclient import TestClient
+
+import asgi
+from app import app
+
+test_setup.migrate()
+
+client = app.test_client()
+
+TEXT = ("Hi team, please prepare the migration runbook before the release on Thursday. "
+        "We also need to book the rollback rehearsal with the platform team.")
+
+def setup_module():
+    for i in range(5):
+        client.post('/api/tasks', json={'title': f'ASGI task {i}', 'priority': 'high'})
+
+def test_task_lists_match_flask():
+    print("\n🔍 Testing async task lists...")
+    with TestClient(asgi.app) as asgi_client:
+        for url in ('/api/tasks', '/api/tasks?limit=2', '/api/tasks?status=pending&fields=id,title',
+                    '/api/tasks/detected'):
+            response = asgi_client.get(url, headers={'Accept-Encoding': 'identity'})
+            expected = client.get(url)
+            assert response.status_code == 200, url
+            assert response.json() == expected.get_json(), url
+            assert response.headers['ETag'] == expected.headers['ETag'], url
+
+        page = asgi_client.get('/api/tasks?limit=2')
+        cursor = page.headers['X-Next-Cursor']
+        assert asgi_client.get(f'/api/tasks?limit=2&cursor={cursor}').json() == \
+            client.get(f'/api/tasks?limit=2&cursor={cursor}').get_json()
+        assert asgi_client.get('/api/tasks?limit=2', headers={'If-None-Match': page.headers['ETag']}).status_code == 304
+        assert asgi_client.get('/api/tasks?limit=abc').status_code == 400
+    print("✅ Same bodies, cursors and ETags as Flask")
+
+def test_analyze():
+    print("\n🔍 Testing async analysis...")
+    with TestClient(asgi.app) as asgi_client:
+        assert asgi_client.post('/api/analyze-tasks', json={'text': 'too short'}).json() == {'tasks': []}
+
+        body = {'text': TEXT, 'url': 'https://mail.example.com/#inbox/asgi'}
+        first = asgi_client.post('/api/analyze-tasks', json=body).json()
+        assert first['count'] > 0
+        for task in first['tasks']:
+            assert client.get(f"/api/tasks/{task['id']}").get_json()['title'] == task['title']
+        # Same email again: stored already
+        assert asgi_client.post('/api/analyze-tasks', json=body).json()['count'] == 0
+    print("✅ Tasks detected and stored once")
+
+def test_flask_routes_mounted():
+    print("\n🔍 Testing mounted Flask routes...")
+    with TestClient(asgi.app) as asgi_client:
+        # Clients long-poll and stream only where it's cheap
+        assert asgi_client.get('/health').json()['streaming'] is True
+
+        created = asgi_client.post('/api/tasks', json={'title': 'Created through the mount'})
+        assert created.status_code == 201
+        task_id = created.json()['id']
+        assert asgi_client.get(f'/api/tasks/{task_id}').json()['title'] == 'Created through the mount'
+        assert asgi_client.delete(f'/api/tasks/{task_id}').status_code == 200
+        assert asgi_client.get(f'/api/tasks/{task_id}').status_code == 404
+    print("✅ Other routes served by Flask")
+
+if __name__ == '__main__':
+    setup_module()
+    test_task_lists_match_flask()
+    test_analyze()
+    test_flask_routes_mounted()
+    print("\n✅ All ASGI tests passed!")
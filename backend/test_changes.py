@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests for the delta sync feed (GET /api/tasks/changes)
+Checks a first sync starts at the newest delete, deletes come in pages, and
+clients behind pruned tombstones are told to start over.
+
+Run with: python test_changes.py  (or pytest test_changes.py)
+"""
+
+from datetime import datetime, timedelta
+
+import test_setup
+
+from app import app, db, Task, TaskTombstone, changes_head, prune_tombstones
+
+test_setup.migrate()
+
+client = app.test_client()
+
+def add_tasks(*tasks):
+    with app.app_context():
+        db.session.add_all(tasks)
+        db.session.commit()
+        return [task.id for task in tasks]
+
+def changes(since=None, limit=None):
+    params = {key: value for key, value in (('since', since), ('limit', limit)) if value}
+    response = client.get('/api/tasks/changes', query_string=params)
+    assert response.status_code == 200
+    return response.get_json()
+
+def test_first_sync_skips_old_deletes():
+    print("\n🔍 Testing a first sync...")
+    kept, deleted = add_tasks(Task(title='Changes kept'), Task(title='Changes deleted'))
+    assert client.delete(f'/api/tasks/{deleted}').status_code == 200
+
+    ids, deletes, since = set(), [], None
+    while True:
+        page = changes(since, limit=1000)
+        ids.update(task['id'] for task in page['tasks'])
+        deletes += page['deleted']
+        since = page['next']
+        if not page['hasMore']:
+            break
+    assert kept in ids and deleted not in ids
+    assert deletes == [] and not page['reset']
+
+    assert client.delete(f'/api/tasks/{kept}').status_code == 200
+    assert changes(since)['deleted'] == [kept]
+    print("✅ Current tasks only, deletes from then on")
+
+def test_deletes_are_paged():
+    print("\n🔍 Testing delete pages...")
+    ids = add_tasks(*[Task(title=f'Changes paged {i}') for i in range(5)])
+    with app.app_context():
+        since = changes_head()
+    for task_id in ids:
+        assert client.delete(f'/api/tasks/{task_id}').status_code == 200
+
+    pages = []
+    while True:
+        page = changes(since, limit=2)
+        pages.append(page)
+        since = page['next']
+        if not page['hasMore']:
+            break
+    assert [page['deleted'] for page in pages[:2]] == [ids[:2], ids[2:4]]
+    assert all(page['tasks'] == [] for page in pages[:2])
+    assert sum((page['deleted'] for page in pages), []) == ids
+    print("✅ Deletes in pages of limit, tasks after them")
+
+def test_pruned_tombstones_reset():
+    print("\n🔍 Testing pruning...")
+    pruned, old, current = add_tasks(*[Task(title=f'Changes pruned {i}') for i in range(3)])
+    with app.app_context():
+        behind = changes_head()
+    for task_id in (pruned, old):
+        assert client.delete(f'/api/tasks/{task_id}').status_code == 200
+    with app.app_context():
+        db.session.query(TaskTombstone).filter(TaskTombstone.task_id.in_([pruned, old])) \
+            .update({'deleted_at': datetime.utcnow() - timedelta(days=400)})
+        db.session.commit()
+        assert prune_tombstones() >= 1
+        # The newest old one is kept
+        remaining = {t.task_id for t in db.session.query(TaskTombstone).filter(TaskTombstone.task_id.in_([pruned, old]))}
+        assert remaining == {old}
+        caught_up = changes_head()
+
+    page = changes(behind, limit=1000)
+    assert page['reset'] and page['deleted'] == []
+    assert current in {task['id'] for task in page['tasks']}
+    # Clients past the pruned ones carry on
+    assert not changes(caught_up)['reset']
+    print("✅ Clients behind the pruned deletes start over")
+
+if __name__ == '__main__':
+    test_first_sync_skips_old_deletes()
+    test_deletes_are_paged()
+    test_pruned_tombstones_reset()
+    print("\n✅ All changes feed tests passed!")
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests for chunked analysis of long messages (llm.py)
+Checks chunks cover the whole text with overlap, prefer message and
+paragraph boundaries, and that tasks are merged across chunks.
+Run with: python test_chunking.py  (or pytest test_chunking.py)
+"""
+
+import random
+
+from llm import chunk_text, merge_tasks, MAX_MESSAGE_CHARS, CHUNK_OVERLAP
+
+def random_thread(size, seed=0):
+    rng = random.Random(seed)
+    words = ['budget', 'review', 'meeting', 'the', 'a', 'report.', 'Friday!', 'team,', 'x' * 40]
+    parts = []
+    while sum(len(p) for p in parts) < size:
+        choice = rng.random()
+        if choice < 0.05:
+            parts.append('\n\nOn Tue, Alice wrote:\n')
+        elif choice < 0.1:
+            parts.append('\n')
+        else:
+            parts.append(rng.choice(words) + ' ')
+    return ''.join(parts)
+
+def test_chunks_cover_text():
+    """Every character is in some chunk, chunks are in order and overlap"""
+    print("\n🔍 Testing chunks cover the text...")
+    for seed in range(20):
+        text = random_thread(30000, seed)
+        chunks = list(chunk_text(text))
+        assert all(len(chunk) <= MAX_MESSAGE_CHARS for chunk in chunks)
+        
+        end = 0
+        for chunk in chunks:
+            start = text.find(chunk, max(0, end - CHUNK_OVERLAP))
+            assert start != -1 and start <= end, f"Gap before chunk at {end} (seed {seed})"
+            end = start + len(chunk)
+        assert end == len(text)
+    print("✅ Chunks cover the text")
+
+def test_short_text_is_one_chunk():
+    print("\n🔍 Testing short text...")
+    assert list(chunk_text('Please review the report.')) == ['Please review the report.']
+    assert list(chunk_text('')) == ['']
+    print("✅ Short text is one chunk")
+
+def test_splits_on_boundaries():
+    """Quoted messages beat paragraphs, paragraphs beat sentences"""
+    print("\n🔍 Testing split boundaries...")
+    sentence = 'We went through the quarterly plan in detail. '
+    first = sentence * 30
+    text = first + '\nOn Tue, Bob wrote:\n' + sentence * 10 + '\n\n' + sentence * 40
+    chunks = list(chunk_text(text))
+    assert chunks[0] == first + '\n'
+    
+    text = sentence * 35 + '\n\n' + sentence * 60
+    chunks = list(chunk_text(text))
+    assert chunks[0] == sentence * 35 + '\n\n'
+    
+    # No boundary at all still yields bounded chunks
+    chunks = list(chunk_text('x' * 5000))
+    assert ''.join(chunks[:1]) == 'x' * MAX_MESSAGE_CHARS
+    print("✅ Splits on boundaries")
+
+def test_merge_dedupes_by_title():
+    print("\n🔍 Testing task merge...")
+    tasks = merge_tasks([
+        [{'title': 'Review the Q4 budget', 'priority': 'medium', 'deadline': None}],
+        [
+            {'title': 'review the  Q4 budget.', 'priority': 'high', 'deadline': '2026-01-24'},
+            {'title': 'Book the offsite venue', 'priority': 'low', 'deadline': None},
+            'not a task',
+            {'title': ''},
+        ],
+    ])
+    assert tasks == [
+        {'title': 'Review the Q4 budget', 'priority': 'high', 'deadline': '2026-01-24'},
+        {'title': 'Book the offsite venue', 'priority': 'low', 'deadline': None},
+    ]
+    print("✅ Tasks merged")
+
+if __name__ == '__main__':
+    test_chunks_cover_text()
+    test_short_text_is_one_chunk()
+    test_splits_on_boundaries()
+    test_merge_dedupes_by_title()
+    print("\n✅ All chunking tests passed!")
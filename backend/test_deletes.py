@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Tests for deleting tasks (DELETE /api/tasks/:id, DELETE /api/tasks)
+Checks single deletes report missing tasks, filtered deletes run as jobs in
+batches with progress, and clearing everything empties tasks and the archive.
+
+Run with: python test_deletes.py  (or pytest test_deletes.py)
+"""
+
+import time
+from datetime import datetime, timedelta
+
+import test_setup
+
+import app as backend
+from app import app, db, Task, TaskArchive, delete_tasks, changes_head
+
+test_setup.migrate()
+
+client = app.test_client()
+
+LONG_AGO = datetime.utcnow() - timedelta(days=400)
+
+def add_tasks(*tasks):
+    with app.app_context():
+        db.session.add_all(tasks)
+        db.session.commit()
+        return [task.id for task in tasks]
+
+def wait_for_job(job_id):
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        job = client.get(f'/api/delete-jobs/{job_id}').get_json()
+        if job['status'] in ('done', 'failed'):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f'Job {job_id} still {job["status"]}')
+
+def test_delete_single_task():
+    print("\n🔍 Testing single deletes...")
+    task_id, = add_tasks(Task(title='Delete me', source='delete-single'))
+    with app.app_context():
+        archived = TaskArchive(id=1 << 30, title='Delete me too', archived_at=datetime.utcnow())
+        db.session.add(archived)
+        db.session.commit()
+        since = changes_head()
+
+    assert client.delete(f'/api/tasks/{task_id}').get_json() == {'success': True}
+    assert client.delete(f'/api/tasks/{(1 << 30) - 1}').status_code == 404
+    assert task_id in client.get(f'/api/tasks/changes?since={since}').get_json()['deleted']
+    assert client.delete(f'/api/tasks/{1 << 30}').status_code == 200
+    with app.app_context():
+        assert db.session.get(Task, task_id) is None and db.session.get(TaskArchive, 1 << 30) is None
+    print("✅ Deleted in one statement, 404 when missing")
+
+def test_filtered_delete_job():
+    print("\n🔍 Testing filtered delete jobs...")
+    declined = add_tasks(*[Task(title=f'Declined {i}', source='delete-job', status='declined') for i in range(5)])
+    kept = add_tasks(
+        Task(title='Pending', source='delete-job', status='pending'),
+        Task(title='Declined elsewhere', source='delete-other', status='declined'),
+    )
+    assert client.delete('/api/tasks?stauts=declined').status_code == 400
+    assert client.delete('/api/tasks?status=gone').status_code == 400
+
+    backend.DELETE_BATCH_SIZE = 2
+    try:
+        response = client.delete('/api/tasks?status=declined&source=delete-job')
+        assert response.status_code == 202
+        job = wait_for_job(response.get_json()['jobId'])
+    finally:
+        backend.DELETE_BATCH_SIZE = 5000
+    assert job['status'] == 'done', job
+    assert job['matched'] == job['deleted'] == 5
+    assert job['filters'] == {'status': 'declined', 'source': 'delete-job'}
+    with app.app_context():
+        assert Task.query.filter(Task.id.in_(declined)).count() == 0
+        assert Task.query.filter(Task.id.in_(kept)).count() == 2
+    print("✅ Matching tasks deleted in the background")
+
+def test_delete_progress_and_age():
+    print("\n🔍 Testing progress and age filter...")
+    old = add_tasks(*[Task(title=f'Old {i}', source='delete-age', created_at=LONG_AGO) for i in range(3)])
+    new, = add_tasks(Task(title='New', source='delete-age'))
+    with app.app_context():
+        db.session.add(TaskArchive(id=(1 << 30) + 1, title='Old archived', source='delete-age',
+                                   created_at=LONG_AGO, archived_at=datetime.utcnow()))
+        db.session.commit()
+
+        reports = []
+        backend.DELETE_BATCH_SIZE = 2
+        try:
+            result = delete_tasks({'source': 'delete-age', 'olderThanDays': 30}, progress=reports.append)
+        finally:
+            backend.DELETE_BATCH_SIZE = 5000
+        assert result == {'matched': 4, 'deleted': 4}
+        # Two task batches, then the archive
+        assert [report['deleted'] for report in reports] == [2, 3, 4]
+        assert Task.query.filter(Task.id.in_(old)).count() == 0 and db.session.get(Task, new)
+    print("✅ Batches report progress, newer tasks kept")
+
+def test_clear_all_tasks():
+    print("\n🔍 Testing clear all...")
+    add_tasks(Task(title='Cleared', status='sent'))
+    with app.app_context():
+        db.session.add(TaskArchive(id=(1 << 30) + 2, title='Cleared archived', archived_at=datetime.utcnow()))
+        db.session.commit()
+
+    assert client.delete('/api/tasks').get_json() == {'success': True}
+    assert client.get('/api/tasks/counts').get_json()['total'] == 0
+    with app.app_context():
+        assert TaskArchive.query.count() == 0
+    print("✅ Tasks and archive cleared")
+
+if __name__ == '__main__':
+    test_delete_single_task()
+    test_filtered_delete_job()
+    test_delete_progress_and_age()
+    test_clear_all_tasks()
+    print("\n✅ All delete tests passed!")
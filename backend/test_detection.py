@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for keyword task detection (detection.py)
+Checks the precompiled detector returns exactly what the original
+ten-pass re.finditer implementation returned.
+Run with: python test_detection.py  (or pytest test_detection.py)
+"""
+
+import json
+import os
+import random
+import re
+import tempfile
+
+from detection import DEFAULT_PATTERNS, load_detector
+
+def detect_tasks_reference(text):
+    """The original detect_tasks_simple, one re.finditer scan per pattern"""
+    tasks = []
+    patterns = [(pattern, priority) for _, pattern, priority in DEFAULT_PATTERNS]
+    seen_tasks = set()
+    
+    for pattern, priority in patterns:
+        for match in re.finditer(pattern, text, re.IGNORECASE):
+            action = match.group(1).strip()
+            if len(action) < 10 or action.lower() in seen_tasks:
+                continue
+            seen_tasks.add(action.lower())
+            start = max(0, match.start() - 100)
+            end = min(len(text), match.end() + 150)
+            context = text[start:end].strip()
+            title = action[:60].strip()
+            if not title[0].isupper():
+                title = title[0].upper() + title[1:]
+            description = context[:300].strip()
+            if len(context) > 300:
+                description += '...'
+            tasks.append({'title': title, 'description': description, 'priority': priority, 'deadline': None})
+            if len(tasks) >= 5:
+                break
+        if len(tasks) >= 5:
+            break
+    
+    return tasks
+
+WORDS = ("the report budget team meeting Friday review schedule numbers quarterly "
+         "PLEASE Please please can you need to should must action item action items: "
+         "todo todos: task tasks: reminder: don't forget to DON'T FORGET TO "
+         "mustmust tasktask pleaseplease . ! ? \n café naïve İstanbul ıi ſhould Kelvin").split(' ')
+
+def random_text(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+def test_matches_reference_on_random_text():
+    """Many random trigger-dense texts, including unicode case folding edge cases"""
+    print("\n🔍 Comparing detector with reference implementation...")
+    detector = load_detector()
+    rng = random.Random(42)
+    for _ in range(3000):
+        text = random_text(rng, rng.randint(5, 120))
+        assert detector.detect(text) == detect_tasks_reference(text), text
+    print("✅ Detector matches reference")
+
+def test_matches_reference_on_email():
+    detector = load_detector()
+    text = ("Hi team,\n\nPlease review the Q4 budget report before Friday. "
+            "Can you also send the updated numbers to finance? We need to schedule "
+            "a follow-up meeting with marketing. Action items: update the roadmap slides. "
+            "Reminder: submit your timesheets by end of day. Thanks!")
+    tasks = detector.detect(text)
+    assert tasks == detect_tasks_reference(text)
+    assert [t['priority'] for t in tasks] == ['high', 'medium', 'high', 'high', 'medium']
+    print("✅ Email example matches reference")
+
+def test_special_case_folding_chars():
+    """ſ matches s under re.IGNORECASE, so it must still trigger 'should'"""
+    detector = load_detector()
+    text = "We ſhould finalize the vendor contract this week. İ"
+    assert detector.detect(text) == detect_tasks_reference(text)
+    assert detector.detect(text)
+    print("✅ Case folding edge cases match reference")
+
+def test_long_text_chunked_lowering():
+    """Triggers past and across the lazily lowered chunk boundaries"""
+    detector = load_detector()
+    rng = random.Random(7)
+    for size in (16384, 65536, 262144, 300000):
+        for _ in range(20):
+            text = 'x' * rng.randint(size - 20, size + 20) + ' PLEASE send the signed contract to legal today.'
+            assert detector.detect(text) == detect_tasks_reference(text)
+            assert detector.detect(text)
+    print("✅ Long texts match reference")
+
+def test_patterns_from_file():
+    patterns = [{"trigger": "por favor", "priority": "high"}]
+    with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+        json.dump(patterns, f)
+    try:
+        detector = load_detector(f.name)
+        tasks = detector.detect("Hola, por favor revisa el presupuesto del trimestre.")
+        assert [t['title'] for t in tasks] == ['Revisa el presupuesto del trimestre']
+        assert tasks[0]['priority'] == 'high'
+    finally:
+        os.unlink(f.name)
+    print("✅ Patterns loaded from file")
+
+if __name__ == '__main__':
+    test_matches_reference_on_random_text()
+    test_matches_reference_on_email()
+    test_special_case_folding_chars()
+    test_long_text_chunked_lowering()
+    test_patterns_from_file()
+    print("\n✅ All detection tests passed!")
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for MessagePack and compressed task responses (response_encoding.py)
+Checks Accept: application/msgpack returns the same document as the JSON
+body, brotli/gzip follow Accept-Encoding above the size threshold, ETags
+still answer 304, and the ASGI routes negotiate like the Flask ones.
+
+Run with: python test_encoding.py  (or pytest test_encoding.py)
+"""
+
+import gzip
+
+import test_setup
+
+import brotli
+import msgpack
+from starlette.testclient import TestClient
+
+import app as backend
+import asgi
+
+client = backend.app.test_client()
+
+test_setup.migrate()
+
+# Without metadata: other tests in the same database store integers MessagePack can't hold
+TASKS_URL = '/api/tasks?fields=title,description,priority,createdAt'
+
+def seed():
+    for i in range(20):
+        client.post('/api/tasks', json={
+            'title': f'Prepare the release notes, part {i} ✍️',
+            'description': 'Collect the merged changes and write them up for the changelog. ' * 5,
+            'priority': 'high'
+        })
+
+def test_negotiation():
+    print("\n🔍 Testing negotiation...")
+    encoder = backend.response_encoder
+    assert encoder.negotiate(None, 'gzip, deflate, br') == ('application/json', 'br')
+    assert encoder.negotiate('application/x-msgpack', 'br;q=0, gzip') == ('application/msgpack', 'gzip')
+    assert encoder.negotiate('application/json, application/msgpack;q=0.5', 'identity') == ('application/json', None)
+    # Integers past 64 bits stay JSON
+    assert encoder.encode(b'[18446744073709551616]', 'application/msgpack', None)[1] == 'application/json'
+    # Too small to be worth compressing
+    assert encoder.encode(b'{"ok":true}', 'application/json', 'br') == (b'{"ok":true}', 'application/json', None)
+    print("✅ Representation follows the request headers")
+
+def test_flask_responses():
+    print("\n🔍 Testing Flask responses...")
+    seed()
+    plain = client.get(TASKS_URL)
+    assert 'Accept-Encoding' in plain.headers['Vary'] and 'Content-Encoding' not in plain.headers
+
+    packed = client.get(TASKS_URL, headers={'Accept': 'application/msgpack'})
+    assert packed.mimetype == 'application/msgpack'
+    assert msgpack.unpackb(packed.get_data()) == plain.get_json()
+    assert len(packed.get_data()) < len(plain.get_data())
+
+    compressed = client.get(TASKS_URL, headers={'Accept-Encoding': 'gzip, br'})
+    assert compressed.headers['Content-Encoding'] == 'br'
+    assert brotli.decompress(compressed.get_data()) == plain.get_data()
+
+    both = client.get(TASKS_URL, headers={'Accept': 'application/msgpack', 'Accept-Encoding': 'gzip'})
+    assert msgpack.unpackb(gzip.decompress(both.get_data())) == plain.get_json()
+
+    # The weak ETag of an encoded response still revalidates
+    assert compressed.headers['ETag'].startswith('W/')
+    again = client.get(TASKS_URL, headers={'Accept-Encoding': 'br', 'If-None-Match': compressed.headers['ETag']})
+    assert again.status_code == 304
+    # Served from the cached variant
+    assert client.get(TASKS_URL, headers={'Accept-Encoding': 'gzip, br'}).get_data() == compressed.get_data()
+    print("✅ MessagePack and compression on Flask routes")
+
+def test_asgi_responses():
+    print("\n🔍 Testing ASGI responses...")
+    with TestClient(asgi.app) as asgi_client:
+        plain = asgi_client.get(TASKS_URL, headers={'Accept-Encoding': 'identity'})
+        packed = asgi_client.get(TASKS_URL, headers={'Accept': 'application/msgpack', 'Accept-Encoding': 'identity'})
+        assert packed.headers['content-type'] == 'application/msgpack'
+        assert msgpack.unpackb(packed.content) == plain.json()
+
+        # The test client decodes gzip itself
+        compressed = asgi_client.get('/api/tasks/detected', headers={'Accept-Encoding': 'gzip'})
+        assert compressed.headers.get('content-encoding') in ('gzip', None)
+        assert compressed.json() == client.get('/api/tasks/detected').get_json()
+    print("✅ MessagePack and compression on ASGI routes")
+
+if __name__ == '__main__':
+    test_negotiation()
+    test_flask_responses()
+    test_asgi_responses()
+    print("\n✅ All response encoding tests passed!")
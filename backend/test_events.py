@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests for the task change stream (GET /api/tasks/events, task_events.py)
+Checks writes are pushed as soon as they commit, a reconnect with
+Last-Event-ID resumes without missing a change, and that waiting threads and
+asyncio tasks are woken by a notification.
+
+Run with: python test_events.py  (or pytest test_events.py)
+"""
+
+import asyncio
+import json
+import threading
+import time
+
+import test_setup
+
+import app as backend
+from task_events import TaskNotifier
+
+app = backend.app
+client = app.test_client()
+
+test_setup.migrate()
+
+# Short streams so each test ends on its own
+backend.EVENTS_MAX_STREAM_SECONDS = 2
+backend.EVENTS_HEARTBEAT_SECONDS = 0.5
+
+def read_events(headers=None):
+    """(seconds since connect, id, data) of each event until the stream ends"""
+    response = client.get('/api/tasks/events', headers=headers, buffered=False)
+    assert response.status_code == 200 and response.mimetype == 'text/event-stream'
+    start = time.monotonic()
+    events = []
+    for chunk in response.response:
+        for block in (chunk.decode() if isinstance(chunk, bytes) else chunk).split('\n\n'):
+            fields = dict(line.split(': ', 1) for line in block.splitlines() if not line.startswith(':'))
+            if fields.get('event') == 'tasks':
+                events.append((time.monotonic() - start, fields['id'], json.loads(fields['data'])))
+    response.close()
+    return events
+
+def later(delay, fn):
+    thread = threading.Thread(target=lambda: (time.sleep(delay), fn()))
+    thread.start()
+    return thread
+
+def test_writes_are_pushed():
+    print("\n🔍 Testing pushed changes...")
+    task_id = client.post('/api/tasks', json={'title': 'Streamed task'}).get_json()['id']
+
+    def write():
+        app.test_client().post(f'/api/tasks/{task_id}/decline')
+        app.test_client().delete(f'/api/tasks/{task_id}')
+    writer = later(0.5, write)
+    events = read_events()
+    writer.join()
+
+    # The decline arrives well before the next heartbeat would have found it
+    declined = [(t, data) for t, _, data in events if any(task['status'] == 'declined' for task in data['tasks'])]
+    assert declined and declined[0][0] < 0.9, events
+    assert any(task_id in data['deleted'] for _, _, data in events)
+    print("✅ Writes pushed as they commit")
+
+def test_resume_from_last_event_id():
+    print("\n🔍 Testing reconnect...")
+    client.post('/api/tasks', json={'title': 'Before disconnect'})
+    last_id = read_events()[-1][1]
+
+    # Written while no stream was open
+    client.post('/api/tasks', json={'title': 'Missed while away'})
+    events = read_events({'Last-Event-ID': last_id})
+    titles = [task['title'] for _, _, data in events for task in data['tasks']]
+    assert 'Missed while away' in titles
+    assert titles.count('Before disconnect') <= 1
+
+    assert client.get('/api/tasks/events', headers={'Last-Event-ID': 'bogus'}).status_code == 400
+    print("✅ Last-Event-ID resumes the stream")
+
+def test_notifier_wakes_waiters():
+    print("\n🔍 Testing notifier...")
+    notifier = TaskNotifier()
+
+    later(0.2, notifier.notify)
+    start = time.monotonic()
+    assert notifier.wait(0, 5) == 1
+    assert time.monotonic() - start < 1
+
+    async def wait_async():
+        later(0.2, notifier.notify)
+        return await notifier.wait_async(1, 5)
+    start = time.monotonic()
+    assert asyncio.run(wait_async()) == 2
+    assert time.monotonic() - start < 1
+
+    # Times out without a notification
+    assert notifier.wait(2, 0.1) == 2
+    print("✅ Threads and asyncio tasks woken")
+
+if __name__ == '__main__':
+    test_writes_are_pushed()
+    test_resume_from_last_event_id()
+    test_notifier_wakes_waiters()
+    print("\n✅ All event stream tests passed!")
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Tests for detected task dedup (Task.fingerprint, compact_detected_tasks)
+Checks re-analyzing the same page does not store the same task twice, and
+that compaction collapses duplicates stored before fingerprints existed.
+
+Run with: python test_fingerprints.py  (or pytest test_fingerprints.py)
+"""
+
+import os
+
+import test_setup
+
+# Keyword detection, so the test doesn't need Groq
+os.environ.pop('GROQ_API_KEY', None)
+
+from app import app, db, Task, task_fingerprint, compact_detected_tasks, changes_head
+
+client = app.test_client()
+
+test_setup.migrate()
+
+TEXT = ("Hi team, please review the quarterly budget report before the board meeting on Friday. "
+        "We also need to update the roadmap slides for the offsite next week.")
+
+def analyze(url):
+    return client.post('/api/analyze-tasks', json={'text': TEXT, 'url': url}).get_json()
+
+def test_fingerprint_normalizes_title():
+    print("\n🔍 Testing fingerprints...")
+    assert task_fingerprint('https://mail/1', 'Review the report!') == \
+        task_fingerprint(' https://mail/1 ', 'review  the REPORT')
+    assert task_fingerprint('https://mail/1', 'Review the report') != \
+        task_fingerprint('https://mail/2', 'Review the report')
+    assert task_fingerprint('https://mail/1', '...') is None
+    print("✅ Same page and title give the same fingerprint")
+
+def test_rescan_is_a_no_op():
+    print("\n🔍 Testing re-scans...")
+    first = analyze('https://mail.example.com/#inbox/rescan')
+    assert first['count'] > 0
+
+    # Same email scanned again, and once more with a confirmed task
+    assert analyze('https://mail.example.com/#inbox/rescan')['count'] == 0
+    client.post(f"/api/tasks/{first['tasks'][0]['id']}/confirm")
+    assert analyze('https://mail.example.com/#inbox/rescan')['count'] == 0
+
+    # The same text on another page is a different task
+    assert analyze('https://mail.example.com/#inbox/other')['count'] == first['count']
+    print("✅ Duplicate inserts are no-ops")
+
+def test_compaction_collapses_old_duplicates():
+    print("\n🔍 Testing compaction...")
+    with app.app_context():
+        # Stored before fingerprints: no fingerprint, one copy per scan
+        old = [
+            Task(title='Renew the domain', url='https://mail/old', status=status, task_metadata={'aiDetected': True})
+            for status in ('detected', 'sent', 'declined')
+        ]
+        manual = [Task(title='Renew the domain', url='https://mail/old') for _ in range(2)]
+        db.session.add_all(old + manual)
+        db.session.commit()
+        ids = [task.id for task in old + manual]
+
+        since = changes_head()
+        fingerprinted, deleted = compact_detected_tasks()
+        assert deleted == 2 and fingerprinted >= 1
+
+        remaining = {task.id: task for task in Task.query.filter(Task.id.in_(ids))}
+        # The sent copy wins, manual captures are never touched
+        assert set(remaining) == {ids[1], ids[3], ids[4]}
+        assert remaining[ids[1]].fingerprint == task_fingerprint('https://mail/old', 'Renew the domain')
+
+        assert compact_detected_tasks() == (0, 0)
+
+    deleted = client.get(f'/api/tasks/changes?since={since}').get_json()['deleted']
+    assert {ids[0], ids[2]} <= set(deleted)
+    print("✅ Old duplicates collapsed")
+
+if __name__ == '__main__':
+    test_fingerprint_normalizes_title()
+    test_rescan_is_a_no_op()
+    test_compaction_collapses_old_duplicates()
+    print("\n✅ All fingerprint tests passed!")
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared Groq client (llm.shared_client / llm.complete)
+Runs against the local stub server in benchmarks/stub_groq.py and checks the
+client is reused, keeps its connection alive, is re-created after fork and
+retries transient errors.
+Run with: python test_groq_client.py  (or pytest test_groq_client.py)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks'))
+
+import llm
+from stub_groq import StubGroq
+
+TEXT = "Hi team, please review the quarterly budget report before the board meeting on Friday."
+
+def use_stub(stub):
+    os.environ['GROQ_BASE_URL'] = stub.url
+    llm._reset_client()
+
+def test_client_reused_with_keep_alive():
+    print("\n🔍 Testing shared client...")
+    with StubGroq() as stub:
+        use_stub(stub)
+        client = llm.shared_client('stub')
+        for _ in range(5):
+            assert llm.shared_client('stub') is client
+            assert llm.extract_tasks(client, TEXT)
+        assert stub.calls == 5
+        assert stub.connections == 1, f"{stub.connections} connections for 5 calls"
+    print("✅ One client, one connection")
+
+def test_client_recreated_after_fork():
+    print("\n🔍 Testing client after fork...")
+    with StubGroq() as stub:
+        use_stub(stub)
+        parent_client = llm.shared_client('stub')
+        llm.extract_tasks(parent_client, TEXT)
+        
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            # Child: must get its own client and connection
+            ok = llm.shared_client('stub') is not parent_client and bool(llm.extract_tasks(llm.shared_client('stub'), TEXT))
+            os.write(write_fd, b'1' if ok else b'0')
+            os._exit(0)
+        os.close(write_fd)
+        result = os.read(read_fd, 1)
+        os.waitpid(pid, 0)
+        assert result == b'1', "Child reused the parent's client"
+        assert llm.shared_client('stub') is parent_client
+        assert stub.connections == 2
+    print("✅ Client re-created after fork")
+
+def test_retries_transient_errors():
+    print("\n🔍 Testing retries...")
+    backoff = llm.GROQ_RETRY_BACKOFF_SECONDS
+    llm.GROQ_RETRY_BACKOFF_SECONDS = 0.01
+    try:
+        with StubGroq(fail_first=2) as stub:
+            use_stub(stub)
+            assert llm.extract_tasks(llm.shared_client('stub'), TEXT)
+            assert stub.calls == 3
+        
+        with StubGroq(fail_first=10) as stub:
+            use_stub(stub)
+            try:
+                llm.extract_tasks(llm.shared_client('stub'), TEXT)
+                assert False, "Expected an error after the last retry"
+            except Exception as e:
+                assert getattr(e, 'status_code', None) == 503
+            assert stub.calls == llm.GROQ_MAX_RETRIES + 1
+    finally:
+        llm.GROQ_RETRY_BACKOFF_SECONDS = backoff
+    print("✅ Transient errors retried")
+
+if __name__ == '__main__':
+    test_client_reused_with_keep_alive()
+    test_client_recreated_after_fork()
+    test_retries_transient_errors()
+    print("\n✅ All Groq client tests passed!")
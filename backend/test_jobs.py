@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for background job housekeeping in JOB_MODE=thread (job_housekeeping)
+Checks web workers purge old finished jobs, fail stuck ones, run jobs left
+queued (e.g. by a worker that restarted before picking them up), and archive
+tasks and prune tombstones once per interval between them.
+
+Run with: python test_jobs.py  (or pytest test_jobs.py)
+"""
+
+import time
+from datetime import datetime, timedelta
+
+import test_setup
+
+import app as backend
+from app import (app, db, Counter, Job, Task, TaskArchive, TaskTombstone, job_handler, job_housekeeping,
+                 RETENTION_LAST_RUN)
+
+test_setup.migrate()
+
+client = app.test_client()
+
+LONG_AGO = datetime.utcnow() - timedelta(days=30)
+
+@job_handler('test-echo')
+def echo_job(payload):
+    return payload
+
+def add_jobs(*jobs):
+    with app.app_context():
+        db.session.add_all(jobs)
+        db.session.commit()
+        return [job.id for job in jobs]
+
+def job_status(job_id):
+    with app.app_context():
+        job = db.session.get(Job, job_id)
+        return job.status if job else None
+
+def test_housekeeping_runs_stale_jobs():
+    print("\n🔍 Testing housekeeping...")
+    stale, fresh, stuck, finished = add_jobs(
+        Job(kind='test-echo', payload={'n': 1}, status='queued', created_at=LONG_AGO),
+        Job(kind='test-echo', payload={'n': 2}, status='queued'),
+        Job(kind='test-echo', payload={}, status='running', created_at=LONG_AGO, started_at=LONG_AGO),
+        Job(kind='test-echo', payload={}, status='done', created_at=LONG_AGO, finished_at=LONG_AGO),
+    )
+    job_housekeeping()
+
+    deadline = time.monotonic() + 10
+    while job_status(stale) != 'done' and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert job_status(stale) == 'done'
+    # Possibly still waiting in the pool that enqueued it
+    assert job_status(fresh) == 'queued'
+    assert job_status(stuck) == 'failed' and job_status(finished) is None
+    print("✅ Old jobs purged, stuck ones failed, lost ones run")
+
+def test_requests_schedule_housekeeping():
+    print("\n🔍 Testing scheduling...")
+    backend._last_housekeeping = None
+    client.get('/health')
+    scheduled = backend._last_housekeeping
+    assert scheduled is not None
+    client.get('/health')
+    # At most once per JOB_HOUSEKEEPING_SECONDS
+    assert backend._last_housekeeping == scheduled
+    print("✅ Scheduled by requests, throttled")
+
+def test_housekeeping_runs_retention():
+    print("\n🔍 Testing retention in housekeeping...")
+    very_old = LONG_AGO - timedelta(days=400)
+    with app.app_context():
+        db.session.query(Counter).filter_by(name=RETENTION_LAST_RUN).delete()
+        old_sent = Task(title='Housekeeping sent long ago', status='sent', updated_at=very_old)
+        db.session.add_all([
+            old_sent,
+            # Past TOMBSTONE_RETENTION_DAYS, yet the newest old ones in the table
+            TaskTombstone(task_id=999998, deleted_at=datetime.utcnow() - timedelta(days=60)),
+            TaskTombstone(task_id=999999, deleted_at=datetime.utcnow() - timedelta(days=59)),
+        ])
+        db.session.commit()
+        old_sent_id = old_sent.id
+
+    backend.RETENTION_INTERVAL_SECONDS = 3600
+    try:
+        job_housekeeping()
+        with app.app_context():
+            assert db.session.get(TaskArchive, old_sent_id) is not None
+            assert db.session.get(Task, old_sent_id) is None
+            # The newest old tombstone is kept, see prune_tombstones
+            assert db.session.query(TaskTombstone).filter_by(task_id=999998).count() == 0
+
+            again = Task(title='Housekeeping sent again', status='sent', updated_at=very_old)
+            db.session.add(again)
+            db.session.commit()
+            again_id = again.id
+
+        # Another worker within the interval leaves it alone
+        job_housekeeping()
+        with app.app_context():
+            assert db.session.get(Task, again_id) is not None
+    finally:
+        backend.RETENTION_INTERVAL_SECONDS = 0
+    print("✅ Tasks archived and tombstones pruned, once per interval")
+
+if __name__ == '__main__':
+    test_housekeeping_runs_stale_jobs()
+    test_requests_schedule_housekeeping()
+    test_housekeeping_runs_retention()
+    print("\n✅ All job tests passed!")
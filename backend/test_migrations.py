@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite tasks rebuild (migration 0013_tasks_autoincrement)
+Upgrades a database with tasks, archived tasks and deletes from 0012 and
+checks the rows, indexes, FTS triggers and search survive, and that ids
+handed out before are never used again.
+
+Run with: python test_migrations.py  (or pytest test_migrations.py)
+"""
+
+import os
+import tempfile
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine, text
+
+import test_setup
+
+from app import db
+import migrations
+from migrations import run_migrations
+
+test_setup.migrate()
+
+def sqlite_db():
+    path = os.path.join(tempfile.mkdtemp(), 'upgrade.db')
+    # run_migrations only needs the engine, and create_all the models
+    return SimpleNamespace(engine=create_engine(f'sqlite:///{path}'), metadata=db.metadata)
+
+def schema(conn):
+    rows = conn.execute(text("SELECT type, name, sql FROM sqlite_master WHERE tbl_name = 'tasks'"))
+    return {(row.type, row.name): row.sql for row in rows}
+
+def test_tasks_rebuilt_with_autoincrement():
+    print("\n🔍 Testing the tasks rebuild...")
+    upgrade = sqlite_db()
+    latest = migrations.MIGRATIONS[:]
+    migrations.MIGRATIONS[:] = [m for m in latest if m[0] < '0013']
+    try:
+        run_migrations(upgrade)
+    finally:
+        migrations.MIGRATIONS[:] = latest
+
+    with upgrade.engine.begin() as conn:
+        before = schema(conn)
+        assert 'AUTOINCREMENT' not in before[('table', 'tasks')]
+        for i in range(1, 5):
+            conn.execute(text("INSERT INTO tasks (id, title, status) VALUES (:id, :title, 'pending')"),
+                         {'id': i, 'title': f'Quarterly budget review {i}'})
+        # 5 archived, 3 and 4 deleted: none of them may come back
+        conn.execute(text("INSERT INTO tasks_archive (id, title, status, archived_at) "
+                          "VALUES (5, 'Archived budget', 'sent', CURRENT_TIMESTAMP)"))
+        conn.execute(text('DELETE FROM tasks WHERE id IN (3, 4)'))
+        conn.execute(text('INSERT INTO task_tombstones (task_id, deleted_at) VALUES (3, CURRENT_TIMESTAMP), '
+                          '(4, CURRENT_TIMESTAMP)'))
+
+    assert run_migrations(upgrade) == ['0013_tasks_autoincrement']
+    with upgrade.engine.begin() as conn:
+        after = schema(conn)
+        assert 'AUTOINCREMENT' in after.pop(('table', 'tasks'))
+        before.pop(('table', 'tasks'))
+        # Same indexes and triggers, same definitions
+        assert after == before
+        assert {name for kind, name in after if kind == 'trigger'} == \
+            {'tasks_fts_insert', 'tasks_fts_delete', 'tasks_fts_update'}
+
+        assert conn.execute(text('SELECT id, title FROM tasks ORDER BY id')).all() == \
+            [(1, 'Quarterly budget review 1'), (2, 'Quarterly budget review 2')]
+        search = text("SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH 'budget' ORDER BY rowid")
+        assert conn.execute(search).scalars().all() == [1, 2]
+
+        new_id = conn.execute(text("INSERT INTO tasks (title, status) "
+                                   "VALUES ('New budget task', 'pending') RETURNING id")).scalar()
+        assert new_id == 6
+        assert conn.execute(search).scalars().all() == [1, 2, 6]
+    print("✅ Rows, indexes, triggers and search kept, ids not reused")
+
+if __name__ == '__main__':
+    test_tasks_rebuilt_with_autoincrement()
+    print("\n✅ All migration tests passed!")
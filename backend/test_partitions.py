@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for the partitioned tasks table (partitions.py, PostgreSQL only)
+Converts the tasks table inside a transaction that is rolled back at the
+end, and checks lists are pruned to the partitions they need, fingerprints
+still dedup detected tasks, and old partitions are archived and dropped.
+
+Needs DATABASE_URL pointing at PostgreSQL, skipped on SQLite.
+Run with: python test_partitions.py  (or pytest test_partitions.py)
+"""
+
+from datetime import datetime, timedelta
+
+import test_setup
+
+from sqlalchemy import select, text
+import partitions
+from app import (
+    app, db, Task, TaskArchive, detected_task_rows, detected_tasks_insert, drop_task_partitions,
+    task_list_query, tasks_partitioned
+)
+
+test_setup.migrate()
+
+def explain(query):
+    compiled = query.compile(db.engine)
+    rows = db.session.connection().exec_driver_sql(f'EXPLAIN {compiled}', compiled.params)
+    plan = '\n'.join(row[0] for row in rows).lower()
+    print(plan)
+    return plan
+
+def detect(title):
+    rows = detected_task_rows([{'title': title}], 'web', 'https://mail.example.com/#inbox/partitions', {})
+    return db.session.scalars(detected_tasks_insert(rows, 'postgresql')).all()
+
+def test_partitioned_tasks():
+    print("\n🔍 Testing partitioned tasks...")
+    with app.app_context():
+        if db.engine.dialect.name != 'postgresql':
+            print("⏭️  PostgreSQL only")
+            return
+        if tasks_partitioned():
+            print("⏭️  Tasks are partitioned already")
+            return
+
+        now = datetime.utcnow()
+        old = now - timedelta(days=400)
+        db.session.add(Task(title='Partitioned legacy task', created_at=old))
+        db.session.commit()
+        assert detect('Send the partitioned invoice')
+        # CREATE INDEX CONCURRENTLY waits for open write transactions
+        db.session.commit()
+
+        boundary = partitions.month_start(now, 2)
+        partitions.prepare_conversion(db.engine, boundary)
+        try:
+            created = partitions.convert_tasks_table(db.session, boundary, partitions.month_start(now, 3))
+            assert tasks_partitioned() and created == [f'tasks_p{boundary:%Y%m}', f'tasks_p{partitions.month_start(now, 3):%Y%m}']
+            names = [name for name, _ in partitions.list_partitions(db.session)]
+            assert names[0] == partitions.LEGACY_PARTITION and names[-1] == partitions.DEFAULT_PARTITION
+
+            db.session.add(Task(title='Partitioned future task', created_at=boundary + timedelta(days=3)))
+            db.session.flush()
+            newest = db.session.execute(task_list_query(None, ['title'], None).limit(1)).first()
+            assert newest.title == 'Partitioned future task'
+
+            # A page before a cursor in the legacy range never reads the monthly partitions
+            plan = explain(task_list_query(None, None, (old + timedelta(days=1), 1 << 30)).limit(10))
+            assert partitions.LEGACY_PARTITION in plan and 'tasks_p' not in plan, plan
+            # The first page merges the newest rows of each partition's index, without a sort
+            plan = explain(task_list_query(None, None, None).limit(10))
+            assert 'sort' not in plan.splitlines()[1], plan
+
+            # Fingerprints claimed before and after the conversion still dedup
+            assert detect('Send the partitioned invoice') == []
+            assert detect('Renew the partitioned lease') and detect('Renew the partitioned lease') == []
+
+            # Rows past the last month wait in the default partition until theirs is created
+            late = partitions.month_start(now, 4) + timedelta(days=2)
+            db.session.add(Task(title='Partitioned late task', created_at=late))
+            late_tasks = detected_task_rows([{'title': 'File the late partition report'}], 'web',
+                                            'https://mail.example.com/#inbox/partitions', {})
+            for row in late_tasks:
+                row['created_at'] = late
+            assert db.session.scalars(detected_tasks_insert(late_tasks, 'postgresql')).all()
+            db.session.flush()
+            assert db.session.scalar(text(f'SELECT count(*) FROM {partitions.DEFAULT_PARTITION}')) == 2
+            assert partitions.create_partitions(db.session, partitions.month_start(now, 5)) == \
+                [f'tasks_p{late:%Y%m}', f'tasks_p{partitions.month_start(now, 5):%Y%m}']
+            assert db.session.scalar(text(f'SELECT count(*) FROM {partitions.DEFAULT_PARTITION}')) == 0
+            assert db.session.scalar(text(f'SELECT count(*) FROM tasks_p{late:%Y%m}')) == 2
+            assert [name for name, _ in partitions.list_partitions(db.session)][-1] == partitions.DEFAULT_PARTITION
+            # Still claimed
+            assert detect('File the late partition report') == []
+
+            # Dropping the legacy partition archives its rows and frees its fingerprints
+            archived = db.session.scalar(text(f'SELECT count(*) FROM {partitions.LEGACY_PARTITION}'))
+            drop_task_partitions(partitions.expired_partitions(db.session, boundary), now)
+            assert partitions.LEGACY_PARTITION not in [name for name, _ in partitions.list_partitions(db.session)]
+            assert db.session.scalar(select(db.func.count()).select_from(TaskArchive)) >= archived
+            assert detect('Send the partitioned invoice')
+        finally:
+            db.session.rollback()
+            with db.engine.begin() as conn:
+                conn.execute(text('ALTER TABLE tasks DROP CONSTRAINT IF EXISTS tasks_legacy_bound'))
+                conn.execute(text('DROP INDEX IF EXISTS tasks_legacy_id_created_at'))
+    print("✅ Pruned lists, fingerprint dedup and partition drops")
+
+if __name__ == '__main__':
+    test_partitioned_tasks()
+    print("\n✅ All partition tests passed!")
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Tests for the task read cache (response_cache.py, cached_response in app.py)
+and conditional GETs (conditional_get). Checks repeated GETs are served
+from the cache or answered with 304, and that every kind of task write,
+including one made by another worker, invalidates both. Also covers the
+/api/tasks/counts long-poll, which waits on the same data version.
+
+Run with: python test_response_cache.py  (or pytest test_response_cache.py)
+"""
+
+import threading
+import time
+
+import test_setup
+
+from sqlalchemy import func, select, text
+from app import app, db, Task
+from response_cache import ResponseCache
+
+client = app.test_client()
+
+test_setup.migrate()
+
+def get(url):
+    response = client.get(url)
+    return response.headers.get('X-Cache'), response.get_json()
+
+def test_repeated_get_is_cached():
+    print("\n🔍 Testing cache hits...")
+    client.post('/api/tasks', json={'title': 'Cached task'})
+    for url in ['/api/tasks', '/api/tasks?limit=1', '/api/tasks/detected']:
+        first = get(url)
+        second = get(url)
+        assert first[0] == 'MISS' and second[0] == 'HIT', url
+        assert first[1] == second[1]
+    print("✅ Repeated GETs served from cache")
+
+def test_writes_invalidate():
+    print("\n🔍 Testing invalidation...")
+    task_id = client.post('/api/tasks', json={'title': 'Invalidated task'}).get_json()['id']
+    get(f'/api/tasks/{task_id}')
+    assert get(f'/api/tasks/{task_id}')[0] == 'HIT'
+    
+    client.post(f'/api/tasks/{task_id}/decline')
+    cache, task = get(f'/api/tasks/{task_id}')
+    assert cache == 'MISS' and task['status'] == 'declined'
+    
+    # Bulk statements bump the version too
+    get('/api/tasks')
+    client.delete('/api/tasks')
+    cache, tasks = get('/api/tasks')
+    assert cache == 'MISS' and tasks == []
+    
+    client.post('/api/tasks/bulk', json=[{'title': 'Bulk one'}, {'title': 'Bulk two'}])
+    cache, tasks = get('/api/tasks')
+    assert cache == 'MISS' and len(tasks) == 2
+    print("✅ Writes invalidate the cache")
+
+def test_write_from_other_worker_invalidates():
+    print("\n🔍 Testing cross-worker coherence...")
+    get('/api/tasks')
+    assert get('/api/tasks')[0] == 'HIT'
+    with app.app_context():
+        # Another worker's write only shows up as a new version in the database
+        db.session.execute(text("UPDATE tasks SET title = 'Renamed elsewhere'"))
+        db.session.execute(text("UPDATE counters SET value = value + 1 WHERE name = 'tasks.version'"))
+        db.session.commit()
+    cache, tasks = get('/api/tasks')
+    assert cache == 'MISS' and all(t['title'] == 'Renamed elsewhere' for t in tasks)
+    print("✅ Other workers' writes invalidate the cache")
+
+def test_lru_eviction_and_stale_versions():
+    print("\n🔍 Testing LRU...")
+    cache = ResponseCache(2)
+    cache.put('a', 1, 'A')
+    cache.put('b', 1, 'B')
+    cache.get('a', 1)
+    cache.put('c', 1, 'C')
+    assert cache.get('b', 1) is None and cache.get('a', 1) == 'A'
+    
+    # A newer version drops everything, an older one is never stored
+    assert cache.get('a', 2) is None
+    cache.put('a', 1, 'old')
+    assert cache.get('a', 2) is None
+    print("✅ LRU evicts and ignores stale versions")
+
+def test_if_none_match():
+    print("\n🔍 Testing ETags...")
+    task = client.post('/api/tasks', json={'title': 'Conditional task'}).get_json()
+    for url in ['/api/tasks', '/api/tasks?limit=1&fields=id,title', '/api/tasks/detected', f"/api/tasks/{task['id']}"]:
+        etag = client.get(url).headers['ETag']
+        response = client.get(url, headers={'If-None-Match': etag})
+        assert response.status_code == 304 and response.data == b'', url
+        assert response.headers['ETag'] == etag
+    
+    # Single task ETags can be built from a copy of the task
+    url = f"/api/tasks/{task['id']}"
+    assert client.get(url, headers={'If-None-Match': f'"{task["id"]}-{task["updatedAt"]}"'}).status_code == 304
+    
+    list_etag = client.get('/api/tasks').headers['ETag']
+    client.post(f"/api/tasks/{task['id']}/decline")
+    assert client.get(url, headers={'If-None-Match': etag}).status_code == 200
+    assert client.get('/api/tasks', headers={'If-None-Match': list_etag}).status_code == 200
+    
+    # Same count and newest updated_at after a delete and an insert, still a new ETag
+    list_etag = client.get('/api/tasks').headers['ETag']
+    with app.app_context():
+        latest = db.session.execute(select(func.max(Task.updated_at))).scalar()
+        db.session.delete(db.session.get(Task, task['id']))
+        db.session.add(Task(title='Conditional replacement', updated_at=latest))
+        db.session.commit()
+    assert client.get('/api/tasks', headers={'If-None-Match': list_etag}).status_code == 200
+    print("✅ If-None-Match answered with 304 until a write")
+
+def test_task_counts_long_poll():
+    print("\n🔍 Testing task counts...")
+    before = client.get('/api/tasks/counts').get_json()
+    assert before['total'] == sum(before['counts'].values())
+    
+    # Unchanged counts hold the request until the wait runs out
+    start = time.monotonic()
+    same = client.get(f"/api/tasks/counts?since={before['version']}&wait=1").get_json()
+    assert same == before and time.monotonic() - start >= 1
+    
+    # A write answers the waiting request early
+    def write():
+        time.sleep(0.3)
+        app.test_client().post('/api/analyze-tasks', json={
+            'text': 'Hi team, please review the quarterly budget report before the board meeting on Friday.'
+        })
+    threading.Thread(target=write).start()
+    start = time.monotonic()
+    after = client.get(f"/api/tasks/counts?since={before['version']}&wait=10").get_json()
+    assert time.monotonic() - start < 5
+    assert after['version'] != before['version']
+    assert after['counts']['detected'] > before['counts']['detected']
+    print("✅ Counts long-poll returns on change or timeout")
+
+if __name__ == '__main__':
+    test_repeated_get_is_cached()
+    test_writes_invalidate()
+    test_write_from_other_worker_invalidates()
+    test_lru_eviction_and_stale_versions()
+    test_if_none_match()
+    test_task_counts_long_poll()
+    print("\n✅ All response cache tests passed!")
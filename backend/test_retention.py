@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for task retention (archive_tasks, tasks_archive)
+Checks sent and declined tasks past their retention move to the archive in
+batches, leave the lists and search, stay readable by id, and aren't
+detected again afterwards.
+
+Run with: python test_retention.py  (or pytest test_retention.py)
+"""
+
+import os
+from datetime import datetime, timedelta
+
+import test_setup
+
+# Keyword detection, so the test doesn't need Groq
+os.environ.pop('GROQ_API_KEY', None)
+
+import app as backend
+from app import app, db, Task, TaskArchive, archive_tasks, changes_head
+
+test_setup.migrate()
+
+client = app.test_client()
+
+# Older than any default retention
+LONG_AGO = datetime.utcnow() - timedelta(days=400)
+
+def add_tasks(*tasks):
+    with app.app_context():
+        db.session.add_all(tasks)
+        db.session.commit()
+        return [task.id for task in tasks]
+
+def test_old_tasks_move_to_archive():
+    print("\n🔍 Testing archival...")
+    old_sent, old_declined, old_pending, new_sent = add_tasks(
+        Task(title='Retention sent long ago', status='sent', jira_key='DNM-7', updated_at=LONG_AGO),
+        Task(title='Retention declined long ago', status='declined', updated_at=LONG_AGO),
+        Task(title='Retention pending long ago', status='pending', updated_at=LONG_AGO),
+        Task(title='Retention sent today', status='sent'),
+    )
+    before = client.get(f'/api/tasks/{old_sent}').get_json()
+
+    with app.app_context():
+        since = changes_head()
+        moved = archive_tasks()
+        assert moved['sent'] >= 1 and moved['declined'] >= 1
+        assert db.session.get(Task, old_sent) is None and db.session.get(Task, old_declined) is None
+        assert db.session.get(Task, old_pending) and db.session.get(Task, new_sent)
+        assert db.session.get(TaskArchive, old_sent).archived_at
+
+    listed = {task['id'] for task in client.get('/api/tasks').get_json()}
+    assert old_sent not in listed and old_pending in listed and new_sent in listed
+    assert old_sent not in {task['id'] for task in client.get('/api/tasks/search?q=retention').get_json()}
+
+    # Read-through by id, same fields plus archivedAt
+    archived = client.get(f'/api/tasks/{old_sent}')
+    data = archived.get_json()
+    assert data.pop('archivedAt') and data == before
+    assert client.get(f'/api/tasks/{old_sent}', headers={'If-None-Match': archived.headers['ETag']}).status_code == 304
+
+    # Sync clients see them as deleted
+    changes = client.get(f'/api/tasks/changes?since={since}').get_json()
+    assert {old_sent, old_declined} <= set(changes['deleted'])
+    print("✅ Old sent/declined tasks archived, still readable by id")
+
+def test_archive_runs_in_batches():
+    print("\n🔍 Testing batches...")
+    ids = add_tasks(*[Task(title=f'Batched {i}', status='declined', updated_at=LONG_AGO) for i in range(5)])
+    backend.RETENTION_BATCH_SIZE = 2
+    try:
+        with app.app_context():
+            assert archive_tasks()['declined'] == 5
+            assert db.session.query(TaskArchive).filter(TaskArchive.id.in_(ids)).count() == 5
+    finally:
+        backend.RETENTION_BATCH_SIZE = 1000
+    print("✅ All batches moved")
+
+def test_archived_tasks_are_not_detected_again():
+    print("\n🔍 Testing re-detection...")
+    text = "Please renew the retention policy document before the audit next month."
+    url = 'https://mail.example.com/#inbox/retention'
+    detected = client.post('/api/analyze-tasks', json={'text': text, 'url': url}).get_json()
+    assert detected['count'] == 1
+    with app.app_context():
+        task = db.session.get(Task, detected['tasks'][0]['id'])
+        task.status = 'sent'
+        db.session.commit()
+        Task.query.filter_by(id=task.id).update({'updated_at': LONG_AGO})
+        db.session.commit()
+        archive_tasks()
+
+    assert client.post('/api/analyze-tasks', json={'text': text, 'url': url}).get_json()['count'] == 0
+    print("✅ Archived fingerprints skipped")
+
+def test_archived_ids_are_not_reused():
+    print("\n🔍 Testing ids after archival...")
+    newest, = add_tasks(Task(title='Retention newest task', status='sent', updated_at=LONG_AGO))
+    with app.app_context():
+        archive_tasks()
+    later, = add_tasks(Task(title='Retention later task'))
+    assert later > newest
+    with app.app_context():
+        assert db.session.get(TaskArchive, newest).title == 'Retention newest task'
+    print("✅ New tasks get new ids, archived rows stay")
+
+if __name__ == '__main__':
+    test_old_tasks_move_to_archive()
+    test_archive_runs_in_batches()
+    test_archived_tasks_are_not_detected_again()
+    test_archived_ids_are_not_reused()
+    print("\n✅ All retention tests passed!")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Tests for full-text search (GET /api/tasks/search)
+Checks title matches rank above description matches, highlights mark the
+matched words, pages don't overlap, and the index follows edits and deletes.
+
+Run with: python test_search.py  (or pytest test_search.py)
+"""
+
+import test_setup
+
+from app import app
+
+client = app.test_client()
+
+test_setup.migrate()
+
+def create(title, description=''):
+    return client.post('/api/tasks', json={'title': title, 'description': description}).get_json()
+
+def search(q, **params):
+    return client.get('/api/tasks/search', query_string={'q': q, **params})
+
+def test_ranking_and_highlights():
+    print("\n🔍 Testing ranking...")
+    in_title = create('Renew the passport', 'Appointment at the consulate')
+    in_description = create('Book the consulate appointment', 'Bring the old passport and two photos')
+    create('Water the plants')
+
+    results = search('passport').get_json()
+    assert [task['id'] for task in results] == [in_title['id'], in_description['id']]
+    assert results[0]['rank'] > results[1]['rank']
+    assert results[0]['highlights']['title'] == 'Renew the <mark>passport</mark>'
+    assert '<mark>passport</mark>' in results[1]['highlights']['description']
+
+    # Every word must match, stemmed
+    assert [task['id'] for task in search('renewing passports').get_json()] == [in_title['id']]
+    assert search('passport plants').get_json() == []
+    print("✅ Title matches first, matched words highlighted")
+
+def test_pagination():
+    print("\n🔍 Testing pagination...")
+    ids = {create(f'Quarterly invoice reminder {i}')['id'] for i in range(7)}
+
+    seen = []
+    cursor = None
+    while True:
+        response = search('quarterly invoice', limit=3, **({'cursor': cursor} if cursor else {}))
+        seen += [task['id'] for task in response.get_json()]
+        cursor = response.headers.get('X-Next-Cursor')
+        if not cursor:
+            break
+    assert sorted(seen) == sorted(ids) and len(seen) == len(ids)
+
+    assert search('').status_code == 400
+    assert search('?!').status_code == 400
+    assert search('invoice', cursor='nonsense').status_code == 400
+    print("✅ Pages cover every match once")
+
+def test_index_follows_writes():
+    print("\n🔍 Testing index maintenance...")
+    task = create('Send the onboarding checklist')
+    assert [t['id'] for t in search('onboarding').get_json()] == [task['id']]
+
+    client.put(f"/api/tasks/{task['id']}", json={'title': 'Send the offboarding checklist'})
+    assert search('onboarding').get_json() == []
+    assert [t['id'] for t in search('offboarding').get_json()] == [task['id']]
+
+    # Declined tasks are found, detected ones only with ?status=detected
+    client.post(f"/api/tasks/{task['id']}/decline")
+    assert [t['status'] for t in search('offboarding').get_json()] == ['declined']
+    assert search('offboarding', status='detected').get_json() == []
+
+    client.delete(f"/api/tasks/{task['id']}")
+    assert search('offboarding').get_json() == []
+    print("✅ Index follows edits and deletes")
+
+if __name__ == '__main__':
+    test_ranking_and_highlights()
+    test_pagination()
+    test_index_follows_writes()
+    print("\n✅ All search tests passed!")
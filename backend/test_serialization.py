@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for the task list serialization fast path (fast_json.py, tasks_json in app.py)
+Checks task lists encoded from raw rows through orjson are byte for byte what
+jsonify() of Task.to_dict() wrote, including non-ASCII text, control
+characters and metadata values orjson writes differently, for whole,
+paged, projected and streamed lists.
+
+Run with: python test_serialization.py  (or pytest test_serialization.py)
+"""
+
+from datetime import date, datetime
+
+import test_setup
+
+from flask import jsonify
+import app as backend
+import fast_json
+from app import app, db, Task
+
+test_setup.migrate()
+
+client = app.test_client()
+
+# No NUL: PostgreSQL text can't hold it
+TRICKY_TEXT = 'Café ☕ 😀 tab\there "quoted" back\\slash \x01\x1f\x7f \u2028 </script>'
+
+def legacy_body(tasks, fields=None):
+    """What the endpoints wrote before the fast path"""
+    with app.test_request_context():
+        return jsonify([task.to_dict(fields) for task in tasks]).get_data()
+
+def seed():
+    with app.app_context():
+        tasks = [
+            Task(title=TRICKY_TEXT, description=TRICKY_TEXT, deadline=date(2026, 3, 1),
+                 task_metadata={'zeta': 1, 'alpha': {'nested': ['ü', 2.5, None, True]}}),
+            # Floats orjson writes with another exponent format, a 65-bit integer
+            Task(title='Exponents', task_metadata={'small': 1e-05, 'big': 1e16, 'huge': 2 ** 64}),
+            Task(title='No metadata', task_metadata=None, jira_key='DNM-1'),
+            Task(title='Whole second', created_at=datetime(2026, 1, 2, 3, 4, 5)),
+            Task(title='Detected', status='detected', task_metadata={'aiDetected': True, 'score': 0.61}),
+        ]
+        db.session.add_all(tasks)
+        db.session.commit()
+
+def stored(status=None):
+    return backend.filter_by_status(Task.query, status).order_by(Task.created_at.desc(), Task.id.desc()).all()
+
+def test_encoder_matches_json_module():
+    print("\n🔍 Testing fast_json...")
+    values = [
+        TRICKY_TEXT, 'nul \x00', '\ud83d', 1e-05, 1e+16, 1e15, 0.0001, -0.0, float('inf'), 2 ** 64, -2 ** 63,
+        {'b': [1, {'d': 'é', 'c': None}], 'a': 0.5}, [],
+    ]
+    with app.test_request_context():
+        for value in values:
+            assert fast_json.dumps(value) == jsonify(value).get_data(), value
+    # Dates as Task.to_dict() writes them
+    assert fast_json.dumps({'b': 'é', 'a': date(2026, 1, 2)}) == b'{"a":"2026-01-02","b":"\\u00e9"}\n'
+    print("✅ Same bytes as jsonify()")
+
+def test_task_lists_match_jsonify():
+    print("\n🔍 Testing task list bodies...")
+    seed()
+    with app.app_context():
+        tasks = stored()
+        detected = stored('detected')
+        expected_all = legacy_body(tasks)
+        expected_fields = legacy_body(tasks, ['title', 'metadata', 'createdAt'])
+        expected_detected = legacy_body(detected)
+
+    assert client.get('/api/tasks').get_data() == expected_all
+    assert client.get('/api/tasks?fields=title,metadata,createdAt').get_data() == expected_fields
+    assert client.get('/api/tasks/detected').get_data() == expected_detected
+
+    # Pages concatenate to the whole list
+    pages, cursor = [], None
+    while True:
+        response = client.get('/api/tasks', query_string={'limit': 2, **({'cursor': cursor} if cursor else {})})
+        pages += response.get_json()
+        cursor = response.headers.get('X-Next-Cursor')
+        if not cursor:
+            break
+    assert pages == client.get('/api/tasks').get_json()
+    for limit in ('abc', '0', '-5'):
+        assert client.get('/api/tasks', query_string={'limit': limit}).status_code == 400
+    print("✅ Whole, projected and paged lists unchanged")
+
+def test_streamed_list_matches():
+    print("\n🔍 Testing streamed lists...")
+    expected = client.get('/api/tasks').get_data()
+    backend.TASK_LIST_STREAM_ROWS = 2
+    try:
+        response = client.get('/api/tasks')
+        assert response.is_streamed and response.get_data() == expected
+        assert client.get('/api/tasks?status=no-such-status').get_data() == b'[]\n'
+    finally:
+        backend.TASK_LIST_STREAM_ROWS = 0
+    print("✅ Streamed list unchanged")
+
+if __name__ == '__main__':
+    test_encoder_matches_json_module()
+    test_task_lists_match_jsonify()
+    test_streamed_list_matches()
+    print("\n✅ All serialization tests passed!")
@@ -0,0 +1,25 @@
+"""
+Shared setup for the backend tests, imported by each test module before app:
+
+  import test_setup
+  from app import app, db
+  test_setup.migrate()
+
+Uses DATABASE_URL if set (PostgreSQL), otherwise a temporary SQLite file,
+one per process. Housekeeping doesn't archive tasks behind the tests' backs
+unless a test turns it on (RETENTION_INTERVAL_SECONDS).
+"""
+
+import os
+import tempfile
+
+if 'DATABASE_URL' not in os.environ:
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'donotmiss.db')}"
+os.environ.setdefault('RETENTION_INTERVAL_SECONDS', '0')
+
+def migrate():
+    """Apply pending migrations to the test database"""
+    from app import app, db
+    from migrations import run_migrations
+    with app.app_context():
+        run_migrations(db)
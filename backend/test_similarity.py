@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Tests for near-duplicate tasks (minhash.py, similar_tasks in app.py)
+Checks reworded titles are found through the LSH index and unrelated ones
+are not, and that new tasks are flagged or merged depending on
+NEAR_DUPLICATE_MODE, between manual captures and task analysis alike.
+
+Run with: python test_similarity.py  (or pytest test_similarity.py)
+"""
+
+import os
+
+import test_setup
+
+# Keyword detection, so the test doesn't need Groq
+os.environ.pop('GROQ_API_KEY', None)
+
+from sqlalchemy import event
+
+import app as backend
+import minhash
+
+app = backend.app
+client = app.test_client()
+
+test_setup.migrate()
+
+def signature(title):
+    return minhash.signature(minhash.shingles(title))
+
+def test_signatures_estimate_similarity():
+    print("\n🔍 Testing MinHash...")
+    reworded = minhash.similarity(signature('Review Q4 budget'), signature('Review the Q4 budget report'))
+    unrelated = minhash.similarity(signature('Review Q4 budget'), signature('Book flights for the offsite'))
+    assert 0.6 <= reworded <= 0.9 and unrelated < 0.2
+    assert signature('the of to') is None
+    # Short titles borrow words from the description
+    assert 'vendor' in minhash.shingles('Follow up', 'Ask the vendor about the invoice')
+    assert 'vendor' not in minhash.shingles('Follow up on the overdue invoice', 'Ask the vendor')
+    # Reworded titles share an LSH bucket
+    keys = set(minhash.band_keys(signature('Review Q4 budget')))
+    assert keys & set(minhash.band_keys(signature('Review the Q4 budget report')))
+    print("✅ Similar titles, similar signatures")
+
+def test_manual_capture_flagged():
+    print("\n🔍 Testing flag mode...")
+    backend.NEAR_DUPLICATE_MODE = 'flag'
+    first = client.post('/api/tasks', json={'title': 'Prepare slides for the quarterly review'}).get_json()
+    second = client.post('/api/tasks', json={'title': 'Prepare quarterly review slides'}).get_json()
+    other = client.post('/api/tasks', json={'title': 'Order new laptops for the interns'}).get_json()
+
+    assert [match['id'] for match in second['metadata']['similarTo']] == [first['id']]
+    assert 'similarTo' not in other['metadata']
+    print("✅ Similar tasks listed in metadata")
+
+def test_one_lookup_per_batch():
+    print("\n🔍 Testing batched lookups...")
+    backend.NEAR_DUPLICATE_MODE = 'flag'
+    first = client.post('/api/tasks', json={'title': 'Archive the vendor contracts folder'}).get_json()
+    rows = [{'title': title, 'description': ''} for title in (
+        'Archive vendor contracts folder', 'Water the office plants', 'Archive the folder of vendor contracts'
+    )]
+    lookups = []
+    def count_lookups(conn, cursor, statement, *args):
+        if 'task_buckets' in statement:
+            lookups.append(statement)
+    with app.app_context():
+        event.listen(backend.db.engine, 'before_cursor_execute', count_lookups)
+        try:
+            kept, merged = backend.apply_near_duplicates(rows)
+        finally:
+            event.remove(backend.db.engine, 'before_cursor_execute', count_lookups)
+    assert len(lookups) == 1 and merged == []
+    similar = [[match['id'] for match in row.get('task_metadata', {}).get('similarTo', [])] for row in kept]
+    assert similar == [[first['id']], [], [first['id']]]
+    print("✅ One LSH query for all rows")
+
+def test_detected_task_merged_into_capture():
+    print("\n🔍 Testing merge mode...")
+    backend.NEAR_DUPLICATE_MODE = 'merge'
+    try:
+        captured = client.post('/api/tasks', json={
+            'title': 'Renew the SSL certificate for the billing site', 'priority': 'low'
+        }).get_json()
+        response = client.post('/api/analyze-tasks', json={
+            'text': 'Hi, you must renew SSL certificate for the billing site before it expires at the end of the month.',
+            'url': 'https://mail.example.com/#inbox/ssl'
+        }).get_json()
+        assert response['count'] == 0
+
+        merged = client.get(f"/api/tasks/{captured['id']}").get_json()
+        assert merged['priority'] == 'highest' and merged['metadata']['mergedDuplicates'] == 1
+    finally:
+        backend.NEAR_DUPLICATE_MODE = 'flag'
+    print("✅ Near-duplicate merged into the stored task")
+
+def test_rescan_in_merge_mode_is_a_no_op():
+    print("\n🔍 Testing re-scans in merge mode...")
+    backend.NEAR_DUPLICATE_MODE = 'merge'
+    body = {
+        'text': 'Hi, please migrate the staging database to the new cluster before the freeze on Monday.',
+        'url': 'https://mail.example.com/#inbox/rescan-merge'
+    }
+    try:
+        first = client.post('/api/analyze-tasks', json=body).get_json()
+        assert first['count'] > 0
+        with app.app_context():
+            version = backend.tasks_version()
+
+        # The same email again matches its own stored tasks by fingerprint
+        assert client.post('/api/analyze-tasks', json=body).get_json()['count'] == 0
+        for task in first['tasks']:
+            stored = client.get(f"/api/tasks/{task['id']}").get_json()
+            assert 'mergedDuplicates' not in stored['metadata'] and stored['updatedAt'] == task['updatedAt']
+        with app.app_context():
+            assert backend.tasks_version() == version
+    finally:
+        backend.NEAR_DUPLICATE_MODE = 'flag'
+    print("✅ Stored tasks untouched, nothing merged")
+
+def test_index_follows_updates_and_deletes():
+    print("\n🔍 Testing index maintenance...")
+    task = client.post('/api/tasks', json={'title': 'Draft the onboarding checklist for contractors'}).get_json()
+    with app.app_context():
+        assert backend.similar_tasks('Draft onboarding checklist for contractors', '')[0][0] == task['id']
+
+        client.put(f"/api/tasks/{task['id']}", json={'title': 'Clean the kitchen fridge'})
+        assert not backend.similar_tasks('Draft onboarding checklist for contractors', '')
+        assert backend.similar_tasks('Clean kitchen fridge', '')[0][0] == task['id']
+
+        client.delete(f"/api/tasks/{task['id']}")
+        assert not backend.similar_tasks('Clean kitchen fridge', '')
+    print("✅ Index follows edits and deletes")
+
+if __name__ == '__main__':
+    test_signatures_estimate_similarity()
+    test_manual_capture_flagged()
+    test_one_lookup_per_batch()
+    test_detected_task_merged_into_capture()
+    test_rescan_in_merge_mode_is_a_no_op()
+    test_index_follows_updates_and_deletes()
+    print("\n✅ All similarity tests passed!")
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Tests for batch status transitions (POST /api/tasks/batch)
+Checks valid transitions are applied together, each id gets its own outcome,
+invalid transitions are rejected, and that one UPDATE runs per action.
+
+Run with: python test_transitions.py  (or pytest test_transitions.py)
+"""
+
+import test_setup
+
+from sqlalchemy import event
+from app import app, db
+
+client = app.test_client()
+
+test_setup.migrate()
+
+def create(status, count):
+    """Ids of count new tasks with the given status"""
+    ids = []
+    for i in range(count):
+        task = client.post('/api/tasks', json={'title': f'Triage {status} {i}'}).get_json()
+        ids.append(task['id'])
+    if status != 'pending':
+        client.post('/api/tasks/batch', json=[
+            {'id': task_id, 'action': 'decline' if status == 'declined' else 'mark-sent'} for task_id in ids
+        ])
+    return ids
+
+def statuses(ids):
+    tasks = {task['id']: task for task in client.get('/api/tasks').get_json()}
+    tasks.update({task['id']: task for task in client.get('/api/tasks/detected').get_json()})
+    return [tasks[task_id] for task_id in ids]
+
+def test_batch_applies_transitions():
+    print("\n🔍 Testing batch transitions...")
+    pending = create('pending', 3)
+    declined = create('declined', 2)
+
+    response = client.post('/api/tasks/batch', json={'transitions': [
+        {'id': pending[0], 'action': 'decline'},
+        {'id': pending[1], 'action': 'mark-sent', 'jiraKey': 'DNM-1', 'jiraUrl': 'https://jira/DNM-1'},
+        {'id': pending[2], 'action': 'mark-sent', 'jiraKey': 'DNM-2', 'jiraUrl': 'https://jira/DNM-2'},
+        {'id': declined[0], 'action': 'restore'},
+        {'id': declined[1], 'action': 'restore'},
+    ]})
+    result = response.get_json()
+    assert response.status_code == 200 and result['updated'] == 5 and result['failed'] == 0
+
+    tasks = statuses(pending + declined)
+    assert [task['status'] for task in tasks] == ['declined', 'sent', 'sent', 'pending', 'pending']
+    assert [task['jiraKey'] for task in tasks[1:3]] == ['DNM-1', 'DNM-2']
+    assert tasks[2]['jiraUrl'] == 'https://jira/DNM-2'
+    print("✅ Transitions applied")
+
+def test_invalid_transitions_rejected():
+    print("\n🔍 Testing invalid transitions...")
+    pending = create('pending', 2)
+    sent = create('sent', 1)
+
+    result = client.post('/api/tasks/batch', json=[
+        {'id': pending[0], 'action': 'restore'},
+        {'id': sent[0], 'action': 'decline'},
+        {'id': 999999, 'action': 'confirm'},
+        {'id': pending[1], 'action': 'explode'},
+        {'id': pending[1], 'action': 'decline'},
+        {'id': pending[1], 'action': 'confirm'},
+    ]).get_json()
+    outcomes = [r['status'] for r in result['results']]
+    assert outcomes == ['error', 'error', 'error', 'error', 'updated', 'error']
+    assert result['results'][0]['error'] == 'Cannot restore a pending task'
+    assert result['results'][2]['error'] == 'Task not found'
+    assert [task['status'] for task in statuses(pending + sent)] == ['pending', 'declined', 'sent']
+
+    response = client.post('/api/tasks/batch', json=[{'id': pending[0], 'action': 'restore'}])
+    assert response.status_code == 400
+
+    # Wrongly typed Jira fields fail their own item, not the batch
+    bad_jira, good = create('pending', 2)
+    result = client.post('/api/tasks/batch', json=[
+        {'id': bad_jira, 'action': 'mark-sent', 'jiraKey': 42, 'jiraUrl': {'url': 'https://jira'}},
+        {'id': good, 'action': 'mark-sent', 'jiraKey': 'DNM-9', 'jiraUrl': None},
+    ]).get_json()
+    assert [r['status'] for r in result['results']] == ['error', 'updated']
+    assert result['results'][0]['error'] == 'jiraKey must be a string or null'
+    assert [task['status'] for task in statuses([bad_jira, good])] == ['pending', 'sent']
+    print("✅ Invalid transitions rejected per id")
+
+def test_one_update_per_action():
+    print("\n🔍 Testing statement count...")
+    pending = create('pending', 10)
+
+    statements = []
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('UPDATE TASKS'):
+            statements.append(statement)
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', count)
+        try:
+            client.post('/api/tasks/batch', json=[
+                {'id': task_id, 'action': 'decline' if i % 2 else 'mark-sent', 'jiraKey': f'DNM-{i}'}
+                for i, task_id in enumerate(pending)
+            ])
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', count)
+    assert len(statements) == 2, statements
+    print("✅ One UPDATE per action")
+
+if __name__ == '__main__':
+    test_batch_applies_transitions()
+    test_invalid_transitions_rejected()
+    test_one_update_per_action()
+    print("\n✅ All batch transition tests passed!")
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Background job worker for DoNotMiss Backend
+Runs queued jobs (like async task analysis) from the jobs table, so web
+workers never block on the LLM. Start web workers with JOB_MODE=external
+and run one or more of these next to them:
+
+  JOB_MODE=external gunicorn app:app
+  python worker.py
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app import (app, db, Job, run_job, expire_jobs, archive_tasks, maintain_task_partitions,
+                 prune_tombstones, flush_analysis_cache_stats, evict_analysis_cache, JOB_WORKERS,
+                 RETENTION_INTERVAL_SECONDS)
+from migrations import run_migrations
+
+POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', 1.0))
+# Expiring jobs, flushing analysis cache hit counts and evicting cache entries
+EXPIRE_INTERVAL = 60
+# Moving old sent/declined tasks to tasks_archive, see RETENTION_DAYS,
+# rolling monthly task partitions over (PostgreSQL, if partitioned) and
+# pruning old tombstones, see TOMBSTONE_RETENTION_DAYS
+ARCHIVE_INTERVAL = RETENTION_INTERVAL_SECONDS
+
+def queued_job_ids(limit):
+    return [job_id for (job_id,) in db.session.query(Job.id)
+            .filter(Job.status == 'queued')
+            .order_by(Job.created_at)
+            .limit(limit)]
+
+def main():
+    print(f"🚀 DoNotMiss worker started ({JOB_WORKERS} threads)")
+    with app.app_context():
+        run_migrations(db)
+    
+    last_expire = 0
+    last_archive = 0
+    with ThreadPoolExecutor(max_workers=JOB_WORKERS) as pool:
+        while True:
+            with app.app_context():
+                if time.time() - last_expire > EXPIRE_INTERVAL:
+                    expire_jobs()
+                    flush_analysis_cache_stats()
+                    evict_analysis_cache()
+                    last_expire = time.time()
+                if ARCHIVE_INTERVAL > 0 and time.time() - last_archive > ARCHIVE_INTERVAL:
+                    archive_tasks()
+                    maintain_task_partitions()
+                    prune_tombstones()
+                    last_archive = time.time()
+                job_ids = queued_job_ids(JOB_WORKERS)
+                db.session.remove()
+            
+            if not job_ids:
+                time.sleep(POLL_INTERVAL)
+                continue
+            
+            # run_job claims each job atomically, so several workers can share the table
+            list(pool.map(run_job, job_ids))
+
+if __name__ == '__main__':
+    main()
@@ -100,7 +100,7 @@ chrome.runtime.onMessage.addListener((request, sender, sendResponse) => {
   }
   
   if (request.action === 'updateBadge') {
-    updateBadgeCount();
+    updateBadgeCount().catch(error => console.error('Error updating badge:', error));
     sendResponse({ success: true });
     return true;
   }
@@ -115,6 +115,10 @@ chrome.runtime.onMessage.addListener((request, sender, sendResponse) => {
 // Flask backend endpoint - update this after deploying to Render
 const BACKEND_URL = 'https://donotmiss.onrender.com';
 
+// Analysis job polling
+const ANALYZE_JOB_POLL_MS = 1000;
+const ANALYZE_JOB_MAX_POLLS = 60;
+
 // Submit task to Flask backend for storage
 // The Jira Forge app will sync from the backend and create Jira issues
 async function submitTaskToBackend(task) {
@@ -174,16 +178,22 @@ async function analyzeContentForTasks(content) {
         metadata: {
           subject: content.subject,
           sender: content.sender
-        }
+        },
+        async: true
       })
     });
 
-    const result = await response.json();
+    let result = await response.json();
 
     if (!response.ok) {
       throw new Error(result.error || `Backend error: ${response.status}`);
     }
 
+    // The backend queues the analysis and answers with a job id right away
+    if (result.jobId) {
+      result = await waitForAnalyzeJob(result.jobId);
+    }
+
     console.log(`✅ Analysis complete: ${result.tasks?.length || 0} tasks found`);
 
     return {
@@ -201,26 +211,91 @@ async function analyzeContentForTasks(content) {
   }
 }
 
-// Update badge count with detected tasks
-async function updateBadgeCount() {
+// Poll an analysis job until the backend worker has finished it
+async function waitForAnalyzeJob(jobId) {
+  for (let attempt = 0; attempt < ANALYZE_JOB_MAX_POLLS; attempt++) {
+    await new Promise(resolve => setTimeout(resolve, ANALYZE_JOB_POLL_MS));
+
+    const response = await fetch(`${BACKEND_URL}/api/analyze-jobs/${jobId}`);
+    const job = await response.json();
+
+    if (!response.ok) {
+      throw new Error(job.error || `Backend error: ${response.status}`);
+    }
+    if (job.status === 'done') {
+      return job;
+    }
+    if (job.status === 'failed') {
+      throw new Error(job.error || 'Analysis failed');
+    }
+  }
+  throw new Error('Analysis timed out');
+}
+
+// Version of the counts the badge shows, the long-poll only answers once
+// the counts differ from it (or after the server's wait time)
+let countsVersion = null;
+
+// Seconds the server holds a counts request open, if it says held requests
+// are cheap there (GET /health "streaming"); otherwise poll this often
+const COUNTS_WAIT_SECONDS = 25;
+const COUNTS_POLL_MS = 30000;
+
+function setBadge(count) {
+  if (count > 0) {
+    chrome.action.setBadgeText({ text: count.toString() });
+    chrome.action.setBadgeBackgroundColor({ color: '#FF5630' });
+  } else {
+    chrome.action.setBadgeText({ text: '' });
+  }
+}
+
+// Update badge count with detected tasks, waiting for a change if wait > 0
+async function updateBadgeCount(wait = 0) {
+  const params = new URLSearchParams();
+  if (countsVersion && wait > 0) {
+    params.set('since', countsVersion);
+    params.set('wait', wait);
+  }
+  const response = await fetch(`${BACKEND_URL}/api/tasks/counts?${params}`);
+  if (!response.ok) {
+    throw new Error(`Counts request failed: ${response.status}`);
+  }
+  const result = await response.json();
+  countsVersion = result.version;
+  setBadge(result.counts.detected || 0);
+}
+
+// Whether the backend keeps held requests without tying up a worker
+async function backendStreams() {
   try {
-    const response = await fetch(`${BACKEND_URL}/api/tasks/detected`);
-    if (response.ok) {
-      const tasks = await response.json();
-      const count = tasks.length;
-      
-      if (count > 0) {
-        chrome.action.setBadgeText({ text: count.toString() });
-        chrome.action.setBadgeBackgroundColor({ color: '#FF5630' });
-      } else {
-        chrome.action.setBadgeText({ text: '' });
+    const response = await fetch(`${BACKEND_URL}/health`);
+    return response.ok && (await response.json()).streaming === true;
+  } catch (error) {
+    return false;
+  }
+}
+
+// Long-poll the counts (or poll them), backing off while the backend is unreachable
+async function watchBadgeCount() {
+  const wait = await backendStreams() ? COUNTS_WAIT_SECONDS : 0;
+  let retryDelay = 1000;
+  while (true) {
+    try {
+      await updateBadgeCount(wait);
+      retryDelay = 1000;
+      if (!wait) {
+        await new Promise(resolve => setTimeout(resolve, COUNTS_POLL_MS));
       }
+    } catch (error) {
+      console.error('Error updating badge:', error);
+      await new Promise(resolve => setTimeout(resolve, retryDelay));
+      retryDelay = Math.min(retryDelay * 2, 60000);
     }
-  } catch (error) {
-    console.error('Error updating badge:', error);
   }
 }
 
-// Update badge on startup and periodically
-updateBadgeCount();
-setInterval(updateBadgeCount, 30000); // Every 30 seconds
+// Update badge on startup, then whenever the counts change
+updateBadgeCount()
+  .catch(error => console.error('Error updating badge:', error))
+  .finally(watchBadgeCount);
@@ -15,42 +15,192 @@ const PRIORITY_MAP = {
   'low': '4'
 };
 
+// Page size used when reading task lists from the backend
+const TASK_PAGE_SIZE = 500;
+
+// Most tasks the dashboard reads, and most changed tasks one sync returns
+const MAX_LISTED_TASKS = 5000;
+
 // ============================================================
 // Task Operations - Read from Backend, Create in Jira
 // ============================================================
 
+// Stored copy of the nth page of GET /api/tasks: { etag, tasks, next }.
+// The backend's list ETag covers the page's query, so a page whose cursor
+// moved simply misses and is replaced.
+const taskPageKey = (n) => `taskPage:${n}`;
+
+// Fetch the newest tasks page by page, following the X-Next-Cursor header.
+// Each page is revalidated with If-None-Match against its stored copy, so an
+// unchanged page comes back as an empty 304. Capped so a resolver call stays
+// within its time and memory limits however many tasks the backend holds;
+// older ones are reached through search.
+async function fetchAllTasks(backendUrl) {
+  const tasks = [];
+  let cursor = null;
+  let pages = 0;
+  
+  do {
+    const key = taskPageKey(pages++);
+    const copy = await storage.get(key);
+    const query = `limit=${TASK_PAGE_SIZE}` + (cursor ? `&cursor=${encodeURIComponent(cursor)}` : '');
+    const headers = copy ? { 'If-None-Match': copy.etag } : {};
+    
+    const response = await fetch(`${backendUrl}/api/tasks?${query}`, { headers });
+    let page;
+    if (response.status === 304) {
+      page = copy;
+    } else if (response.ok) {
+      page = {
+        etag: response.headers.get('ETag'),
+        tasks: await response.json(),
+        next: response.headers.get('X-Next-Cursor')
+      };
+      await storePage(key, page);
+    } else {
+      throw new Error(`Backend error: ${response.status}`);
+    }
+    tasks.push(...page.tasks);
+    cursor = page.next;
+  } while (cursor && tasks.length < MAX_LISTED_TASKS);
+  
+  // Drop copies of pages the list no longer reaches
+  const stored = await storage.get('taskPageCount') || 0;
+  for (let n = pages; n < stored; n++) {
+    await storage.delete(taskPageKey(n));
+  }
+  await storage.set('taskPageCount', pages);
+  
+  return tasks;
+}
+
+async function storePage(key, page) {
+  if (!page.etag) {
+    return;
+  }
+  try {
+    await storage.set(key, page);
+  } catch (e) {
+    // Over the storage value size limit: the page is just fetched in full next time
+    await storage.delete(key);
+  }
+}
+
+// Find the stored copy of a task in the list pages, if any
+async function storedTask(taskId) {
+  const pages = await storage.get('taskPageCount') || 0;
+  for (let n = 0; n < pages; n++) {
+    const page = await storage.get(taskPageKey(n));
+    const task = page?.tasks.find(t => t.id === taskId);
+    if (task) {
+      return task;
+    }
+  }
+  return null;
+}
+
+// Get one task, revalidating the stored copy if there is one.
+// The backend's ETag for a task is "<id>-<updatedAt>", so an unchanged
+// task comes back as an empty 304.
+async function fetchTask(backendUrl, taskId) {
+  const copy = await storedTask(taskId);
+  const headers = copy ? { 'If-None-Match': `"${copy.id}-${copy.updatedAt}"` } : {};
+  
+  const response = await fetch(`${backendUrl}/api/tasks/${taskId}`, { headers });
+  if (response.status === 304) {
+    return copy;
+  }
+  if (!response.ok) {
+    return null;
+  }
+  return await response.json();
+}
+
+// Read the task changes since the stored watermark: changed tasks, deleted
+// ids, and reset when the backend can't tell what changed (the caller starts
+// over from tasks). Only the watermark is stored, so each sync's payload is
+// proportional to what changed since the previous one. At most
+// MAX_LISTED_TASKS changed tasks per call, hasMore says to sync again.
+async function fetchTaskChanges(backendUrl) {
+  let since = await storage.get('taskWatermark');
+  const tasks = new Map();
+  let deleted = [];
+  let reset = false;
+  let hasMore = true;
+  
+  while (hasMore && tasks.size < MAX_LISTED_TASKS) {
+    const query = `limit=${TASK_PAGE_SIZE}` + (since ? `&since=${encodeURIComponent(since)}` : '');
+    const response = await fetch(`${backendUrl}/api/tasks/changes?${query}`);
+    if (!response.ok) {
+      throw new Error(`Backend error: ${response.status}`);
+    }
+    
+    const changes = await response.json();
+    if (changes.reset) {
+      tasks.clear();
+      deleted = [];
+      reset = true;
+    }
+    for (const taskId of changes.deleted) {
+      tasks.delete(taskId);
+      deleted.push(taskId);
+    }
+    for (const task of changes.tasks) {
+      tasks.set(task.id, task);
+    }
+    since = changes.next;
+    hasMore = changes.hasMore;
+  }
+  
+  await storage.set('taskWatermark', since);
+  return { tasks: [...tasks.values()], deleted, reset, hasMore };
+}
+
 // Get all tasks from the backend database
 resolver.define('getTasks', async () => {
   const backendUrl = await storage.get('flaskBackendUrl') || FLASK_BACKEND_URL;
   
   try {
-    const response = await fetch(`${backendUrl}/api/tasks`);
+    return await fetchAllTasks(backendUrl);
+  } catch (error) {
+    console.error('Error fetching tasks:', error);
+    return [];
+  }
+});
+
+// Search task titles and descriptions on the backend, best matches first.
+// Each task has highlights.title/description with <mark> around matched words.
+resolver.define('searchTasks', async ({ payload }) => {
+  const backendUrl = await storage.get('flaskBackendUrl') || FLASK_BACKEND_URL;
+  
+  try {
+    const query = `q=${encodeURIComponent(payload.q)}&limit=${TASK_PAGE_SIZE}`;
+    const response = await fetch(`${backendUrl}/api/tasks/search?${query}`);
     if (!response.ok) {
-      console.error('Failed to fetch tasks from backend');
-      return [];
+      throw new Error(`Backend error: ${response.status}`);
     }
-    const tasks = await response.json();
-    return tasks;
+    return await response.json();
   } catch (error) {
-    console.error('Error fetching tasks:', error);
+    console.error('Error searching tasks:', error);
     return [];
   }
 });
 
-// Sync tasks and update Jira status for sent tasks
+// Sync the tasks changed since the previous sync and update Jira status for
+// the sent ones. Returns { tasks, deleted, reset, hasMore }, see fetchTaskChanges.
 resolver.define('syncTasks', async () => {
   const backendUrl = await storage.get('flaskBackendUrl') || FLASK_BACKEND_URL;
   
   try {
-    const response = await fetch(`${backendUrl}/api/tasks`);
-    if (!response.ok) {
+    let changes;
+    try {
+      changes = await fetchTaskChanges(backendUrl);
+    } catch (e) {
       return { success: false, error: 'Failed to fetch tasks' };
     }
     
-    const tasks = await response.json();
-    
     // Update Jira status for sent tasks
-    for (const task of tasks) {
+    for (const task of changes.tasks) {
       if (task.status === 'sent' && task.jiraKey) {
         try {
           const jiraResponse = await api.asUser().requestJira(
@@ -67,7 +217,7 @@ resolver.define('syncTasks', async () => {
       }
     }
     
-    return { success: true, tasks };
+    return { success: true, ...changes };
   } catch (error) {
     console.error('Sync error:', error);
     return { success: false, error: error.message };
@@ -105,11 +255,10 @@ resolver.define('sendToJira', async ({ payload, context }) => {
   // First, get the task from backend
   let task;
   try {
-    const taskResponse = await fetch(`${backendUrl}/api/tasks/${taskId}`);
-    if (!taskResponse.ok) {
+    task = await fetchTask(backendUrl, taskId);
+    if (!task) {
       return { success: false, error: 'Task not found' };
     }
-    task = await taskResponse.json();
   } catch (error) {
     return { success: false, error: 'Failed to fetch task' };
   }
@@ -270,6 +419,13 @@ resolver.define('getBackendUrl', async () => {
 
 resolver.define('setBackendUrl', async ({ payload }) => {
   await storage.set('flaskBackendUrl', payload.url);
+  // The watermark and stored pages belong to the old backend
+  const pages = await storage.get('taskPageCount') || 0;
+  for (let n = 0; n < pages; n++) {
+    await storage.delete(taskPageKey(n));
+  }
+  await storage.delete('taskPageCount');
+  await storage.delete('taskWatermark');
   return { success: true };
 });
 
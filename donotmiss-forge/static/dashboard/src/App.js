@@ -2,6 +2,13 @@ import { useEffect, useState } from 'react';
 import { invoke, router } from '@forge/bridge';
 import './App.css';
 
+// Render a search highlight, text between <mark> and </mark> was matched
+function Highlighted({ text }) {
+  return text.split(/(<mark>.*?<\/mark>)/g).map((part, i) =>
+    part.startsWith('<mark>') ? <mark key={i}>{part.slice(6, -7)}</mark> : part
+  );
+}
+
 function App() {
   const [tasks, setTasks] = useState([]);
   const [loading, setLoading] = useState(true);
@@ -10,19 +17,81 @@ function App() {
   const [actionLoading, setActionLoading] = useState({});
   const [showAssignModal, setShowAssignModal] = useState(null);
   const [refreshing, setRefreshing] = useState(false);
+  const [query, setQuery] = useState('');
+  const [searchResults, setSearchResults] = useState(null);
 
   useEffect(() => {
     loadTasks();
     loadUsers();
     
-    // Auto-refresh every 30 seconds
-    const interval = setInterval(() => {
-      loadTasks(false);
-    }, 30000);
+    // Poll every 30 seconds. Where the backend keeps streams without tying up
+    // a worker (GET /health says "streaming"), reload when it pushes task
+    // changes instead, falling back to polling if the stream fails for good.
+    let events = null;
+    let interval = null;
+    let reloadTimer = null;
+    let closed = false;
+    
+    const startPolling = () => {
+      if (!interval) {
+        interval = setInterval(() => loadTasks(false), 30000);
+      }
+    };
+    
+    const openStream = (url) => {
+      events = new EventSource(`${url}/api/tasks/events`);
+      events.addEventListener('tasks', () => {
+        // One reload for a burst of changes
+        clearTimeout(reloadTimer);
+        reloadTimer = setTimeout(() => loadTasks(false), 500);
+      });
+      events.onerror = () => {
+        // EventSource reconnects by itself unless the stream failed for good
+        if (events.readyState === EventSource.CLOSED) {
+          startPolling();
+        }
+      };
+    };
     
-    return () => clearInterval(interval);
+    invoke('getBackendUrl').then(async ({ url }) => {
+      if (closed) return;
+      if (typeof EventSource !== 'undefined') {
+        const health = await fetch(`${url}/health`).then(r => r.json()).catch(() => ({}));
+        if (closed) return;
+        if (health.streaming === true) {
+          openStream(url);
+          return;
+        }
+      }
+      startPolling();
+    }).catch(startPolling);
+    
+    return () => {
+      closed = true;
+      if (events) events.close();
+      clearInterval(interval);
+      clearTimeout(reloadTimer);
+    };
   }, []);
 
+  // Search on the backend once typing pauses, again whenever tasks change
+  useEffect(() => {
+    const q = query.trim();
+    if (!q) {
+      setSearchResults(null);
+      return;
+    }
+    let stale = false;
+    const timer = setTimeout(async () => {
+      const results = await invoke('searchTasks', { q });
+      if (!stale) setSearchResults(results || []);
+    }, 300);
+    return () => {
+      stale = true;
+      clearTimeout(timer);
+    };
+  }, [query, tasks]);
+
   const openIssue = async (issueKey) => {
     try {
       await router.navigate(`/browse/${issueKey}`);
@@ -113,7 +182,7 @@ function App() {
     }
   };
 
-  const filteredTasks = tasks.filter(task => {
+  const filteredTasks = (searchResults || tasks).filter(task => {
     if (filter === 'all') return task.status !== 'declined';
     if (filter === 'pending') return task.status === 'pending';
     if (filter === 'sent') return task.status === 'sent';
@@ -193,6 +262,13 @@ function App() {
         <button className={`filter-btn declined ${filter === 'declined' ? 'active' : ''}`} onClick={() => setFilter('declined')}>
           🗑️ Declined ({declinedCount})
         </button>
+        <input
+          className="search-input"
+          type="search"
+          placeholder="Search tasks..."
+          value={query}
+          onChange={e => setQuery(e.target.value)}
+        />
       </div>
 
       <div className="task-list">
@@ -221,10 +297,14 @@ function App() {
                 )}
               </div>
               
-              <h3 className="task-title">{task.title}</h3>
+              <h3 className="task-title">
+                {task.highlights ? <Highlighted text={task.highlights.title} /> : task.title}
+              </h3>
               
               {task.description && task.description !== task.title && (
-                <p className="task-description">{task.description}</p>
+                <p className="task-description">
+                  {task.highlights?.description ? <Highlighted text={task.highlights.description} /> : task.description}
+                </p>
               )}
 
               <div className="task-meta">